@@ -0,0 +1,211 @@
+"""
+Aggregation of ticks into OHLCV bars.
+
+Ticks are given as aligned numpy arrays of timestamps, prices and sizes,
+sorted by time. Bars are formed with segment reductions (``reduceat``), so
+no Python code runs per tick, and the output frames have the Open, High,
+Low, Close and Volume columns ``Indicators`` expects by default.
+
+    >>> bars = time_bars(ts, price, size, "1h")
+    >>> i = Indicators(bars)
+
+For data that does not fit in memory feed chunks to :class:`BarAggregator`,
+the unfinished last bar of every chunk is carried over to the next one as a
+single row, so every tick is read once however long the bar is.
+"""
+
+import numpy as np
+import pandas as pd
+
+KINDS = ("time", "tick", "volume", "dollar")
+
+
+def _as_int64(timestamp):
+    timestamp = np.asarray(timestamp)
+    if np.issubdtype(timestamp.dtype, np.datetime64):
+        return timestamp.astype("datetime64[ns]").view("int64"), True
+    return timestamp.astype("int64", copy=False), False
+
+
+class BarAggregator:
+    """Aggregate chunks of ticks into bars.
+
+    :param str kind: ``"time"``, ``"tick"``, ``"volume"`` or ``"dollar"``
+    :param threshold: Bar size: a pandas frequency such as ``"5min"`` (or
+        nanoseconds) for time bars, a number of ticks for tick bars,
+        a traded size for volume bars and a traded value (price * size)
+        for dollar bars
+    """
+
+    def __init__(self, kind, threshold):
+        if kind not in KINDS:
+            raise ValueError(f'The "kind" can be only one of {", ".join(KINDS)}')
+        if kind == "time" and not isinstance(threshold, (int, np.integer)):
+            threshold = pd.Timedelta(threshold).value
+        if threshold <= 0:
+            raise ValueError('The "threshold" should be positive')
+        self.kind = kind
+        self.threshold = threshold
+        # Bar id and one-row columns of the bar not finished yet
+        self._open = None
+        self._datetime = None
+        # Ticks, size or value of the ticks already aggregated
+        self._offset = 0
+
+    def _bar_ids(self, timestamp, price, size):
+        if self.kind == "time":
+            return timestamp // self.threshold
+        if self.kind == "tick":
+            return (self._offset + np.arange(len(timestamp))) // self.threshold
+        measure = size if self.kind == "volume" else price * size
+        # Size or value traded before every tick, so the tick that reaches
+        # the threshold still belongs to the bar it closes
+        before = np.cumsum(measure, dtype=float)
+        before -= measure
+        before += self._offset
+        return before // self.threshold
+
+    def _measure(self, price, size):
+        if self.kind == "tick":
+            return len(price)
+        if self.kind == "volume":
+            return size.sum(dtype=float)
+        if self.kind == "dollar":
+            return np.dot(price, size.astype(float))
+        return 0
+
+    def _empty(self):
+        timestamp = np.empty(0, dtype="datetime64[ns]" if self._datetime else int)
+        return pd.DataFrame(
+            {
+                "Timestamp": timestamp,
+                **{column: np.empty(0) for column in ("Open", "High", "Low", "Close")},
+                "Volume": np.empty(0, dtype=int),
+                "Ticks": np.empty(0, dtype=int),
+            }
+        )
+
+    def _bars(self, timestamp, price, size, starts, ends):
+        if self.kind == "time":
+            opened = timestamp[starts] // self.threshold * self.threshold
+        else:
+            opened = timestamp[starts]
+        return {
+            "Timestamp": opened,
+            "Open": price[starts],
+            "High": np.maximum.reduceat(price, starts),
+            "Low": np.minimum.reduceat(price, starts),
+            "Close": price[ends - 1],
+            "Volume": np.add.reduceat(size, starts),
+            "Ticks": ends - starts,
+        }
+
+    def _frame(self, bars):
+        if not len(bars["Open"]):
+            return self._empty()
+        if self._datetime:
+            bars["Timestamp"] = bars["Timestamp"].view("datetime64[ns]")
+        return pd.DataFrame(bars)
+
+    def _continue(self, bars):
+        """Merge the open bar into the first bar of ``bars``, which it is
+        continued by."""
+        _, previous = self._open
+        for column in ("Timestamp", "Open"):
+            bars[column][0] = previous[column][0]
+        bars["High"][0] = max(bars["High"][0], previous["High"][0])
+        bars["Low"][0] = min(bars["Low"][0], previous["Low"][0])
+        bars["Volume"][0] += previous["Volume"][0]
+        bars["Ticks"][0] += previous["Ticks"][0]
+
+    def update(self, timestamp, price, size):
+        """Add a chunk of ticks and return the bars completed so far.
+
+        :param timestamp: datetime64 or integer (nanoseconds) array
+        :param price: Price array
+        :param size: Size array
+        :return: pandas data frame with Timestamp, Open, High, Low, Close,
+            Volume and Ticks columns
+        """
+        timestamp, is_datetime = _as_int64(timestamp)
+        if self._datetime is None:
+            self._datetime = is_datetime
+        price = np.asarray(price, dtype=float)
+        size = np.asarray(size)
+        if not len(timestamp):
+            return self._empty()
+
+        ids = self._bar_ids(timestamp, price, size)
+        self._offset += self._measure(price, size)
+        starts = np.flatnonzero(np.diff(ids, prepend=ids[0] - 1))
+        ends = np.append(starts[1:], len(ids))
+        bars = self._bars(timestamp, price, size, starts, ends)
+        if self._open is not None:
+            if self._open[0] == ids[0]:
+                self._continue(bars)
+            else:
+                bars = {
+                    column: np.concatenate([self._open[1][column], values])
+                    for column, values in bars.items()
+                }
+
+        # The last bar stays open until the next chunk or flush()
+        self._open = ids[-1], {column: values[-1:] for column, values in bars.items()}
+        return self._frame({column: values[:-1] for column, values in bars.items()})
+
+    def flush(self):
+        """Return the last, possibly unfinished, bar."""
+        if self._open is None:
+            return self._empty()
+        _, bars = self._open
+        self._open = None
+        return self._frame(bars)
+
+
+def aggregate(timestamp, price, size, kind, threshold, chunk_size=10_000_000):
+    """Aggregate tick arrays into bars, processing ``chunk_size`` ticks at
+    a time.
+
+    :param timestamp: datetime64 or integer (nanoseconds) array
+    :param price: Price array
+    :param size: Size array
+    :param str kind: ``"time"``, ``"tick"``, ``"volume"`` or ``"dollar"``
+    :param threshold: Bar size, see :class:`BarAggregator`
+    :param int chunk_size: Number of ticks processed at once
+    :return: pandas data frame with Timestamp, Open, High, Low, Close,
+        Volume and Ticks columns
+    """
+    aggregator = BarAggregator(kind, threshold)
+    frames = [
+        aggregator.update(
+            timestamp[start : start + chunk_size],
+            price[start : start + chunk_size],
+            size[start : start + chunk_size],
+        )
+        for start in range(0, len(price), chunk_size)
+    ]
+    frames.append(aggregator.flush())
+    return pd.concat(
+        [frame for frame in frames if len(frame)] or frames[-1:], ignore_index=True
+    )
+
+
+def time_bars(timestamp, price, size, freq, chunk_size=10_000_000):
+    """Bars covering ``freq`` (e.g. ``"1h"``) of time each. Intervals
+    without ticks produce no bar."""
+    return aggregate(timestamp, price, size, "time", freq, chunk_size)
+
+
+def tick_bars(timestamp, price, size, ticks, chunk_size=10_000_000):
+    """Bars of ``ticks`` ticks each."""
+    return aggregate(timestamp, price, size, "tick", ticks, chunk_size)
+
+
+def volume_bars(timestamp, price, size, volume, chunk_size=10_000_000):
+    """Bars closed by the tick at which the traded size reaches ``volume``."""
+    return aggregate(timestamp, price, size, "volume", volume, chunk_size)
+
+
+def dollar_bars(timestamp, price, size, value, chunk_size=10_000_000):
+    """Bars closed by the tick at which the traded value reaches ``value``."""
+    return aggregate(timestamp, price, size, "dollar", value, chunk_size)
@@ -0,0 +1,165 @@
+"""
+Command line interface for batch indicator calculation.
+
+    $ tapy spec.yaml data/*.csv --output features/
+
+The spec is a YAML or JSON file listing ``Indicators`` methods with their
+parameters, and optionally the OHLCV column names::
+
+    columns:
+      close_col: Close
+    indicators:
+      - method: sma
+        period: 5
+      - method: macd
+        period_fast: 12
+
+Input files are processed in parallel processes and written to the output
+directory under their path relative to the common directory of the inputs,
+so files of the same name in different directories do not overwrite each
+other. A manifest in the output directory remembers the hash of every input
+and of the spec, so running the same command again skips inputs that did
+not change.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import time
+
+import pandas as pd
+
+from .indicators import Indicators, __version__
+
+MANIFEST = "tapy-manifest.json"
+
+
+def load_spec(path):
+    """Load a YAML or JSON indicator spec."""
+    path = pathlib.Path(path)
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("PyYAML is required for YAML specs: pip install pyyaml")
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+    if not isinstance(spec, dict) or not isinstance(spec.get("indicators"), list):
+        raise SystemExit(f"{path}: the spec should contain an 'indicators' list")
+    for indicator in spec["indicators"]:
+        method = indicator.get("method")
+        if method is None or not hasattr(Indicators, method) or method[0] == "_":
+            raise SystemExit(f"{path}: unknown indicator method {method!r}")
+    return spec
+
+
+def file_hash(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def spec_hash(spec):
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+def compute(spec, input_path, output_path):
+    """Compute the indicators of the spec for one CSV file.
+
+    :return: Number of bars
+    """
+    i = Indicators(pd.read_csv(input_path), **spec.get("columns", {}))
+    for indicator in spec["indicators"]:
+        kwargs = {k: v for k, v in indicator.items() if k != "method"}
+        getattr(i, indicator["method"])(**kwargs)
+    i.df.to_csv(output_path, index=False)
+    return len(i.df)
+
+
+def run(spec, inputs, output, jobs=None, log=print):
+    """Process input files skipping the ones already done with the same spec.
+
+    :param dict spec: Indicator spec
+    :param list inputs: Paths to CSV files
+    :param output: Output directory
+    :param int jobs: Number of processes, default: number of CPUs
+    :return: dict with ``computed``, ``skipped``, ``bars`` and ``seconds``
+    """
+    output = pathlib.Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest_path = output / MANIFEST
+    manifest = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+
+    spec_sha = spec_hash(spec)
+    paths = [pathlib.Path(path).resolve() for path in inputs]
+    root = pathlib.Path(os.path.commonpath([path.parent for path in paths or [output]]))
+    todo = {}
+    skipped = 0
+    for path in paths:
+        key = str(path)
+        relative = path.relative_to(root)
+        output_path = output / relative
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "input": file_hash(path),
+            "spec": spec_sha,
+            "output": relative.as_posix(),
+        }
+        if manifest.get(key) == entry and output_path.exists():
+            skipped += 1
+            continue
+        todo[key] = (path, output_path, entry)
+
+    start = time.perf_counter()
+    bars = 0
+    jobs = jobs or os.cpu_count()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(compute, spec, path, output_path): key
+            for key, (path, output_path, _) in todo.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            key = futures[future]
+            bars += future.result()
+            manifest[key] = todo[key][2]
+            # Keep the manifest current, so an interrupted run resumes
+            manifest_path.write_text(json.dumps(manifest, indent=2))
+    seconds = time.perf_counter() - start
+
+    rate = bars / seconds if seconds else 0.0
+    log(
+        f"{len(todo)} computed, {skipped} skipped, {bars} bars "
+        f"in {seconds:.2f}s ({rate:,.0f} bars/s)"
+    )
+    return {"computed": len(todo), "skipped": skipped, "bars": bars, "seconds": seconds}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="tapy", description="Add technical indicators to CSV files."
+    )
+    parser.add_argument("spec", help="YAML or JSON file with the indicators")
+    parser.add_argument("inputs", nargs="+", help="CSV files with OHLCV columns")
+    parser.add_argument("-o", "--output", required=True, help="Output directory")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Number of processes"
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    args = parser.parse_args(argv)
+
+    run(load_spec(args.spec), args.inputs, args.output, args.jobs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Rolling covariance, correlation and beta of many aligned series.
+
+Values are (bars, series) arrays, e.g. the returns of the Close column of
+every symbol on the same bars. Live data is added one bar at a time:
+
+    >>> moments = RollingMoments(n_series=500, window=60)
+    >>> for row in returns:
+    ...     moments.update(row)
+    ...     beta = moments.beta(index=0)  # of every series against series 0
+    ...     corr = moments.corr()  # (series, series) matrix
+
+and the history is processed in chunks of bars:
+
+    >>> beta = rolling_beta(returns, index_returns, 60)  # (bars, series)
+    >>> for start, corr in rolling_cov(returns, 60, corr=True):
+    ...     store(start, corr)  # (chunk bars, series, series)
+
+The sums of products are kept relative to the first non-NaN value of every
+series, a value close to the data, to avoid the cancellation of large
+prices. Covariances are sample covariances (``ddof=1``) like
+``pandas.DataFrame.rolling().cov()``, the values are NaN until ``window``
+bars are available, and the values of a pair of series are NaN while
+either has a NaN in the window (e.g. the first return of a
+``pct_change``). NaN values count as zero in the sums, so they do not
+linger once they left the window.
+"""
+
+import numpy as np
+
+from . import kernels
+
+# Approximate size of the blocks of matrices ``rolling_cov`` builds at once
+CHUNK_BYTES = 1 << 26
+
+
+class RollingMoments:
+    """Rolling sums and cross-products of N series updated one bar at a
+    time, every update costs O(N^2) whatever the window.
+
+    :param int n_series: Number of series
+    :param int window: Number of bars of the window
+    """
+
+    def __init__(self, n_series, window):
+        self.window = window
+        self.count = 0
+        self._rows = np.zeros((window, n_series))
+        self._missing = np.zeros((window, n_series), dtype=bool)
+        self._position = 0
+        # Number of NaN values of every series in the window
+        self._nans = np.zeros(n_series, dtype=int)
+        self._center = np.full(n_series, np.nan)
+        self._centered = False
+        self._sum = np.zeros(n_series)
+        self._cross = np.zeros((n_series, n_series))
+        self._delta = np.empty((n_series, n_series))
+        # Entering and leaving rows, as columns and as rows with the leaving
+        # one negated, for a rank-2 update of the cross-products in one
+        # matrix product
+        self._columns = np.empty((n_series, 2))
+        self._signed = np.empty((2, n_series))
+
+    def update(self, row):
+        """Add the values of the series at a new bar."""
+        row = np.asarray(row, dtype=float)
+        if not self._centered:
+            # A series without values so far is centred on its first one
+            np.copyto(self._center, row, where=np.isnan(self._center))
+            self._centered = not np.isnan(self._center).any()
+        self.count = min(self.count + 1, self.window)
+        # The slot of the leaving row is zero until the window is full
+        slot = self._rows[self._position]
+        missing = self._missing[self._position]
+        self._columns[:, 1] = slot
+        np.negative(slot, out=self._signed[1])
+        self._sum -= slot
+        self._nans -= missing
+        np.subtract(row, self._center, out=slot)
+        np.isnan(slot, out=missing)
+        self._nans += missing
+        slot[missing] = 0
+        self._columns[:, 0] = slot
+        self._signed[0] = slot
+        self._sum += slot
+        self._cross += np.dot(self._columns, self._signed, out=self._delta)
+        self._position = (self._position + 1) % self.window
+        if self._position == 0:
+            # Recompute the sums once per window so that rounding errors of
+            # the updates do not accumulate
+            self._rows.sum(axis=0, out=self._sum)
+            np.dot(self._rows.T, self._rows, out=self._cross)
+
+    def cov(self, out=None):
+        """Return the (series, series) covariance matrix."""
+        out = kernels.check_out(out, self._cross.shape)
+        if self.count < self.window:
+            out.fill(np.nan)
+            return out
+        np.multiply.outer(self._sum, self._sum / self.count, out=out)
+        np.subtract(self._cross, out, out=out)
+        out /= self.count - 1
+        if self._nans.any():
+            missing = self._nans > 0
+            out[missing] = np.nan
+            out[:, missing] = np.nan
+        return out
+
+    def corr(self, out=None):
+        """Return the (series, series) correlation matrix."""
+        out = self.cov(out)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(np.diagonal(out))
+            out /= std
+            out /= std[:, None]
+        return out
+
+    def beta(self, index, out=None):
+        """Return the beta of every series against the series at position
+        ``index``, only its column of the covariance matrix is computed."""
+        out = kernels.check_out(out, self._sum.shape)
+        if self.count < self.window:
+            out.fill(np.nan)
+            return out
+        np.multiply(self._sum, self._sum[index] / self.count, out=out)
+        np.subtract(self._cross[:, index], out, out=out)
+        out[self._nans > 0] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out /= out[index]
+        return out
+
+
+def _center(values, missing):
+    """Subtract the first non-NaN value of every row of ``values`` and set
+    its NaN values to zero, ``missing`` is set to the NaN mask."""
+    np.isnan(values, out=missing)
+    first = np.argmin(missing, axis=-1)[..., None]
+    center = np.take_along_axis(values, first, axis=-1)
+    # Rows without any value stay zero
+    np.copyto(center, 0.0, where=np.isnan(center))
+    values -= center
+    np.copyto(values, 0.0, where=missing)
+    return values
+
+
+def rolling_beta(values, index, window, out=None, buffers=None):
+    """Rolling beta of every series against an index series.
+
+    :param numpy.ndarray values: (bars, series) values
+    :param numpy.ndarray index: (bars,) values of the index
+    :param int window: Number of bars of the window
+    :param numpy.ndarray out: (bars, series) array to write into
+    :return: (bars, series) betas, NaN during the first window and while
+        the series or the index has a NaN in the window
+    """
+    buffers = kernels._buffers(buffers)
+    n, k = np.shape(values)
+    out = kernels.check_out(out, (n, k))
+    # One row per series, time along the last axis for the 2-D kernels
+    x = buffers.get("beta_x", (k, n))
+    np.copyto(x, np.asarray(values, dtype=float).T)
+    missing = buffers.get("beta_missing", (k, n), dtype=bool)
+    _center(x, missing)
+    gaps = buffers.get("beta_gaps", (k, n))
+    np.copyto(gaps, missing)
+    kernels.rolling_sum(gaps, window, gaps, buffers)
+    m = np.array(index, dtype=float)
+    missing_m = buffers.get("beta_missing_m", n, dtype=bool)
+    _center(m, missing_m)
+    gaps_m = buffers.get("beta_gaps_m", n)
+    np.copyto(gaps_m, missing_m)
+    gaps += kernels.rolling_sum(gaps_m, window, gaps_m, buffers)
+    sum_x = kernels.rolling_sum(x, window, buffers.get("beta_sum_x", (k, n)), buffers)
+    x *= m
+    sum_xm = kernels.rolling_sum(x, window, buffers.get("beta_sum_xm", (k, n)), buffers)
+    sum_m = kernels.rolling_sum(m, window, buffers.get("beta_sum_m", n), buffers)
+    np.square(m, out=m)
+    sum_mm = kernels.rolling_sum(m, window, buffers.get("beta_sum_mm", n), buffers)
+    # cov(x, m) / var(m), both scaled by window * (window - 1)
+    sum_x *= sum_m
+    sum_x /= window
+    sum_xm -= sum_x
+    np.square(sum_m, out=sum_m)
+    sum_m /= window
+    sum_mm -= sum_m
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sum_xm /= sum_mm
+    np.copyto(sum_xm, np.nan, where=np.greater(gaps, 0, out=missing))
+    out[...] = sum_xm.T
+    return out
+
+
+def rolling_cov(values, window, corr=False, chunk_bars=None):
+    """Rolling covariance (or correlation) matrices of all pairs of series.
+
+    The bars are added to a :class:`RollingMoments` one at a time, so every
+    bar costs O(series^2) whatever the window, and the matrices are
+    returned in chunks to bound the memory used.
+
+    :param numpy.ndarray values: (bars, series) values
+    :param int window: Number of bars of the window
+    :param bool corr: Yield correlation instead of covariance matrices
+    :param int chunk_bars: Number of bars per chunk, default: about 64 MB
+        of matrices
+    :return: Iterator of (start, matrices), matrices is a (chunk bars,
+        series, series) array of the bars from ``start``
+    """
+    values = np.asarray(values, dtype=float)
+    n, k = values.shape
+    if chunk_bars is None:
+        chunk_bars = max(1, CHUNK_BYTES // (8 * k * k))
+    moments = RollingMoments(k, window)
+    matrix = moments.corr if corr else moments.cov
+    for start in range(0, n, chunk_bars):
+        matrices = np.empty((min(chunk_bars, n - start), k, k))
+        for row, out in zip(values[start:], matrices):
+            moments.update(row)
+            matrix(out)
+        yield start, matrices
@@ -0,0 +1,159 @@
+"""
+Downsampling of indicator columns for charts.
+
+A column, or a group of aligned columns such as the Alligator lines, is
+reduced to about ``threshold`` rows. The rows are chosen once for the whole
+group, so its lines keep the same x coordinates:
+
+    >>> from tapy.indicators import output_columns
+    >>> lines = output_columns("alligator", {})
+    >>> chart = downsample(i, lines, 2000)  # data frame of 2000 rows
+    >>> chart = downsample(i, "cci", 2000, method="minmax", x="Date")
+
+Two linear time methods are available:
+
+``lttb``
+    Largest-Triangle-Three-Buckets: one row per bucket, the one making the
+    largest triangle with the row kept in the previous bucket and the
+    average of the next bucket. For a group the areas of the lines, scaled
+    by their ranges, are added.
+``minmax``
+    The rows of the minimum and the maximum of every line in every bucket,
+    which keeps all the spikes.
+
+NaN values (e.g. the warm-up of an indicator) are ignored, the first and
+the last rows are always kept.
+"""
+
+import warnings
+
+import numpy as np
+
+from .indicators import Indicators
+
+METHODS = ("lttb", "minmax")
+
+
+def _coordinates(x, n):
+    if x is None:
+        return np.arange(n, dtype=float)
+    x = np.asarray(x)
+    if x.dtype.kind == "M":
+        x = x.view("i8")
+    return x.astype(float)
+
+
+def _lines(y):
+    y = np.asarray(y, dtype=float)
+    return y[:, None] if y.ndim == 1 else y
+
+
+def lttb(y, threshold, x=None):
+    """Return the positions of the rows kept by Largest-Triangle-Three-Buckets.
+
+    :param numpy.ndarray y: (rows,) values or (rows, lines) group of lines
+    :param int threshold: Number of rows to keep
+    :param numpy.ndarray x: x coordinates, numbers or datetimes, default:
+        the positions
+    :return: numpy array of sorted row positions
+    """
+    y = _lines(y)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n) if threshold >= n else np.array([0, n - 1][:threshold])
+    x = _coordinates(x, n)
+    # Lines of a group are compared by their areas relative to their ranges
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        span = np.nanmax(y, axis=0) - np.nanmin(y, axis=0)
+    span[~(span > 0)] = 1.0
+    y = y / span
+
+    # Buckets between the first and the last rows, and their averages
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(int) + 1
+    edges[-1] = n - 1
+    finite = np.isfinite(y)
+    counts = np.add.reduceat(finite, edges[:-1], axis=0)
+    sums = np.add.reduceat(np.where(finite, y, 0.0), edges[:-1], axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_y = sums / counts
+    mean_x = np.add.reduceat(x, edges[:-1]) / np.diff(edges)
+    mean_y = np.vstack([mean_y, y[-1:]])
+    mean_x = np.append(mean_x, x[-1])
+
+    rows = np.empty(threshold, dtype=np.intp)
+    rows[0], rows[-1] = 0, n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Twice the area of the triangles (a, row, average of the next bucket)
+        area = np.abs(
+            (x[a] - mean_x[bucket + 1]) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop, None]) * (mean_y[bucket + 1] - y[a])
+        )
+        a = start + np.argmax(np.nansum(area, axis=1))
+        rows[bucket + 1] = a
+    return rows
+
+
+def minmax(y, threshold):
+    """Return the positions of the rows of the minimum and the maximum of
+    every line in every bucket.
+
+    :param numpy.ndarray y: (rows,) values or (rows, lines) group of lines
+    :param int threshold: Approximate number of rows to keep, a group of
+        k lines uses ``threshold / (2 k)`` buckets
+    :return: numpy array of sorted row positions
+    """
+    y = _lines(y)
+    n, k = y.shape
+    if threshold >= n:
+        return np.arange(n)
+    buckets = max(1, threshold // (2 * k))
+    edges = (np.arange(buckets) * (n / buckets)).astype(int)
+    sizes = np.diff(np.append(edges, n))
+    bucket_of = np.repeat(np.arange(buckets), sizes)
+    rows = [np.array([0, n - 1])]
+    for line in y.T:
+        for reduce in (np.fmin, np.fmax):
+            # First row of every bucket equal to the bucket's extreme, all
+            # NaN buckets have none
+            extreme = np.repeat(reduce.reduceat(line, edges), sizes)
+            found = np.flatnonzero(line == extreme)
+            _, first = np.unique(bucket_of[found], return_index=True)
+            rows.append(found[first])
+    return np.unique(np.concatenate(rows))
+
+
+def downsample(data, columns, threshold, method="lttb", x=None):
+    """Reduce one column or a group of aligned columns to about
+    ``threshold`` rows.
+
+    :param data: pandas or Polars data frame, ``Indicators`` or dict of
+        arrays
+    :param columns: Column name, or list of the names of a group of lines
+        downsampled on the same rows
+    :param int threshold: Number of rows to keep
+    :param str method: "lttb" or "minmax", default: lttb
+    :param str x: Name of the x column, numbers or datetimes, which is
+        returned as well, default: the row positions
+    :return: The kept rows of the columns, a data frame for data frames
+        (the pandas index is kept) or a dict of arrays
+    """
+    if method not in METHODS:
+        raise ValueError('The "method" can be only "lttb" or "minmax"')
+    if isinstance(data, Indicators):
+        data = data.df
+    names = [columns] if isinstance(columns, str) else list(columns)
+    y = np.column_stack([np.asarray(data[name], dtype=float) for name in names])
+    if method == "lttb":
+        rows = lttb(y, threshold, None if x is None else np.asarray(data[x]))
+    else:
+        rows = minmax(y, threshold)
+    if x is not None:
+        names = [x, *names]
+    if hasattr(data, "iloc"):
+        return data.iloc[rows][names]
+    if hasattr(data, "select"):
+        return data[rows].select(names)
+    return {name: np.asarray(data[name])[rows] for name in names}
@@ -0,0 +1,345 @@
+"""
+Polars expressions for the indicators. Every function takes column
+expressions and returns an expression (or a dict of output name to
+expression for multi-line indicators), so the whole calculation runs
+inside the Polars query engine.
+"""
+
+import collections
+import math
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from . import kernels
+from .utils import rolling_mad
+
+
+def column(name):
+    return pl.col(name)
+
+
+def _row_nr():
+    return pl.int_range(pl.len())
+
+
+def median_price(high, low):
+    return (high + low) / 2
+
+
+def typical_price(high, low, close):
+    """(High + Low + Close) / 3.
+
+    Polars divides by a constant through its reciprocal, which rounds
+    differently from pandas and flips exact ties between consecutive typical
+    prices (MFI compares them), so the division is done by numpy.
+    """
+    return (high + low + close).map_batches(
+        lambda s: pl.Series(s.to_numpy() / 3), return_dtype=pl.Float64
+    )
+
+
+# Windows (t - span, t] over the ``time`` column expression, the counterpart
+# of ``kernels.TimeWindows``
+TimeWindow = collections.namedtuple("TimeWindow", ["time", "span"])
+
+
+def time_window(time, span):
+    return TimeWindow(time, pd.Timedelta(span).to_pytimedelta())
+
+
+def _rolling(col, period, function, **kwargs):
+    """``rolling_<function>`` over ``period`` rows or over a ``TimeWindow``,
+    null until the first complete time window like the kernels."""
+    if isinstance(period, TimeWindow):
+        time, span = period
+        values = getattr(col, f"rolling_{function}_by")(time, span, **kwargs)
+        return pl.when(time - span >= time.first()).then(values)
+    return getattr(col, f"rolling_{function}")(window_size=period, **kwargs)
+
+
+def _time_decay(col, period, factor):
+    """``kernels.time_decay`` with ``tau = factor * span``, Polars takes the
+    half-life of the decay."""
+    half_life = period.span * factor * math.log(2)
+    return col.ewm_mean_by(period.time, half_life=half_life)
+
+
+def _lag(col, period):
+    """``shift(period)``, or the value at least the span of a
+    ``TimeWindow`` before, see ``kernels.TimeWindows.lag``."""
+    if not isinstance(period, TimeWindow):
+        return col.shift(period)
+    time, span = period
+    before = time.search_sorted(time - span, side="right").cast(pl.Int64) - 1
+    return pl.when(before >= 0).then(col.gather(before.clip(lower_bound=0)))
+
+
+def _lead(col, period):
+    """``shift(-period)``, or the value at least the span of a
+    ``TimeWindow`` after, see ``kernels.TimeWindows.lead``."""
+    if not isinstance(period, TimeWindow):
+        return col.shift(-period)
+    time, span = period
+    after = time.search_sorted(time + span, side="left")
+    return col.gather(after, null_on_oob=True)
+
+
+def sma(col, period):
+    return _rolling(col, period, "mean")
+
+
+def ema(col, period):
+    if isinstance(period, TimeWindow):
+        return _time_decay(col, period, 1 / 2)
+    return col.ewm_mean(span=period, adjust=False)
+
+
+def smma(col, period):
+    """Smoothed Moving Average, seeded the same way as ``kernels.smma``:
+    the mean of the first ``period`` values is placed at row ``period`` and
+    the recursion continues from there. The recursion itself is the
+    exponential mean with ``alpha = 1 / period``, so no Python loop is needed.
+    """
+    if isinstance(period, TimeWindow):
+        return _time_decay(col, period, 1)
+    row = _row_nr()
+    seeded = (
+        pl.when(row == period)
+        .then(col.head(period).mean())
+        .when(row > period)
+        .then(col)
+        .otherwise(None)
+    )
+    return seeded.ewm_mean(alpha=1 / period, adjust=False)
+
+
+def lwma(col, period):
+    """Linear Weighted Moving Average, calculated by ``kernels.lwma`` as
+    Polars has no O(n) weighted rolling sum."""
+    return col.map_batches(
+        lambda s: pl.Series(kernels.lwma(s.cast(pl.Float64).to_numpy(), period)),
+        return_dtype=pl.Float64,
+    ).fill_nan(None)
+
+
+def moving_average(col, period, method):
+    if method == "sma":
+        return sma(col, period)
+    if method == "smma":
+        return smma(col, period)
+    if method == "ema":
+        return ema(col, period)
+    if method == "lwma":
+        return lwma(col, period)
+    raise ValueError('The "method" can be only "sma", "ema", "smma" or "lwma"')
+
+
+def alma(col, period, weights):
+    return col.rolling_sum(window_size=period, weights=list(weights))
+
+
+def awesome_oscillator(high, low):
+    mp = median_price(high, low)
+    return sma(mp, 5) - sma(mp, 34)
+
+
+def accelerator_oscillator(high, low):
+    ao = awesome_oscillator(high, low)
+    return ao - sma(ao, 5)
+
+
+def accumulation_distribution(high, low, close, volume):
+    calc = ((close - low) - (high - close)) * volume / (high - low)
+    return calc.fill_nan(None).sum()
+
+
+def alligator(high, low, period, shift):
+    return smma(median_price(high, low), period).shift(shift)
+
+
+def atr(high, low, close, period):
+    prev_close = close.shift(1)
+    true_range = pl.max_horizontal(high - low, prev_close - high, prev_close - low)
+    return sma(true_range, period)
+
+
+def wilder(col, period, start=0):
+    """Wilder's smoothing seeded the same way as ``kernels.wilder``."""
+    row = _row_nr()
+    seed_at = start + period - 1
+    seeded = (
+        pl.when(row == seed_at)
+        .then(col.slice(start, period).mean())
+        .when(row > seed_at)
+        .then(col)
+        .otherwise(None)
+    )
+    return seeded.ewm_mean(alpha=1 / period, adjust=False)
+
+
+def true_range(high, low, close):
+    prev_close = close.shift(1)
+    return pl.max_horizontal(
+        high - low, (high - prev_close).abs(), (low - prev_close).abs()
+    )
+
+
+def rsi(close, period):
+    change = close.diff()
+    gain = wilder(change.clip(lower_bound=0), period, 1)
+    loss = wilder((-change).clip(lower_bound=0), period, 1)
+    return (100 * gain / (gain + loss)).fill_nan(50.0)
+
+
+def wilder_atr(high, low, close, period):
+    return wilder(true_range(high, low, close), period, 1)
+
+
+def adx(high, low, close, period):
+    up = high.diff()
+    down = -low.diff()
+    plus_dm = pl.when((up > down) & (up > 0)).then(up).otherwise(0.0)
+    minus_dm = pl.when((down > up) & (down > 0)).then(down).otherwise(0.0)
+    atr = wilder_atr(high, low, close, period)
+    plus_di = (100 * wilder(plus_dm, period, 1) / atr).fill_nan(0.0)
+    minus_di = (100 * wilder(minus_dm, period, 1) / atr).fill_nan(0.0)
+    dx = (100 * (plus_di - minus_di).abs() / (plus_di + minus_di)).fill_nan(0.0)
+    return {
+        "adx": wilder(dx, period, period),
+        "plus_di": plus_di,
+        "minus_di": minus_di,
+    }
+
+
+def bollinger_bands(col, period, deviation):
+    mid = sma(col, period)
+    stdev = _rolling(col, period, "std", ddof=0)
+    return {
+        "mid": mid,
+        "top": mid + deviation * stdev,
+        "bottom": mid - deviation * stdev,
+    }
+
+
+def _rolling_median_mad(s, period):
+    values = s.cast(pl.Float64).to_numpy()
+    median, mad = kernels.rolling_median_mad(
+        values, period, np.empty(len(values)), np.empty(len(values))
+    )
+    return pl.DataFrame({"median": median, "mad": mad}).to_struct()
+
+
+def cci(high, low, close, period, method="mean"):
+    tp = typical_price(high, low, close)
+    if method == "median":
+        stats = tp.map_batches(
+            lambda s: _rolling_median_mad(s, period),
+            return_dtype=pl.Struct({"median": pl.Float64, "mad": pl.Float64}),
+        )
+        median = stats.struct.field("median").fill_nan(None)
+        return (1 / 0.015) * ((tp - median) / stats.struct.field("mad"))
+    tp_mad = tp.map_batches(
+        lambda s: pl.Series(rolling_mad(s.to_numpy(), period)),
+        return_dtype=pl.Float64,
+    )
+    return (1 / 0.015) * ((tp - sma(tp, period)) / tp_mad.fill_nan(None))
+
+
+def de_marker(high, low, period):
+    prev_high = high.shift(1)
+    prev_low = low.shift(1)
+    demax = pl.when(high > prev_high).then(high - prev_high).otherwise(0.0)
+    demin = pl.when(low < prev_low).then(prev_low - low).otherwise(0.0)
+    sma_demax = sma(demax, period)
+    sma_demin = sma(demin, period)
+    return sma_demax / (sma_demax + sma_demin)
+
+
+def force_index(ma, volume):
+    return (ma - ma.shift(1)) * volume
+
+
+def fractals(high, low):
+    fh = (
+        (high > high.shift(1))
+        & (high > high.shift(2))
+        & (high > high.shift(-1))
+        & (high > high.shift(-2))
+    )
+    fl = (
+        (low < low.shift(1))
+        & (low < low.shift(2))
+        & (low < low.shift(-1))
+        & (low < low.shift(-2))
+    )
+    return {"high": fh.fill_null(False), "low": fl.fill_null(False)}
+
+
+def ichimoku_kinko_hyo(
+    high, low, close, period_tenkan_sen, period_kijun_sen, period_senkou_span_b
+):
+    def mid(period):
+        return (_rolling(high, period, "max") + _rolling(low, period, "min")) / 2
+
+    tenkan = mid(period_tenkan_sen)
+    kijun = mid(period_kijun_sen)
+    return {
+        "tenkan": tenkan,
+        "kijun": kijun,
+        "ssa": _lag((tenkan + kijun) / 2, period_kijun_sen),
+        "ssb": _lag(mid(period_senkou_span_b), period_kijun_sen),
+        "chikou": _lead(close, period_kijun_sen),
+    }
+
+
+def bw_mfi(high, low, volume):
+    return (high - low) / volume * 100000
+
+
+def bar_colours(col):
+    change = (col - col.shift(1)).sign()
+    return pl.when(change != 0).then(change).forward_fill()
+
+
+def momentum(close, period):
+    return close / close.shift(period) * 100
+
+
+def mfi(high, low, close, volume, period):
+    tp = typical_price(high, low, close)
+    mf = tp * volume
+    prev_tp = tp.shift(1)
+    pmf = pl.when(tp > prev_tp).then(mf).otherwise(0.0)
+    nmf = pl.when(tp < prev_tp).then(mf).otherwise(0.0)
+    pmfs = _rolling(pmf, period, "sum").round(10)
+    nmfs = _rolling(nmf, period, "sum").round(10)
+    return 100 - (100 / (1 + pmfs / nmfs))
+
+
+def macd(close, period_fast, period_slow, period_signal):
+    value = ema(close, period_fast) - ema(close, period_slow)
+    return {"value": value, "signal": sma(value, period_signal)}
+
+
+def linear_regression(col, period, deviation):
+    """(slope, intercept, r2, forecast, top, bottom) from the moving
+    averages, see ``kernels.linear_regression``."""
+    mean = sma(col, period)
+    d = lwma(col, period) - mean
+    var = col.rolling_var(window_size=period, ddof=0)
+    explained = d**2 * (3 * (period + 1) / (period - 1))
+    line = mean + 3 * d
+    width = (
+        deviation
+        * ((var - explained).clip(lower_bound=0) * (period / (period - 2))).sqrt()
+    )
+    return (
+        d * (6 / (period - 1)),
+        mean - 3 * d,
+        (explained / var).clip(upper_bound=1),
+        mean + d * (3 * (period + 1) / (period - 1)),
+        line + width,
+        line - width,
+    )
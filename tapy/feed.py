@@ -0,0 +1,167 @@
+"""
+Asyncio adapter for live bar feeds.
+
+:class:`LiveFeed` consumes one async iterator of bars per symbol, keeps the
+last ``window`` bars of every symbol and recomputes the requested indicators
+in an executor on each new bar, so the event loop is not blocked. By default
+the window is as long as the warm-up of the indicators (see ``lookback``), so
+the values are the ones calculated on the whole history. The latest
+values are published to subscribers through bounded queues: a slow
+subscriber makes the symbol wait, which in turn stops reading its feed.
+
+    >>> feed = LiveFeed([("sma", {"period": 5}), ("macd", {})])
+    >>> subscription = feed.subscribe()
+    >>> async def main():
+    ...     task = asyncio.create_task(feed.run({"EURUSD": replay(df)}))
+    ...     async for symbol, bar, values in subscription:
+    ...         print(symbol, values["sma"], values["macd_value"])
+    ...     await task
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from .indicators import Indicators, lookback
+
+_END = object()
+
+
+class Subscription:
+    """Async iterator over ``(symbol, bar, values)`` published by a feed."""
+
+    def __init__(self, maxsize):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.queue.get()
+        if item is _END:
+            raise StopAsyncIteration
+        return item
+
+
+class _Window:
+    """Last ``size`` bars of a symbol, one numpy array per column.
+
+    Every bar is written twice, ``size`` rows apart, so the last bars are
+    always a contiguous slice of the arrays and no data frame is rebuilt
+    from the bars.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.count = 0
+        self.arrays = {}
+
+    def append(self, bar):
+        if not self.arrays:
+            for name, value in bar.items():
+                # Numbers are kept as float64, so an integer first bar does
+                # not truncate the later values
+                numeric = np.asarray(value).dtype.kind in "biuf"
+                dtype = np.float64 if numeric else object
+                self.arrays[name] = np.empty(2 * self.size, dtype=dtype)
+        row = self.count % self.size
+        for name, arr in self.arrays.items():
+            arr[row] = arr[row + self.size] = bar[name]
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def frame(self):
+        """Data frame of the kept bars, oldest first, viewing the arrays."""
+        start = self.count % self.size if self.count > self.size else 0
+        stop = start + len(self)
+        columns = {name: arr[start:stop] for name, arr in self.arrays.items()}
+        return pd.DataFrame(columns, copy=False)
+
+
+class LiveFeed:
+    """Keep indicator state for many symbols fed by async iterators.
+
+    :param list indicators: ``(method, kwargs)`` pairs of ``Indicators``
+        methods, e.g. ``[("sma", {"period": 5}), ("cci", {})]``
+    :param int window: Number of last bars kept per symbol, default: None
+        (the longest ``lookback`` of the indicators)
+    :param executor: ``concurrent.futures.Executor`` used for the
+        recomputation, default: the event loop's default executor
+    :param columns: Column names passed to ``Indicators``
+        (``open_col``, ``high_col``, ...)
+    """
+
+    def __init__(self, indicators, window=None, executor=None, **columns):
+        self.indicators = list(indicators)
+        if window is None:
+            rows = [lookback(method, kwargs) for method, kwargs in self.indicators]
+            if None in rows:
+                raise ValueError(
+                    'The "window" should be given for indicators depending '
+                    "on the whole history or on time spans"
+                )
+            window = max(rows, default=1)
+        self.window = window
+        self.executor = executor
+        self.columns = columns
+        self.bars = {}
+        self.values = {}
+        self._subscriptions = []
+
+    def subscribe(self, maxsize=100):
+        """Subscribe to the values of all symbols.
+
+        :param int maxsize: Queue size, publishing waits while it is full
+        :return: Subscription
+        """
+        subscription = Subscription(maxsize)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def compute(self, symbol):
+        """Compute the indicators on the kept bars of a symbol and return
+        their values at the last bar."""
+        df = self.bars[symbol].frame()
+        return Indicators(df, **self.columns).latest(self.indicators)
+
+    async def _publish(self, item):
+        for subscription in self._subscriptions:
+            await subscription.queue.put(item)
+
+    async def _consume(self, symbol, bars):
+        loop = asyncio.get_running_loop()
+        self.bars[symbol] = _Window(self.window)
+        async for bar in bars:
+            self.bars[symbol].append(bar)
+            values = await loop.run_in_executor(self.executor, self.compute, symbol)
+            self.values[symbol] = values
+            await self._publish((symbol, bar, values))
+
+    async def run(self, feeds):
+        """Consume the feeds until all of them are exhausted.
+
+        :param dict feeds: Symbol to async iterator of bars (dicts with
+            the OHLCV columns)
+        """
+        try:
+            await asyncio.gather(
+                *(self._consume(symbol, bars) for symbol, bars in feeds.items())
+            )
+        finally:
+            await self._publish(_END)
+
+
+async def replay(df, delay=0.0):
+    """Replay data frame rows as a simulated feed of bars.
+
+    :param df: pandas data frame or path to a CSV file like EURUSD60.csv
+    :param float delay: Seconds to wait between bars, default: 0
+    """
+    if isinstance(df, str):
+        df = pd.read_csv(df)
+    for bar in df.to_dict("records"):
+        yield bar
+        await asyncio.sleep(delay)
@@ -0,0 +1,74 @@
+"""
+Indicators updated one bar at a time, for live data.
+
+The state keeps only the last bar and the smoothed values, so an update
+costs the same whatever the length of the history, and the values are the
+same as the batch kernels give on the whole history:
+
+    >>> state = WilderState(period=14)
+    >>> for high, low, close in bars:
+    ...     rsi, adx, plus_di, minus_di, atr = state.update(high, low, close)
+"""
+
+NAN = float("nan")
+
+
+class WilderState:
+    """RSI, ADX, +DI, -DI and Wilder's ATR, see ``kernels.wilder_suite``.
+
+    :param int period: Smoothing period, default: 14
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.bars = 0
+        self._prev = None
+        # Sums during the warm-up, then smoothed true range, +DM, -DM,
+        # gain and loss
+        self._smoothed = [0.0] * 5
+        self._adx = 0.0
+
+    def _smooth(self, prev, value, bar, start):
+        """Wilder's smoothing of a value that starts at bar ``start``."""
+        seed_at = start + self.period - 1
+        if bar < seed_at:
+            return prev + value
+        if bar == seed_at:
+            return (prev + value) / self.period
+        return (prev * (self.period - 1) + value) / self.period
+
+    def update(self, high, low, close):
+        """Add a bar and return (rsi, adx, plus_di, minus_di, atr), NaN
+        until the smoothing has enough bars."""
+        bar = self.bars
+        prev, self._prev = self._prev, (high, low, close)
+        self.bars += 1
+        if prev is None:
+            return NAN, NAN, NAN, NAN, NAN
+        prev_high, prev_low, prev_close = prev
+        up, down = high - prev_high, prev_low - low
+        change = close - prev_close
+        values = (
+            max(high - low, abs(high - prev_close), abs(low - prev_close)),
+            up if up > down and up > 0 else 0.0,
+            down if down > up and down > 0 else 0.0,
+            max(change, 0.0),
+            max(-change, 0.0),
+        )
+        self._smoothed = [
+            self._smooth(prev, value, bar, 1)
+            for prev, value in zip(self._smoothed, values)
+        ]
+        period = self.period
+        if bar < period:
+            return NAN, NAN, NAN, NAN, NAN
+
+        atr, plus_dm, minus_dm, gain, loss = self._smoothed
+        rsi = 100 * gain / (gain + loss) if gain + loss else 50.0
+        plus_di = 100 * plus_dm / atr if atr else 0.0
+        minus_di = 100 * minus_dm / atr if atr else 0.0
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum else 0.0
+        self._adx = self._smooth(self._adx, dx, bar, period)
+        adx = self._adx if bar >= 2 * period - 1 else NAN
+        return rsi, adx, plus_di, minus_di, atr
@@ -1,18 +1,369 @@
-import pandas as pd
+import collections
+import concurrent.futures
+import copy
+import datetime
+import functools
+import importlib
+import inspect
+import math
+import random
 
 import numpy as np
 
-from .utils import (
-    calculate_alma,
-    calculate_ao,
-    calculate_sma,
-    calculate_smma,
-    mad,
-)
+from . import kernels, reference
+from .utils import alma_weights
 
 __version__ = "1.11.0"
 
 
+def _is_polars(df):
+    """Check whether df is a Polars DataFrame or LazyFrame."""
+    return type(df).__module__.split(".")[0] == "polars"
+
+
+# Column name parameters of every indicator, in the order of its ``out`` arrays
+OUTPUTS = {
+    "sma": ("column_name",),
+    "smma": ("column_name",),
+    "ema": ("column_name",),
+    "lwma": ("column_name",),
+    "alma": ("column_name",),
+    "awesome_oscillator": ("column_name",),
+    "accelerator_oscillator": ("column_name",),
+    "accumulation_distribution": ("column_name",),
+    "alligator": ("column_name_jaws", "column_name_teeth", "column_name_lips"),
+    "atr": ("column_name",),
+    "bears_power": ("column_name",),
+    "bollinger_bands": (
+        "column_name_top",
+        "column_name_mid",
+        "column_name_bottom",
+    ),
+    "bulls_power": ("column_name",),
+    "linear_regression": (
+        "column_name_slope",
+        "column_name_intercept",
+        "column_name_r2",
+        "column_name_forecast",
+        "column_name_top",
+        "column_name_bottom",
+    ),
+    "cci": ("column_name",),
+    "de_marker": ("column_name",),
+    "force_index": ("column_name",),
+    "fractals": ("column_name_high", "column_name_low"),
+    "gator": ("column_name_val1", "column_name_val2"),
+    "ichimoku_kinko_hyo": (
+        "column_name_tenkan_sen",
+        "column_name_kijun_sen",
+        "column_name_senkou_span_a",
+        "column_name_senkou_span_b",
+        "column_name_chikou_span",
+    ),
+    "bw_mfi": ("column_name",),
+    "momentum": ("column_name",),
+    "mfi": ("column_name",),
+    "macd": ("column_name_value", "column_name_signal"),
+    "rsi": ("column_name",),
+    "wilder_atr": ("column_name",),
+    "adx": ("column_name_adx", "column_name_plus_di", "column_name_minus_di"),
+    "wilder_suite": (
+        "column_name_rsi",
+        "column_name_adx",
+        "column_name_plus_di",
+        "column_name_minus_di",
+        "column_name_atr",
+    ),
+    "oscillators": (
+        "column_name_mfi",
+        "column_name_de_marker",
+        "column_name_momentum",
+        "column_name_bw_mfi",
+    ),
+    "bill_williams": (
+        "column_name_ao",
+        "column_name_ac",
+        "column_name_jaws",
+        "column_name_teeth",
+        "column_name_lips",
+        "column_name_val1",
+        "column_name_val2",
+        "column_name_fractals_high",
+        "column_name_fractals_low",
+        "column_name_bw_mfi",
+        "column_name_ao_colour",
+        "column_name_ac_colour",
+    ),
+}
+
+# Outputs of boolean dtype, the others are float
+BOOLEAN_OUTPUTS = {
+    "fractals": {"column_name_high", "column_name_low"},
+    "bill_williams": {"column_name_fractals_high", "column_name_fractals_low"},
+}
+
+
+Features = collections.namedtuple("Features", ["values", "names", "warmup"])
+
+# Prices derived from the OHLC columns, accepted by ``apply_to``
+PRICES = {
+    "Median": (kernels.median_price, ("High", "Low")),
+    "Typical": (kernels.typical_price, ("High", "Low", "Close")),
+}
+
+
+def _is_span(period):
+    """Whether a period is a time span ("4h", a timedelta) rather than a
+    number of bars."""
+    return isinstance(period, (str, datetime.timedelta, np.timedelta64))
+
+
+def _bars_only(method, **periods):
+    """Raise a ValueError for the periods given as time spans to an
+    indicator whose windows can only be a number of bars."""
+    for name, period in periods.items():
+        if _is_span(period):
+            raise ValueError(
+                f'The "{name}" of "{method}" can be only a number of bars, '
+                "time spans are not supported"
+            )
+
+
+def _names(column_name, apply_to, period=None):
+    """Column names of an indicator applied to one or a list of columns, and
+    for one or a list of periods."""
+    if isinstance(period, (list, tuple)):
+        return [name for p in period for name in _names(f"{column_name}_{p}", apply_to)]
+    if isinstance(apply_to, str):
+        return [column_name]
+    return [f"{column_name}_{name}" for name in apply_to]
+
+
+@functools.cache
+def _parameters(method):
+    return inspect.signature(getattr(Indicators, method)).parameters
+
+
+def output_columns(method, kwargs):
+    """Return the names of the columns an indicator call adds, in the
+    order of its ``out`` arrays."""
+    parameters = _parameters(method)
+    columns = [kwargs.get(name, parameters[name].default) for name in OUTPUTS[method]]
+    if "apply_to" in parameters:
+        apply_to = kwargs.get("apply_to", parameters["apply_to"].default)
+        period = kwargs.get("period", parameters["period"].default)
+        return [name for column in columns for name in _names(column, apply_to, period)]
+    return columns
+
+
+def _out_arrays(method, kwargs, n, buffers=None):
+    """Allocate the ``out`` argument of an indicator call for n bars, or
+    take it from buffers.
+
+    :return: (column names, out, one array per column)
+    """
+    columns = output_columns(method, kwargs)
+    # A list of periods and a list of columns add axes to every line
+    axes = [
+        len(value)
+        for value in (kwargs.get("period"), kwargs.get("apply_to", "Close"))
+        if isinstance(value, (list, tuple))
+    ]
+    if axes:
+        if buffers is None:
+            block = np.empty((len(columns), n))
+        else:
+            block = buffers.get(f"out_{method}", (len(columns), n))
+        lines = block.reshape(len(OUTPUTS[method]), *axes, n)
+        return columns, tuple(lines) if len(lines) > 1 else lines[0], tuple(block)
+    boolean = BOOLEAN_OUTPUTS.get(method, ())
+    dtypes = [bool if name in boolean else float for name in OUTPUTS[method]]
+    if buffers is None:
+        arrays = tuple(np.empty(n, dtype=dtype) for dtype in dtypes)
+    else:
+        arrays = tuple(
+            buffers.get(f"out_{method}_{k}", n, dtype=dtype)
+            for k, dtype in enumerate(dtypes)
+        )
+    return columns, arrays if len(arrays) > 1 else arrays[0], arrays
+
+
+def _warmup(alpha, tolerance):
+    """Number of bars after which a recursive smoothing with factor
+    ``alpha`` gives less than ``tolerance`` weight to its first value."""
+    if alpha >= 1:
+        return 0
+    return math.ceil(math.log(tolerance) / math.log(1 - alpha))
+
+
+def _ma_lookback(period, method, warmup):
+    if method == "ema":
+        return warmup(2 / (period + 1))
+    if method == "smma":
+        return period + warmup(1 / period)
+    return period
+
+
+def _alligator_lookback(p, warmup):
+    return max(
+        p[f"period_{line}"] + p[f"shift_{line}"] + warmup(1 / p[f"period_{line}"])
+        for line in ("jaws", "teeth", "lips")
+    )
+
+
+def _wilder_lookback(p, warmup):
+    return p["period"] + 1 + warmup(1 / p["period"])
+
+
+# Smallest period of the indicators which are not defined for shorter
+# windows: the channel of the linear regression divides by ``period - 2``
+MIN_PERIOD = {"linear_regression": 3}
+
+# Number of bars needed to calculate the last value of every indicator from
+# its bound arguments and a warm-up function for recursive smoothings. None
+# means the whole history
+LOOKBACK = {
+    "sma": lambda p, warmup: p["period"],
+    "smma": lambda p, warmup: _ma_lookback(p["period"], "smma", warmup),
+    "ema": lambda p, warmup: _ma_lookback(p["period"], "ema", warmup),
+    "lwma": lambda p, warmup: p["period"],
+    "alma": lambda p, warmup: p["period"],
+    "awesome_oscillator": lambda p, warmup: 34,
+    "accelerator_oscillator": lambda p, warmup: 38,
+    "accumulation_distribution": lambda p, warmup: None,
+    "alligator": _alligator_lookback,
+    "atr": lambda p, warmup: p["period"] + 1,
+    "bears_power": lambda p, warmup: _ma_lookback(p["period"], "ema", warmup),
+    "bollinger_bands": lambda p, warmup: p["period"],
+    "bulls_power": lambda p, warmup: _ma_lookback(p["period"], "ema", warmup),
+    "linear_regression": lambda p, warmup: int(np.max(p["period"])),
+    "cci": lambda p, warmup: p["period"],
+    "de_marker": lambda p, warmup: p["period"] + 1,
+    "force_index": lambda p, warmup: _ma_lookback(p["period"], p["method"], warmup) + 1,
+    "fractals": lambda p, warmup: 5,
+    "gator": _alligator_lookback,
+    "ichimoku_kinko_hyo": lambda p, warmup: (
+        max(p["period_tenkan_sen"], p["period_senkou_span_b"]) + p["period_kijun_sen"]
+    ),
+    "bw_mfi": lambda p, warmup: 1,
+    "momentum": lambda p, warmup: p["period"] + 1,
+    "mfi": lambda p, warmup: p["period"] + 1,
+    "macd": lambda p, warmup: (
+        _ma_lookback(max(p["period_fast"], p["period_slow"]), "ema", warmup)
+        + p["period_signal"]
+    ),
+    "rsi": _wilder_lookback,
+    "wilder_atr": _wilder_lookback,
+    "adx": lambda p, warmup: 2 * _wilder_lookback(p, warmup),
+    "wilder_suite": lambda p, warmup: 2 * _wilder_lookback(p, warmup),
+    "oscillators": lambda p, warmup: (
+        max(p["period_mfi"], p["period_de_marker"], p["period_momentum"]) + 1
+    ),
+    # The colour of the last AC bar needs the AC of the bar before
+    "bill_williams": lambda p, warmup: max(39, _alligator_lookback(p, warmup)),
+}
+
+
+# Number of bars after a bar that its value depends on, for the indicators
+# looking ahead
+LOOKAHEAD = {
+    "fractals": lambda p: 2,
+    "bill_williams": lambda p: 2,
+    "ichimoku_kinko_hyo": lambda p: p["period_kijun_sen"],
+}
+
+
+def _has_span(arguments):
+    """Whether any period of the arguments is a time span, the number of
+    bars of its windows is then unknown."""
+    return any(
+        _is_span(value)
+        for name, value in arguments.items()
+        if name.startswith("period")
+    )
+
+
+def _arguments(method, kwargs):
+    """All the arguments of an indicator call, with the defaults."""
+    return {
+        name: kwargs.get(name, parameter.default)
+        for name, parameter in _parameters(method).items()
+        if name not in ("self", "out")
+    }
+
+
+def lookback(method, kwargs, tolerance=1e-10):
+    """Return the number of bars an indicator call needs to calculate its
+    last value, or None when it depends on the whole history or on time
+    spans.
+
+    Windowed indicators are exact. Recursive smoothings (EMA, SMMA,
+    Wilder's) are warmed up until the weight left on the bars before is
+    below ``tolerance``.
+    """
+    arguments = _arguments(method, kwargs)
+    if _has_span(arguments):
+        return None
+    return LOOKBACK[method](arguments, lambda a: _warmup(a, tolerance))
+
+
+def lookahead(method, kwargs):
+    """Return the number of bars after a bar that the value of an
+    indicator call at this bar depends on, e.g. 2 for fractals, or None
+    when it depends on time spans."""
+    if method not in LOOKAHEAD:
+        return 0
+    arguments = _arguments(method, kwargs)
+    if _has_span(arguments):
+        return None
+    return LOOKAHEAD[method](arguments)
+
+
+class _Tail:
+    """Last rows of the columns of a data frame, as numpy views.
+
+    :param dict arrays: Cache of the columns read from df as numpy arrays,
+        shared by the tails of the same frame
+    """
+
+    def __init__(self, df, rows, arrays):
+        self._df = df
+        self._rows = rows
+        self._arrays = arrays
+
+    def __contains__(self, name):
+        return name in self._df
+
+    def __getitem__(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.asarray(self._df[name])
+        return self._arrays[name][-self._rows :]
+
+    def __len__(self):
+        return min(self._rows, len(self._df))
+
+
+class _Columns:
+    """Columns of a data frame, with the columns an indicator adds kept in
+    ``added`` instead of modifying the data frame."""
+
+    def __init__(self, df):
+        self._df = df
+        self.added = {}
+
+    def __contains__(self, name):
+        return name in self.added or name in self._df
+
+    def __getitem__(self, name):
+        return self.added[name] if name in self.added else self._df[name]
+
+    def __setitem__(self, name, values):
+        self.added[name] = values
+
+    def __len__(self):
+        return len(self._df)
+
+
 class Indicators:
     """Add technical indicators data to a pandas data frame.
 
@@ -42,17 +393,30 @@ class Indicators:
         low_col="Low",
         close_col="Close",
         volume_col="Volume",
+        time_col=None,
     ):
         """Initiate Indicators object.
 
         :param pandas data frame df: Should contain OHLC columns and
-            Volume column
+            Volume column. Polars DataFrame and LazyFrame are supported as
+            well, in that case indicators are added as Polars expressions
+            and ``df`` keeps its type.
         :param str open_col: Name of Open column in df
         :param str high_col: Name of High column in df
         :param str low_col: Name of Low column in df
         :param str close_col: Name of Close column in df
         :param str volume_col: Name of Volume column in df. This column
             is optional and require only if indicator use this data.
+        :param str time_col: Name of the datetime column the periods given
+            as time spans (e.g. ``period="4h"``) are measured on, default:
+            the index of df, a Polars frame needs the column. Time spans
+            are supported by sma, smma, ema, atr, bollinger_bands,
+            de_marker, mfi, ichimoku_kinko_hyo, bears_power, bulls_power,
+            alligator, gator, bill_williams, force_index (except with
+            "lwma") and the MFI and DeMarker periods of oscillators. lwma,
+            alma, linear_regression, cci, momentum, macd, rsi, wilder_atr,
+            adx and wilder_suite have windows of a number of bars only and
+            raise a ValueError for time spans.
         """
         self.df = df
         self._columns = {
@@ -62,8 +426,84 @@ class Indicators:
             "Close": close_col,
             "Volume": volume_col,
         }
+        self._time_col = time_col
+        self._buffers = kernels.Buffers()
+        # Scratch buffers of ``latest`` by number of rows
+        self._tail_buffers = {}
+        self._pl = None
+        if _is_polars(df):
+            self._pl = importlib.import_module("tapy.expressions")
+
+    def _values(self, name):
+        """Return a column as a float numpy array. Float columns are not
+        copied, other columns are cast into a reused buffer."""
+        column = self._columns.get(name, name)
+        if name in PRICES and column not in self.df:
+            function, inputs = PRICES[name]
+            buf = self._buffers.get(f"price_{name}", len(self.df))
+            return function(*map(self._values, inputs), buf)
+        values = np.asarray(self.df[column])
+        if values.dtype == np.float64:
+            return values
+        buf = self._buffers.get(f"column_{name}", len(values))
+        np.copyto(buf, values, casting="unsafe")
+        return buf
+
+    def _window(self, period):
+        """Return ``period`` for the kernels or the expressions: a number
+        of bars, or the windows of a time span over the timestamps."""
+        if not _is_span(period):
+            return period
+        if self._pl is not None:
+            if self._time_col is None:
+                raise ValueError(
+                    'The "period" can be a time span only with a "time_col" '
+                    "for Polars frames"
+                )
+            return self._pl.time_window(self._pl_col(self._time_col), period)
+        times = self.df.index if self._time_col is None else self.df[self._time_col]
+        return kernels.TimeWindows(kernels.timestamps(times), period)
+
+    def _sources(self, apply_to):
+        """Return the values of one column, or of a list of columns as a
+        contiguous (columns, rows) block for the 2-D kernels."""
+        if isinstance(apply_to, str):
+            return self._values(apply_to)
+        block = self._buffers.get("apply_to", (len(apply_to), len(self.df)))
+        for row, name in zip(block, apply_to):
+            row[:] = self._values(name)
+        return block
+
+    def _assign(self, columns):
+        """Add numpy arrays as columns of df. The arrays are aligned by
+        position, so any index works without merging or resetting it."""
+        for name, values in columns.items():
+            self.df[name] = values
+
+    def _assign_named(self, column_name, apply_to, values):
+        """Add the values of one or a list of ``apply_to`` columns."""
+        names = _names(column_name, apply_to)
+        self._assign(dict(zip(names, np.atleast_2d(values))))
+
+    def _pl_col(self, name):
+        column = self._columns.get(name, name)
+        if name in PRICES and column not in self.df.collect_schema().names():
+            function, inputs = PRICES[name]
+            return getattr(self._pl, function.__name__)(*map(self._pl_col, inputs))
+        return self._pl.column(column)
+
+    def _pl_apply(self, column_name, apply_to, function):
+        """Add ``function`` of one or a list of ``apply_to`` columns."""
+        names = [apply_to] if isinstance(apply_to, str) else apply_to
+        expressions = [function(self._pl_col(name)) for name in names]
+        self._pl_assign(dict(zip(_names(column_name, apply_to), expressions)))
+
+    def _pl_assign(self, columns):
+        self.df = self.df.with_columns(
+            [expr.alias(name) for name, expr in columns.items()]
+        )
 
-    def sma(self, period=5, column_name="sma", apply_to="Close"):
+    def sma(self, period=5, column_name="sma", apply_to="Close", out=None):
         """
         Simple Moving Average (SMA)
         ---------------------
@@ -71,17 +511,31 @@ class Indicators:
 
             >>> Indicators.sma(period=5, column_name='sma', apply_to='Close')
 
-            :param int period: the number of calculation periods, default: 5
+            :param period: the number of calculation periods, or a time
+                span such as ``"4h"`` of the windows over the timestamps
+                (see ``time_col``), default: 5
             :param str column_name: Column name, default: sma
             :param str apply_to: Which column use for calculation.
-                Can be *"Open"*, *"High"*, *"Low"* and *"Close"*.
+                Can be *"Open"*, *"High"*, *"Low"*, *"Close"*, *"Median"*
+                and *"Typical"*, or a list of them to add the columns
+                ``<column_name>_<apply_to>`` in one pass.
                 **Default**: Close
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, a (columns, rows) array
+                for a list of columns, default: None
             :return: None
 
         """
-        calculate_sma(self.df, period, column_name, apply_to)
-
-    def smma(self, period=5, column_name="smma", apply_to="Close"):
+        period = self._window(period)
+        if out is not None:
+            return kernels.sma(self._sources(apply_to), period, out, self._buffers)
+        if self._pl is not None:
+            self._pl_apply(column_name, apply_to, lambda col: self._pl.sma(col, period))
+            return
+        values = kernels.sma(self._sources(apply_to), period, None, self._buffers)
+        self._assign_named(column_name, apply_to, values)
+
+    def smma(self, period=5, column_name="smma", apply_to="Close", out=None):
         """
         Smoothed Moving Average (SMMA)
         ---------------------
@@ -89,18 +543,34 @@ class Indicators:
 
             >>> Indicators.smma(period=5, column_name='smma', apply_to='Close')
 
-            :param int period: the number of calculation periods, default: 5
+            :param period: the number of calculation periods, or a time
+                span such as ``"4h"``: the values then decay with
+                ``exp(-dt / span)`` over the time between the rows,
+                default: 5
             :param str column_name: Column name, default: smma
             :param str apply_to: Which column use for calculation.
-                Can be *"Open"*, *"High"*, *"Low"* and *"Close"*.
+                Can be *"Open"*, *"High"*, *"Low"*, *"Close"*, *"Median"*
+                and *"Typical"*, or a list of them to add the columns
+                ``<column_name>_<apply_to>`` in one pass.
                 **Default**: Close
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, a (columns, rows) array
+                for a list of columns, default: None
             :return: None
 
         """
-        df_smma = calculate_smma(self.df, period, column_name, apply_to)
-        self.df = self.df.merge(df_smma, left_index=True, right_index=True)
+        period = self._window(period)
+        if out is not None:
+            return kernels.smma(self._sources(apply_to), period, out, self._buffers)
+        if self._pl is not None:
+            self._pl_apply(
+                column_name, apply_to, lambda col: self._pl.smma(col, period)
+            )
+            return
+        values = kernels.smma(self._sources(apply_to), period)
+        self._assign_named(column_name, apply_to, values)
 
-    def ema(self, period=5, column_name="ema", apply_to="Close"):
+    def ema(self, period=5, column_name="ema", apply_to="Close", out=None):
         """
         Exponential Moving Average (EMA)
         ---------------------
@@ -109,17 +579,62 @@ class Indicators:
 
             >>> Indicators.ema(period=5, column_name='ema', apply_to='Close')
 
-            :param int period: the number of calculation periods, default: 5
+            :param period: the number of calculation periods, or a time
+                span such as ``"4h"``: the values then decay with
+                ``exp(-2 dt / span)`` over the time between the rows,
+                default: 5
             :param str column_name: Column name, default: ema
             :param str apply_to: Which column use for calculation.
-                Can be *"Open"*, *"High"*, *"Low"* and *"Close"*.
+                Can be *"Open"*, *"High"*, *"Low"*, *"Close"*, *"Median"*
+                and *"Typical"*, or a list of them to add the columns
+                ``<column_name>_<apply_to>`` in one pass.
                 **Default**: Close
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, a (columns, rows) array
+                for a list of columns, default: None
             :return: None
 
         """
-        self.df[column_name] = (
-            self.df[self._columns[apply_to]].ewm(span=period, adjust=False).mean()
-        )
+        period = self._window(period)
+        if out is not None:
+            return kernels.ema(self._sources(apply_to), period, out, self._buffers)
+        if self._pl is not None:
+            self._pl_apply(column_name, apply_to, lambda col: self._pl.ema(col, period))
+            return
+        values = kernels.ema(self._sources(apply_to), period)
+        self._assign_named(column_name, apply_to, values)
+
+    def lwma(self, period=5, column_name="lwma", apply_to="Close", out=None):
+        """
+        Linear Weighted Moving Average (LWMA)
+        ---------------------
+            https://www.metatrader4.com/en/trading-platform/help/analytics/tech_indicators/moving_average#linear_weighted_moving_average
+
+            >>> Indicators.lwma(period=5, column_name='lwma', apply_to='Close')
+
+            :param int period: the number of calculation periods, default: 5
+            :param str column_name: Column name, default: lwma
+            :param str apply_to: Which column use for calculation.
+                Can be *"Open"*, *"High"*, *"Low"*, *"Close"*, *"Median"*
+                and *"Typical"*, or a list of them to add the columns
+                ``<column_name>_<apply_to>`` in one pass.
+                **Default**: Close
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, a (columns, rows) array
+                for a list of columns, default: None
+            :return: None
+
+        """
+        _bars_only("lwma", period=period)
+        if out is not None:
+            return kernels.lwma(self._sources(apply_to), period, out, self._buffers)
+        if self._pl is not None:
+            self._pl_apply(
+                column_name, apply_to, lambda col: self._pl.lwma(col, period)
+            )
+            return
+        values = kernels.lwma(self._sources(apply_to), period, None, self._buffers)
+        self._assign_named(column_name, apply_to, values)
 
     def alma(
         self,
@@ -128,6 +643,7 @@ class Indicators:
         sigma=6,
         apply_to="Close",
         column_name="alma",
+        out=None,
     ):
         """
         Arnaud Legoux Moving Average (ALMA)
@@ -141,12 +657,27 @@ class Indicators:
             :offset (float, optional): N. Defaults to 0.85.
             :sigma (int, optional): No.of standard deviation. Defaults to 6.
             :apply_to (str, optional): Which column use for calculation.
-                Can be *"Open"*, *"High"*, *"Low"* and *"Close"*.. Defaults to "Close".
+                Can be *"Open"*, *"High"*, *"Low"*, *"Close"*, *"Median"* and
+                *"Typical"*, or a list of them to add the columns
+                ``<column_name>_<apply_to>`` in one pass. Defaults to "Close".
             :column_name (str, optional): Column name in datafram. Defaults to "alma".
+            :out (numpy.ndarray, optional): Write the values into this numpy
+                array instead of adding a column to df, a (columns, rows) array
+                for a list of columns. Defaults to None.
         """
-        self.df = calculate_alma(self.df, period, offset, sigma, apply_to, column_name)
+        _bars_only("alma", period=period)
+        weights = alma_weights(period, offset, sigma)
+        if out is not None:
+            return kernels.alma(self._sources(apply_to), weights, out, self._buffers)
+        if self._pl is not None:
+            self._pl_apply(
+                column_name, apply_to, lambda col: self._pl.alma(col, period, weights)
+            )
+            return
+        values = kernels.alma(self._sources(apply_to), weights, None, self._buffers)
+        self._assign_named(column_name, apply_to, values)
 
-    def awesome_oscillator(self, column_name="ao"):
+    def awesome_oscillator(self, column_name="ao", out=None):
         """
         Awesome Oscillator (AO)
         -----------------------
@@ -156,21 +687,22 @@ class Indicators:
             >>> Indicators.awesome_oscillator(column_name='ao')
 
             :param str column_name: Column name, default: ao
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        # Data frame for storing temporary data
-
-        df_tmp = pd.DataFrame()
-        df_tmp["High"] = self.df[self._columns["High"]]
-        df_tmp["Low"] = self.df[self._columns["Low"]]
-
-        # Calculate Awesome Oscillator
-
-        calculate_ao(df_tmp, column_name)
-        df_tmp = df_tmp[[column_name]]
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
-
-    def accelerator_oscillator(self, column_name="ac"):
+        if out is not None:
+            high, low = self._values("High"), self._values("Low")
+            return kernels.awesome_oscillator(high, low, out, self._buffers)
+        if self._pl is not None:
+            high, low = self._pl_col("High"), self._pl_col("Low")
+            self._pl_assign({column_name: self._pl.awesome_oscillator(high, low)})
+            return
+        high, low = self._values("High"), self._values("Low")
+        values = kernels.awesome_oscillator(high, low, None, self._buffers)
+        self._assign({column_name: values})
+
+    def accelerator_oscillator(self, column_name="ac", out=None):
         """
         Accelerator Oscillator (AC)
         -----------------------
@@ -180,30 +712,22 @@ class Indicators:
             >>> Indicators.accelerator_oscillator(column_name='ac')
 
             :param str column_name: Column name, default: ac
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        pass
-        # Data frame for storing temporary data
-
-        df_tmp = pd.DataFrame()
-        df_tmp["High"] = self.df[self._columns["High"]]
-        df_tmp["Low"] = self.df[self._columns["Low"]]
-
-        # Calculate Awesome Oscillator
-
-        calculate_ao(df_tmp, "ao")
-
-        # Calculate SMA for Awesome Oscillator
-
-        calculate_sma(df_tmp, 5, "sma_ao", "ao")
-
-        # Calculate Accelerator Oscillator
-
-        df_tmp[column_name] = df_tmp["ao"] - df_tmp["sma_ao"]
-        df_tmp = df_tmp[[column_name]]
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
-
-    def accumulation_distribution(self, column_name="a/d"):
+        if out is not None:
+            high, low = self._values("High"), self._values("Low")
+            return kernels.accelerator_oscillator(high, low, out, self._buffers)
+        if self._pl is not None:
+            high, low = self._pl_col("High"), self._pl_col("Low")
+            self._pl_assign({column_name: self._pl.accelerator_oscillator(high, low)})
+            return
+        high, low = self._values("High"), self._values("Low")
+        values = kernels.accelerator_oscillator(high, low, None, self._buffers)
+        self._assign({column_name: values})
+
+    def accumulation_distribution(self, column_name="a/d", out=None):
         """
         Accumulation/Distribution (A/D)
         ---------------------
@@ -213,26 +737,38 @@ class Indicators:
             >>> Indicators.accumulation_distribution(column_name='a/d')
 
             :param str column_name: Column name, default: a/d
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
 
         """
-        # Temporary df
-
-        df_tmp = pd.DataFrame()
-        df_tmp["close"] = self.df[self._columns["Close"]]
-        df_tmp["high"] = self.df[self._columns["High"]]
-        df_tmp["low"] = self.df[self._columns["Low"]]
-        df_tmp["volume"] = self.df[self._columns["Volume"]]
-
-        df_tmp["calc"] = (
-            ((df_tmp["close"] - df_tmp["low"]) - (df_tmp["high"] - df_tmp["close"]))
-            * df_tmp["volume"]
-            / (df_tmp["high"] - df_tmp["low"])
+        if out is not None:
+            return kernels.accumulation_distribution(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                self._values("Volume"),
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            ad = self._pl.accumulation_distribution(
+                self._pl_col("High"),
+                self._pl_col("Low"),
+                self._pl_col("Close"),
+                self._pl_col("Volume"),
+            )
+            self._pl_assign({column_name: ad})
+            return
+        values = kernels.accumulation_distribution(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            self._values("Volume"),
+            None,
+            self._buffers,
         )
-
-        df_tmp[column_name] = df_tmp["calc"].explode().sum()
-        df_tmp = df_tmp[[column_name]]
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        self._assign({column_name: values})
 
     def alligator(
         self,
@@ -245,6 +781,7 @@ class Indicators:
         column_name_jaws="alligator_jaws",
         column_name_teeth="alligator_teeth",
         column_name_lips="alligator_lips",
+        out=None,
     ):
         """
         Alligator
@@ -253,38 +790,69 @@ class Indicators:
 
             >>> Indicators.alligator(period_jaws=13, period_teeth=8, period_lips=5, shift_jaws=8, shift_teeth=5, shift_lips=3, column_name_jaws='alligator_jaw', column_name_teeth='alligator_teeth', column_name_lips='alligator_lips')
 
-            :param int period_jaws: Period for Alligator' Jaws, default: 13
-            :param int period_teeth: Period for Alligator' Teeth, default: 8
-            :param int period_lips: Period for Alligator' Lips, default: 5
+            :param period_jaws: Period for Alligator' Jaws, or a time
+                span such as ``"4h"`` (see ``time_col``), default: 13
+            :param period_teeth: Period for Alligator' Teeth, or a time
+                span such as ``"4h"`` (see ``time_col``), default: 8
+            :param period_lips: Period for Alligator' Lips, or a time
+                span such as ``"4h"`` (see ``time_col``), default: 5
             :param int shift_jaws: Period for Alligator' Jaws, default: 8
             :param int shift_teeth: Period for Alligator' Teeth, default: 5
             :param int shift_lips: Period for Alligator' Lips, default: 3
             :param str column_name_jaws: Column Name for Alligator' Jaws, default: alligator_jaws
             :param str column_name_teeth: Column Name for Alligator' Teeth, default: alligator_teeth
             :param str column_name_lips: Column Name for Alligator' Lips, default: alligator_lips
+            :param tuple out: Numpy arrays for jaws, teeth and lips.
+                Values are written into them instead of adding columns
+                to df, default: None
             :return: None
         """
-        df_median = self.df[[self._columns["High"], self._columns["Low"]]]
-        median_col = "median_col"
-        df_median = df_median.assign(
-            median_col=lambda x: (x[self._columns["High"]] + x[self._columns["Low"]])
-            / 2
+        period_jaws = self._window(period_jaws)
+        period_teeth = self._window(period_teeth)
+        period_lips = self._window(period_lips)
+        if out is not None:
+            high, low = self._values("High"), self._values("Low")
+            lines = zip(
+                (period_jaws, period_teeth, period_lips),
+                (shift_jaws, shift_teeth, shift_lips),
+                out,
+            )
+            return tuple(
+                kernels.alligator_line(high, low, period, shift, arr, self._buffers)
+                for period, shift, arr in lines
+            )
+        if self._pl is not None:
+            high, low = self._pl_col("High"), self._pl_col("Low")
+            self._pl_assign(
+                {
+                    column_name_jaws: self._pl.alligator(
+                        high, low, period_jaws, shift_jaws
+                    ),
+                    column_name_teeth: self._pl.alligator(
+                        high, low, period_teeth, shift_teeth
+                    ),
+                    column_name_lips: self._pl.alligator(
+                        high, low, period_lips, shift_lips
+                    ),
+                }
+            )
+            return
+        high, low = self._values("High"), self._values("Low")
+        lines = zip(
+            (column_name_jaws, column_name_teeth, column_name_lips),
+            (period_jaws, period_teeth, period_lips),
+            (shift_jaws, shift_teeth, shift_lips),
+        )
+        self._assign(
+            {
+                name: kernels.alligator_line(
+                    high, low, period, shift, None, self._buffers
+                )
+                for name, period, shift in lines
+            }
         )
-        df_j = calculate_smma(df_median, period_jaws, column_name_jaws, median_col)
-        df_t = calculate_smma(df_median, period_teeth, column_name_teeth, median_col)
-        df_l = calculate_smma(df_median, period_lips, column_name_lips, median_col)
-
-        # Shift SMMAs
-
-        df_j[column_name_jaws] = df_j[column_name_jaws].shift(shift_jaws)
-        df_t[column_name_teeth] = df_t[column_name_teeth].shift(shift_teeth)
-        df_l[column_name_lips] = df_l[column_name_lips].shift(shift_lips)
-
-        self.df = self.df.merge(df_j, left_index=True, right_index=True)
-        self.df = self.df.merge(df_t, left_index=True, right_index=True)
-        self.df = self.df.merge(df_l, left_index=True, right_index=True)
 
-    def atr(self, period=14, column_name="atr"):
+    def atr(self, period=14, column_name="atr", out=None):
         """
         Average True Range (ATR)
         ------------------------
@@ -292,35 +860,40 @@ class Indicators:
 
             >>> Indicators.atr(period=14, column_name='atr')
 
-            :param int period: Period, default: 14
+            :param period: Period, or a time span such as ``"4h"``,
+                default: 14
             :param str column_name: Column name, default: atr
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        df_tmp = self.df[
-            [
-                self._columns["High"],
-                self._columns["Low"],
-                self._columns["Close"],
-            ]
-        ]
-        df_tmp = df_tmp.assign(
-            max_min=df_tmp[self._columns["High"]] - df_tmp[self._columns["Low"]]
-        )
-        df_tmp["prev_close-high"] = (
-            df_tmp[self._columns["Close"]].shift(1) - df_tmp[self._columns["High"]]
-        )
-        df_tmp["prev_close-min"] = (
-            df_tmp[self._columns["Close"]].shift(1) - df_tmp[self._columns["Low"]]
-        )
-        df_tmp["max_val"] = df_tmp.apply(
-            lambda x: max([x["max_min"], x["prev_close-high"], x["prev_close-min"]]),
-            axis=1,
+        period = self._window(period)
+        if out is not None:
+            return kernels.atr(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                period,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            value = self._pl.atr(
+                self._pl_col("High"), self._pl_col("Low"), self._pl_col("Close"), period
+            )
+            self._pl_assign({column_name: value})
+            return
+        values = kernels.atr(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            period,
+            None,
+            self._buffers,
         )
-        calculate_sma(df_tmp, period, column_name, "max_val")
-        df_tmp = df_tmp[[column_name]]
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        self._assign({column_name: values})
 
-    def bears_power(self, period=13, column_name="bears_power"):
+    def bears_power(self, period=13, column_name="bears_power", out=None):
         """
         Bears Power
         ------------------------
@@ -328,17 +901,23 @@ class Indicators:
 
             >>> Indicators.bears_power(period=13, column_name='bears_power')
 
-            :param int period: Period, default: 13
+            :param period: Period, or a time span such as ``"4h"``
+                (see ``time_col``), default: 13
             :param str column_name: Column name, default: bears_power
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        df_tmp = self.df[[self._columns["Close"], self._columns["Low"]]]
-        df_tmp = df_tmp.assign(
-            ema=df_tmp[self._columns["Close"]].ewm(span=period, adjust=False).mean()
-        )
-        df_tmp[column_name] = df_tmp["ema"] - df_tmp[self._columns["Low"]]
-        df_tmp = df_tmp[[column_name]]
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        period = self._window(period)
+        if out is not None:
+            close, low = self._values("Close"), self._values("Low")
+            return kernels.bears_power(close, low, period, out, self._buffers)
+        if self._pl is not None:
+            ema = self._pl.ema(self._pl_col("Close"), period)
+            self._pl_assign({column_name: ema - self._pl_col("Low")})
+            return
+        close, low = self._values("Close"), self._values("Low")
+        self._assign({column_name: kernels.bears_power(close, low, period)})
 
     def bollinger_bands(
         self,
@@ -347,6 +926,7 @@ class Indicators:
         column_name_top="bollinger_top",
         column_name_mid="bollinger_mid",
         column_name_bottom="bollinger_bottom",
+        out=None,
     ):
         """
         Bollinger Bands
@@ -355,34 +935,128 @@ class Indicators:
 
             >>> Indicators.bollinger_bands(self, period=20, deviation=2, column_name_top='bollinger_up', column_name_mid='bollinger_mid', column_name_bottom='bollinger_bottom')
 
-            :param int period: Period, default 20
+            :param period: Period, or a time span such as ``"4h"``,
+                default 20
             :param int deviation: Number of Standard Deviations, default 2
             :param str column_name_top: default bollinger_up
             :param str column_name_mid: default bollinger_mid
             :param str column_name_bottom: default bollinger_down
+            :param tuple out: Numpy arrays for top, mid and bottom lines.
+                Values are written into them instead of adding columns
+                to df, default: None
             :return: None
         """
-        df_tmp = self.df[[self._columns["Close"]]]
-        df_tmp = df_tmp.assign(
-            mid=df_tmp[self._columns["Close"]].rolling(window=period).mean()
+        period = self._window(period)
+        if out is not None:
+            close = self._values("Close")
+            return kernels.bollinger_bands(close, period, deviation, out, self._buffers)
+        if self._pl is not None:
+            bands = self._pl.bollinger_bands(self._pl_col("Close"), period, deviation)
+            self._pl_assign(
+                {
+                    column_name_top: bands["top"],
+                    column_name_mid: bands["mid"],
+                    column_name_bottom: bands["bottom"],
+                }
+            )
+            return
+        bands = kernels.bollinger_bands(
+            self._values("Close"), period, deviation, buffers=self._buffers
         )
-        df_tmp = df_tmp.assign(
-            stdev=df_tmp[self._columns["Close"]].rolling(window=period).std(ddof=0)
+        self._assign(
+            dict(zip((column_name_top, column_name_mid, column_name_bottom), bands))
         )
-        df_tmp = df_tmp.assign(tl=df_tmp.mid + deviation * df_tmp.stdev)
-        df_tmp = df_tmp.assign(bl=df_tmp.mid - deviation * df_tmp.stdev)
-
-        df_tmp = df_tmp[["mid", "tl", "bl"]]
-        df_tmp = df_tmp.rename(
-            columns={
-                "mid": column_name_mid,
-                "tl": column_name_top,
-                "bl": column_name_bottom,
-            }
+
+    def linear_regression(
+        self,
+        period=14,
+        deviation=2,
+        apply_to="Close",
+        column_name_slope="lr_slope",
+        column_name_intercept="lr_intercept",
+        column_name_r2="lr_r2",
+        column_name_forecast="lr_forecast",
+        column_name_top="lr_top",
+        column_name_bottom="lr_bottom",
+        out=None,
+    ):
+        """
+        Linear Regression
+        -----------------
+            Least-squares line of every window of ``period`` bars, in O(n)
+            whatever the period.
+
+            >>> Indicators.linear_regression(period=14, deviation=2, apply_to='Close')
+            >>> Indicators.linear_regression(period=[10, 20, 50], apply_to=['High', 'Low'])
+
+            :param int period: Period of at least 3 bars, or a list of
+                periods to add the columns ``<column_name>_<period>`` for
+                all of them, default: 14
+            :param float deviation: Width of the channel in standard errors
+                of the fit, default: 2
+            :param str apply_to: Which column use for calculation.
+                Can be *"Open"*, *"High"*, *"Low"*, *"Close"*, *"Median"*
+                and *"Typical"*, or a list of them to add the columns
+                ``<column_name>_<apply_to>``. **Default**: Close
+            :param str column_name_slope: Slope per bar, default: lr_slope
+            :param str column_name_intercept: Value of the line at the
+                first bar of the window, default: lr_intercept
+            :param str column_name_r2: Coefficient of determination,
+                default: lr_r2
+            :param str column_name_forecast: Value of the line at the next
+                bar, default: lr_forecast
+            :param str column_name_top: Value of the line at the last bar
+                plus the channel, default: lr_top
+            :param str column_name_bottom: Value of the line at the last
+                bar minus the channel, default: lr_bottom
+            :param tuple out: Numpy arrays for the slope, intercept, r2,
+                forecast, top and bottom lines, with a leading axis for a
+                list of periods and then for a list of columns, default: None
+            :return: None
+        """
+        _bars_only("linear_regression", period=period)
+        periods = period if isinstance(period, (list, tuple)) else [period]
+        if min(periods) < MIN_PERIOD["linear_regression"]:
+            raise ValueError('The "period" can be only 3 bars or more')
+        names = (
+            column_name_slope,
+            column_name_intercept,
+            column_name_r2,
+            column_name_forecast,
+            column_name_top,
+            column_name_bottom,
         )
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        periods = period if isinstance(period, (list, tuple)) else [period]
+        if out is None and self._pl is not None:
+            sources = [apply_to] if isinstance(apply_to, str) else apply_to
+            lines = [
+                self._pl.linear_regression(self._pl_col(source), p, deviation)
+                for p in periods
+                for source in sources
+            ]
+            columns = [c for name in names for c in _names(name, apply_to, period)]
+            expressions = [line[k] for k in range(len(names)) for line in lines]
+            self._pl_assign(dict(zip(columns, expressions)))
+            return
+        lines = out
+        if out is None:
+            kwargs = dict(zip(OUTPUTS["linear_regression"], names))
+            kwargs.update(period=period, apply_to=apply_to)
+            columns, lines, arrays = _out_arrays(
+                "linear_regression", kwargs, len(self.df)
+            )
+        values = self._sources(apply_to)
+        if periods is period:
+            for k, p in enumerate(periods):
+                line_out = tuple(line[k] for line in lines)
+                kernels.linear_regression(values, p, deviation, line_out, self._buffers)
+        else:
+            kernels.linear_regression(values, period, deviation, lines, self._buffers)
+        if out is not None:
+            return out
+        self._assign(dict(zip(columns, arrays)))
 
-    def bulls_power(self, period=13, column_name="bulls_power"):
+    def bulls_power(self, period=13, column_name="bulls_power", out=None):
         """
         Bulls Power
         ------------------------
@@ -390,58 +1064,78 @@ class Indicators:
 
             >>> Indicators.bulls_power(period=13, column_name='bulls_power')
 
-            :param int period: Period, default: 13
+            :param period: Period, or a time span such as ``"4h"``
+                (see ``time_col``), default: 13
             :param str column_name: Column name, default: bulls_power
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        df_tmp = self.df[[self._columns["Close"], self._columns["High"]]]
-        df_tmp = df_tmp.assign(
-            ema=df_tmp[self._columns["Close"]].ewm(span=period, adjust=False).mean()
-        )
-        df_tmp[column_name] = df_tmp[self._columns["High"]] - df_tmp["ema"]
-        df_tmp = df_tmp[[column_name]]
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
-
-    def cci(self, period=14, column_name="cci"):
+        period = self._window(period)
+        if out is not None:
+            close, high = self._values("Close"), self._values("High")
+            return kernels.bulls_power(close, high, period, out, self._buffers)
+        if self._pl is not None:
+            ema = self._pl.ema(self._pl_col("Close"), period)
+            self._pl_assign({column_name: self._pl_col("High") - ema})
+            return
+        close, high = self._values("Close"), self._values("High")
+        self._assign({column_name: kernels.bulls_power(close, high, period)})
+
+    def cci(self, period=14, column_name="cci", method="mean", out=None):
         """
         Commodity Channel Index (CCI)
         -----------------------------
             https://www.metatrader4.com/en/trading-platform/help/analytics/tech_indicators/commodity_channel_index
 
-            >>> Indicators.cci(period=14, column_name='cci')
+            >>> Indicators.cci(period=14, column_name='cci', method='mean')
 
             :param int period: Period, default: 14
             :param str column_name: Column name, default: cci
+            :param str method: 'mean' for the standard CCI, 'median' for a
+                robust CCI around the rolling median of the typical price,
+                scaled by the median absolute deviation. Default: mean
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        pd.set_option("display.max_columns", 500)
-        df_tmp = self.df[
-            [
-                self._columns["High"],
-                self._columns["Low"],
-                self._columns["Close"],
-            ]
-        ]
-        df_tmp = df_tmp.assign(
-            tp=(
-                df_tmp[self._columns["High"]]
-                + df_tmp[self._columns["Low"]]
-                + df_tmp[self._columns["Close"]]
+        _bars_only("cci", period=period)
+        if method == "mean":
+            kernel = kernels.cci
+        elif method == "median":
+            kernel = kernels.robust_cci
+        else:
+            raise ValueError('The "method" can be only "mean" or "median"')
+        if out is not None:
+            return kernel(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                period,
+                out,
+                self._buffers,
             )
-            / 3
-        )
-
-        df_tmp = df_tmp.assign(tp_sma=df_tmp.tp.rolling(window=period).mean())
-        df_tmp = df_tmp.assign(
-            tp_mad=df_tmp.tp.rolling(window=period).apply(mad, raw=False)
+        if self._pl is not None:
+            value = self._pl.cci(
+                self._pl_col("High"),
+                self._pl_col("Low"),
+                self._pl_col("Close"),
+                period,
+                method,
+            )
+            self._pl_assign({column_name: value})
+            return
+        values = kernel(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            period,
+            None,
+            self._buffers,
         )
-        df_tmp = df_tmp.assign(tp_min_sma=df_tmp.tp - df_tmp.tp_sma)
-        df_tmp = df_tmp.assign(cci=(1 / 0.015) * (df_tmp.tp_min_sma / df_tmp.tp_mad))
-        df_tmp = df_tmp[["cci"]]
-        df_tmp = df_tmp.rename(columns={"cci": column_name})
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        self._assign({column_name: values})
 
-    def de_marker(self, period=14, column_name="dem"):
+    def de_marker(self, period=14, column_name="dem", out=None):
         """
         DeMarker (DeM)
         --------------
@@ -449,45 +1143,28 @@ class Indicators:
 
             >>> Indicators.de_marker(period=14, column_name='dem')
 
-            :param int period: Period, default: 14
+            :param period: Period, or a time span such as ``"4h"``,
+                default: 14
             :param str column_name: Column name, default: dem
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        df_tmp = self.df[[self._columns["High"], self._columns["Low"]]]
-
-        df_tmp = df_tmp.assign(
-            hdif=(
-                df_tmp[self._columns["High"]] > df_tmp[self._columns["High"]].shift(1)
-            ).astype(int)
-        )
-        df_tmp = df_tmp.assign(
-            hsub=df_tmp[self._columns["High"]] - df_tmp[self._columns["High"]].shift(1)
-        )
-        df_tmp = df_tmp.assign(demax=np.where(df_tmp.hdif == 0, 0, df_tmp.hsub))
-
-        df_tmp = df_tmp.assign(
-            ldif=(
-                df_tmp[self._columns["Low"]] < df_tmp[self._columns["Low"]].shift(1)
-            ).astype(int)
-        )
-        df_tmp = df_tmp.assign(
-            lsub=df_tmp[self._columns["Low"]].shift(1) - df_tmp[self._columns["Low"]]
-        )
-        df_tmp = df_tmp.assign(demin=np.where(df_tmp.ldif == 0, 0, df_tmp.lsub))
-
-        df_tmp["sma_demax"] = df_tmp["demax"].rolling(window=period).mean()
-        df_tmp["sma_demin"] = df_tmp["demin"].rolling(window=period).mean()
-
-        df_tmp = df_tmp.assign(
-            dem=df_tmp.sma_demax / (df_tmp.sma_demax + df_tmp.sma_demin)
-        )
-
-        df_tmp = df_tmp[["dem"]]
-        df_tmp = df_tmp.rename(columns={"dem": column_name})
-
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
-
-    def force_index(self, period=13, method="sma", apply_to="Close", column_name="frc"):
+        period = self._window(period)
+        if out is not None:
+            high, low = self._values("High"), self._values("Low")
+            return kernels.de_marker(high, low, period, out, self._buffers)
+        if self._pl is not None:
+            high, low = self._pl_col("High"), self._pl_col("Low")
+            self._pl_assign({column_name: self._pl.de_marker(high, low, period)})
+            return
+        high, low = self._values("High"), self._values("Low")
+        values = kernels.de_marker(high, low, period, None, self._buffers)
+        self._assign({column_name: values})
+
+    def force_index(
+        self, period=13, method="sma", apply_to="Close", column_name="frc", out=None
+    ):
         """
         Force Index (FRC)
         ------------------
@@ -495,33 +1172,54 @@ class Indicators:
 
             >>> Indicators.force_index(period=13, method='sma', apply_to='Close', column_name='frc')
 
-            :param int period: Period, default: 13
-            :param str method: Moving average method. Can be 'sma', 'smma' or 'ema'. Default: sma
-            :param str apply_to: Apply indicator to column, default: Close
+            :param period: Period, or a time span such as ``"4h"`` (see
+                ``time_col``) for the "sma", "smma" and "ema" methods,
+                default: 13
+            :param str method: Moving average method. Can be 'sma', 'smma', 'ema' or 'lwma'. Default: sma
+            :param str apply_to: Apply indicator to column, or to a list of
+                columns adding ``<column_name>_<apply_to>`` columns, default: Close
             :param str column_name: Column name, default: frc
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        df_tmp = self.df[[apply_to, self._columns["Volume"]]]
-        if method == "sma":
-            df_tmp = df_tmp.assign(ma=df_tmp[apply_to].rolling(window=period).mean())
-        elif method == "smma":
-            df_tmp_smma = calculate_smma(df_tmp, period, "ma", apply_to)
-            df_tmp = df_tmp.merge(df_tmp_smma, left_index=True, right_index=True)
-        elif method == "ema":
-            df_tmp = df_tmp.assign(
-                ma=df_tmp[apply_to].ewm(span=period, adjust=False).mean()
+        if method == "lwma":
+            _bars_only("force_index", period=period)
+        period = self._window(period)
+        if out is not None:
+            return kernels.force_index(
+                self._sources(apply_to),
+                self._values("Volume"),
+                period,
+                method,
+                out,
+                self._buffers,
             )
-        else:
-            raise ValueError('The "method" can be only "sma", "ema" or "smma"')
-        df_tmp = df_tmp.assign(
-            frc=(df_tmp.ma - df_tmp.ma.shift(1)) * df_tmp[self._columns["Volume"]]
+        if self._pl is not None:
+            volume = self._pl_col("Volume")
+            self._pl_apply(
+                column_name,
+                apply_to,
+                lambda col: self._pl.force_index(
+                    self._pl.moving_average(col, period, method), volume
+                ),
+            )
+            return
+        values = kernels.force_index(
+            self._sources(apply_to),
+            self._values("Volume"),
+            period,
+            method,
+            None,
+            self._buffers,
         )
-        df_tmp = df_tmp[["frc"]]
-        df_tmp = df_tmp.rename(columns={"frc": column_name})
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        self._assign_named(column_name, apply_to, values)
 
     def fractals(
-        self, column_name_high="fractals_high", column_name_low="fractals_low"
+        self,
+        column_name_high="fractals_high",
+        column_name_low="fractals_low",
+        out=None,
     ):
         """
         Fractals
@@ -532,47 +1230,23 @@ class Indicators:
 
             :param str column_name_high: Column name for High values, default: fractals_high
             :param str column_name_low: Column name for Low values, default: fractals_low
+            :param tuple out: Numpy arrays for high and low fractals (bool dtype).
+                Values are written into them instead of adding columns
+                to df, default: None
             :return: None
         """
-        df_tmp = self.df[[self._columns["High"], self._columns["Low"]]]
-        df_tmp = df_tmp.assign(
-            fh=np.where(
-                (df_tmp[self._columns["High"]] > df_tmp[self._columns["High"]].shift(1))
-                & (
-                    df_tmp[self._columns["High"]]
-                    > df_tmp[self._columns["High"]].shift(2)
-                )
-                & (
-                    df_tmp[self._columns["High"]]
-                    > df_tmp[self._columns["High"]].shift(-1)
-                )
-                & (
-                    df_tmp[self._columns["High"]]
-                    > df_tmp[self._columns["High"]].shift(-2)
-                ),
-                True,
-                False,
-            )
-        )
-        df_tmp = df_tmp.assign(
-            fl=np.where(
-                (df_tmp[self._columns["Low"]] < df_tmp[self._columns["Low"]].shift(1))
-                & (df_tmp[self._columns["Low"]] < df_tmp[self._columns["Low"]].shift(2))
-                & (
-                    df_tmp[self._columns["Low"]]
-                    < df_tmp[self._columns["Low"]].shift(-1)
-                )
-                & (
-                    df_tmp[self._columns["Low"]]
-                    < df_tmp[self._columns["Low"]].shift(-2)
-                ),
-                True,
-                False,
+        if out is not None:
+            high, low = self._values("High"), self._values("Low")
+            return kernels.fractals(high, low, out, self._buffers)
+        if self._pl is not None:
+            fractals = self._pl.fractals(self._pl_col("High"), self._pl_col("Low"))
+            self._pl_assign(
+                {column_name_high: fractals["high"], column_name_low: fractals["low"]}
             )
-        )
-        df_tmp = df_tmp[["fh", "fl"]]
-        df_tmp = df_tmp.rename(columns={"fh": column_name_high, "fl": column_name_low})
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+            return
+        high, low = self._values("High"), self._values("Low")
+        fractals = kernels.fractals(high, low, buffers=self._buffers)
+        self._assign(dict(zip((column_name_high, column_name_low), fractals)))
 
     def gator(
         self,
@@ -584,6 +1258,7 @@ class Indicators:
         shift_lips=3,
         column_name_val1="value1",
         column_name_val2="value2",
+        out=None,
     ):
         """
         Gator Oscillator
@@ -592,43 +1267,59 @@ class Indicators:
 
             >>> Indicators.gator(period_jaws=13, period_teeth=8, period_lips=5, shift_jaws=8, shift_teeth=5, shift_lips=3, column_name_val1='value1', column_name_val2='value2')
 
-            :param int period_jaws: Jaws period, default: 13
-            :param int period_teeth: Teeth period, default: 8
-            :param int period_lips: Lips period, default: 5
+            :param period_jaws: Jaws period, or a time span such as
+                ``"4h"`` (see ``time_col``), default: 13
+            :param period_teeth: Teeth period, or a time span such as
+                ``"4h"`` (see ``time_col``), default: 8
+            :param period_lips: Lips period, or a time span such as
+                ``"4h"`` (see ``time_col``), default: 5
             :param int shift_jaws: Jaws shift, default: 8
             :param int shift_teeth: Teeth shift, default: 5
             :param int shift_lips: Lips shift, default: 3
             :param str column_name_val1: Column name for Value1, default value1
             :param str column_name_val2: Column name for Value2, default value2
+            :param tuple out: Numpy arrays for Value1 and Value2.
+                Values are written into them instead of adding columns
+                to df, default: None
             :return: None
         """
-        df_tmp = self.df[[self._columns["High"], self._columns["Low"]]]
-        df_tmp = df_tmp.assign(
-            hc=(df_tmp[self._columns["High"]] + df_tmp[self._columns["Low"]]) / 2
-        )
-        df_j = calculate_smma(df_tmp, period_jaws, "jaws", "hc")
-        df_t = calculate_smma(df_tmp, period_teeth, "teeth", "hc")
-        df_l = calculate_smma(df_tmp, period_lips, "lips", "hc")
-
-        # Shift SMMAs
-
-        df_j["jaws"] = df_j["jaws"].shift(shift_jaws)
-        df_t["teeth"] = df_t["teeth"].shift(shift_teeth)
-        df_l["lips"] = df_l["lips"].shift(shift_lips)
-
-        df_tmp = df_tmp.merge(df_j, left_index=True, right_index=True)
-        df_tmp = df_tmp.merge(df_t, left_index=True, right_index=True)
-        df_tmp = df_tmp.merge(df_l, left_index=True, right_index=True)
-
-        df_tmp = df_tmp.assign(val1=df_tmp["jaws"] - df_tmp["teeth"])
-        df_tmp = df_tmp.assign(val2=-(df_tmp["teeth"] - df_tmp["lips"]))
-
-        df_tmp = df_tmp[["val1", "val2"]]
-        df_tmp = df_tmp.rename(
-            columns={"val1": column_name_val1, "val2": column_name_val2}
+        period_jaws = self._window(period_jaws)
+        period_teeth = self._window(period_teeth)
+        period_lips = self._window(period_lips)
+        if out is not None:
+            return kernels.gator(
+                self._values("High"),
+                self._values("Low"),
+                period_jaws,
+                period_teeth,
+                period_lips,
+                shift_jaws,
+                shift_teeth,
+                shift_lips,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            high, low = self._pl_col("High"), self._pl_col("Low")
+            jaws = self._pl.alligator(high, low, period_jaws, shift_jaws)
+            teeth = self._pl.alligator(high, low, period_teeth, shift_teeth)
+            lips = self._pl.alligator(high, low, period_lips, shift_lips)
+            self._pl_assign(
+                {column_name_val1: jaws - teeth, column_name_val2: -(teeth - lips)}
+            )
+            return
+        lines = kernels.gator(
+            self._values("High"),
+            self._values("Low"),
+            period_jaws,
+            period_teeth,
+            period_lips,
+            shift_jaws,
+            shift_teeth,
+            shift_lips,
+            buffers=self._buffers,
         )
-
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        self._assign(dict(zip((column_name_val1, column_name_val2), lines)))
 
     def ichimoku_kinko_hyo(
         self,
@@ -640,6 +1331,7 @@ class Indicators:
         column_name_kijun_sen="kijun_sen",
         column_name_senkou_span_a="senkou_span_a",
         column_name_senkou_span_b="senkou_span_b",
+        out=None,
     ):
         """
         Ichimoku Kinko Hyo
@@ -650,84 +1342,71 @@ class Indicators:
 
             :param int period_tenkan_sen: Period for Tenkan-sen, default: 9
             :param int period_kijun_sen: Period for Kijun-sen, default: 26
-            :param int period_senkou_span_b: Period for Senkou-span, default: 52
+            :param int period_senkou_span_b: Period for Senkou-span, default: 52.
+                The periods can also be time spans such as ``"1D"``, the
+                spans are then displaced by the span of Kijun-sen.
             :param str column_name_chikou_span: Column name for Chikou-span, default: chikou_span
             :param str column_name_tenkan_sen: Column name for Tenkan-sen, default: tenkan_sen
             :param str column_name_kijun_sen: Column name for Kijun-sen, default: kijun_sen
             :param str column_name_senkou_span_a: Column name for Senkou Span A, default: senkou_span_a
             :param str column_name_senkou_span_b: Column name for Senkou Span B, default: senkou_span_b
+            :param tuple out: Numpy arrays for Tenkan-sen, Kijun-sen, Senkou Span A, Senkou Span B and Chikou-span.
+                Values are written into them instead of adding columns
+                to df, default: None
             :return: None
         """
-        df_tmp = self.df[
-            [
-                self._columns["High"],
-                self._columns["Low"],
-                self._columns["Close"],
-            ]
-        ]
-
-        df_tmp = df_tmp.assign(
-            tenkan_h=df_tmp[self._columns["High"]]
-            .rolling(window=period_tenkan_sen)
-            .max()
-        )
-        df_tmp = df_tmp.assign(
-            tenkan_l=df_tmp[self._columns["Low"]]
-            .rolling(window=period_tenkan_sen)
-            .min()
-        )
-        df_tmp = df_tmp.assign(tenkan=(df_tmp.tenkan_h + df_tmp.tenkan_l) / 2)
-        del df_tmp["tenkan_h"]
-        del df_tmp["tenkan_l"]
-
-        df_tmp = df_tmp.assign(
-            kijun_h=df_tmp[self._columns["High"]].rolling(window=period_kijun_sen).max()
-        )
-        df_tmp = df_tmp.assign(
-            kijun_l=df_tmp[self._columns["Low"]].rolling(window=period_kijun_sen).min()
-        )
-        df_tmp = df_tmp.assign(kijun=(df_tmp.kijun_h + df_tmp.kijun_l) / 2)
-        del df_tmp["kijun_h"]
-        del df_tmp["kijun_l"]
-
-        df_tmp = df_tmp.assign(
-            ssa=((df_tmp.tenkan + df_tmp.kijun) / 2).shift(period_kijun_sen)
-        )
-
-        df_tmp = df_tmp.assign(
-            ssb_h=df_tmp[self._columns["High"]]
-            .rolling(window=period_senkou_span_b)
-            .max()
-        )
-        df_tmp = df_tmp.assign(
-            ssb_l=df_tmp[self._columns["Low"]]
-            .rolling(window=period_senkou_span_b)
-            .min()
-        )
-        df_tmp = df_tmp.assign(
-            ssb=((df_tmp.ssb_h + df_tmp.ssb_l) / 2).shift(period_kijun_sen)
-        )
-        del df_tmp["ssb_h"]
-        del df_tmp["ssb_l"]
-
-        df_tmp = df_tmp.assign(
-            chikou=df_tmp[self._columns["Close"]].shift(-period_kijun_sen)
+        period_tenkan_sen = self._window(period_tenkan_sen)
+        period_kijun_sen = self._window(period_kijun_sen)
+        period_senkou_span_b = self._window(period_senkou_span_b)
+        if out is not None:
+            return kernels.ichimoku_kinko_hyo(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                period_tenkan_sen,
+                period_kijun_sen,
+                period_senkou_span_b,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            lines = self._pl.ichimoku_kinko_hyo(
+                self._pl_col("High"),
+                self._pl_col("Low"),
+                self._pl_col("Close"),
+                period_tenkan_sen,
+                period_kijun_sen,
+                period_senkou_span_b,
+            )
+            self._pl_assign(
+                {
+                    column_name_tenkan_sen: lines["tenkan"],
+                    column_name_kijun_sen: lines["kijun"],
+                    column_name_senkou_span_a: lines["ssa"],
+                    column_name_senkou_span_b: lines["ssb"],
+                    column_name_chikou_span: lines["chikou"],
+                }
+            )
+            return
+        lines = kernels.ichimoku_kinko_hyo(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            period_tenkan_sen,
+            period_kijun_sen,
+            period_senkou_span_b,
+            buffers=self._buffers,
         )
-
-        df_tmp = df_tmp[["tenkan", "kijun", "ssa", "ssb", "chikou"]]
-        df_tmp = df_tmp.rename(
-            columns={
-                "tenkan": column_name_tenkan_sen,
-                "kijun": column_name_kijun_sen,
-                "ssa": column_name_senkou_span_a,
-                "ssb": column_name_senkou_span_b,
-                "chikou": column_name_chikou_span,
-            }
+        names = (
+            column_name_tenkan_sen,
+            column_name_kijun_sen,
+            column_name_senkou_span_a,
+            column_name_senkou_span_b,
+            column_name_chikou_span,
         )
+        self._assign(dict(zip(names, lines)))
 
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
-
-    def bw_mfi(self, column_name="bw_mfi"):
+    def bw_mfi(self, column_name="bw_mfi", out=None):
         """
         Market Facilitation Index (BW MFI)
         ----------------------------------
@@ -736,25 +1415,26 @@ class Indicators:
             >>> Indicators.bw_mfi(column_name='bw_mfi')
 
             :param str column_name: Column name, default: bw_mfi
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return: None
         """
-        df_tmp = self.df[
-            [
-                self._columns["High"],
-                self._columns["Low"],
-                self._columns["Volume"],
-            ]
-        ]
-        df_tmp = df_tmp.assign(
-            bw=(df_tmp[self._columns["High"]] - df_tmp[self._columns["Low"]])
-            / df_tmp[self._columns["Volume"]]
-            * 100000
+        if out is not None:
+            return kernels.bw_mfi(
+                self._values("High"), self._values("Low"), self._values("Volume"), out
+            )
+        if self._pl is not None:
+            value = self._pl.bw_mfi(
+                self._pl_col("High"), self._pl_col("Low"), self._pl_col("Volume")
+            )
+            self._pl_assign({column_name: value})
+            return
+        values = kernels.bw_mfi(
+            self._values("High"), self._values("Low"), self._values("Volume")
         )
-        df_tmp = df_tmp[["bw"]]
-        df_tmp = df_tmp.rename(columns={"bw": column_name})
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        self._assign({column_name: values})
 
-    def momentum(self, period=14, column_name="momentum"):
+    def momentum(self, period=14, column_name="momentum", out=None):
         """
         Momentum
         --------
@@ -764,60 +1444,63 @@ class Indicators:
 
             :param int period: Period, default: 14
             :param strr column_name: Column name, default: momentum
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
             :return:
         """
-        close = self._columns["Close"]
-        df_tmp = self.df[[close]]
-        df_tmp = df_tmp.assign(m=df_tmp[close] / df_tmp[close].shift(period) * 100)
-        df_tmp = df_tmp[["m"]]
-        df_tmp = df_tmp.rename(columns={"m": column_name})
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
-
-    def mfi(self, period=5, column_name="mfi"):
+        _bars_only("momentum", period=period)
+        if out is not None:
+            return kernels.momentum(self._values("Close"), period, out)
+        if self._pl is not None:
+            value = self._pl.momentum(self._pl_col("Close"), period)
+            self._pl_assign({column_name: value})
+            return
+        self._assign({column_name: kernels.momentum(self._values("Close"), period)})
+
+    def mfi(self, period=5, column_name="mfi", out=None):
         """
         Money Flow Index (MFI)
         -----------------------
             https://www.metatrader4.com/en/trading-platform/help/analytics/tech_indicators/money_flow_index
 
             >>> Indicators.mfi(period=5, column_name='mfi')
-        :param int period: Period, default: 5
+        :param period: Period, or a time span such as ``"4h"``, default: 5
         :param str column_name: Column name, default: mfi
+        :param numpy.ndarray out: Write the values into this numpy array instead of adding
+            a column to df, default: None
         :return: None
         """
-        high, low, close, volume = (
-            self._columns["High"],
-            self._columns["Low"],
-            self._columns["Close"],
-            self._columns["Volume"],
-        )
-        df_tmp = self.df[[high, low, close, volume]]
-
-        df_tmp = df_tmp.assign(tp=(df_tmp[high] + df_tmp[low] + df_tmp[close]) / 3)
-        df_tmp = df_tmp.assign(mf=df_tmp["tp"] * df_tmp[volume])
-
-        df_tmp = df_tmp.assign(
-            pmf=np.where(df_tmp["tp"] > df_tmp["tp"].shift(1), df_tmp["mf"], 0.0)
-        )
-        df_tmp = df_tmp.assign(
-            nmf=np.where(df_tmp["tp"] < df_tmp["tp"].shift(1), df_tmp["mf"], 0.0)
+        period = self._window(period)
+        if out is not None:
+            return kernels.mfi(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                self._values("Volume"),
+                period,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            value = self._pl.mfi(
+                self._pl_col("High"),
+                self._pl_col("Low"),
+                self._pl_col("Close"),
+                self._pl_col("Volume"),
+                period,
+            )
+            self._pl_assign({column_name: value})
+            return
+        values = kernels.mfi(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            self._values("Volume"),
+            period,
+            None,
+            self._buffers,
         )
-
-        df_tmp["pmfs"] = df_tmp.pmf.rolling(window=period).sum()
-        df_tmp["nmfs"] = df_tmp.nmf.rolling(window=period).sum()
-
-        del df_tmp["tp"]
-        del df_tmp["mf"]
-        del df_tmp["pmf"]
-        del df_tmp["nmf"]
-
-        df_tmp = df_tmp.round(decimals=10)
-        df_tmp = df_tmp.assign(mr=df_tmp.pmfs / df_tmp.nmfs)
-        df_tmp = df_tmp.assign(mfi=100 - (100 / (1 + df_tmp.mr)))
-
-        df_tmp = df_tmp[["mfi"]]
-        df_tmp = df_tmp.rename(columns={"mfi": column_name})
-
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+        self._assign({column_name: values})
 
     def macd(
         self,
@@ -826,6 +1509,7 @@ class Indicators:
         period_signal=9,
         column_name_value="macd_value",
         column_name_signal="macd_signal",
+        out=None,
     ):
         """
         Moving Average Convergence/Divergence (MACD)
@@ -839,25 +1523,728 @@ class Indicators:
             :param int period_signal: Period for Signal Line, default 9
             :param str column_name_value: Column name for MACD Value, default macd_value
             :param str column_name_signal: Column name for MACD Signal, default macd_signal
+            :param tuple out: Numpy arrays for MACD Value and Signal.
+                Values are written into them instead of adding columns
+                to df, default: None
+            :return: None
+        """
+        _bars_only(
+            "macd",
+            period_fast=period_fast,
+            period_slow=period_slow,
+            period_signal=period_signal,
+        )
+        if out is not None:
+            return kernels.macd(
+                self._values("Close"),
+                period_fast,
+                period_slow,
+                period_signal,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            lines = self._pl.macd(
+                self._pl_col("Close"), period_fast, period_slow, period_signal
+            )
+            self._pl_assign(
+                {column_name_value: lines["value"], column_name_signal: lines["signal"]}
+            )
+            return
+        lines = kernels.macd(
+            self._values("Close"),
+            period_fast,
+            period_slow,
+            period_signal,
+            buffers=self._buffers,
+        )
+        self._assign(dict(zip((column_name_value, column_name_signal), lines)))
+
+    def rsi(self, period=14, column_name="rsi", apply_to="Close", out=None):
+        """
+        Relative Strength Index (RSI)
+        -----------------------------
+            https://www.metatrader4.com/en/trading-platform/help/analytics/tech_indicators/relative_strength_index
+
+            >>> Indicators.rsi(period=14, column_name='rsi', apply_to='Close')
+
+            :param int period: Period, default: 14
+            :param str column_name: Column name, default: rsi
+            :param str apply_to: Which column use for calculation.
+                Can be *"Open"*, *"High"*, *"Low"*, *"Close"*, *"Median"*
+                and *"Typical"*, or a list of them to add the columns
+                ``<column_name>_<apply_to>`` in one pass.
+                **Default**: Close
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, a (columns, rows) array
+                for a list of columns, default: None
             :return: None
         """
-        close = self._columns["Close"]
-        df_tmp = self.df[[close]]
+        _bars_only("rsi", period=period)
+        if out is not None:
+            return kernels.rsi(self._sources(apply_to), period, out, self._buffers)
+        if self._pl is not None:
+            self._pl_apply(column_name, apply_to, lambda col: self._pl.rsi(col, period))
+            return
+        values = kernels.rsi(self._sources(apply_to), period, None, self._buffers)
+        self._assign_named(column_name, apply_to, values)
+
+    def wilder_atr(self, period=14, column_name="wilder_atr", out=None):
+        """
+        Average True Range with Wilder's smoothing
+        ------------------------------------------
+            Unlike ``atr``, the true range is smoothed with Wilder's
+            moving average, seeded with the mean of its first values.
+
+            >>> Indicators.wilder_atr(period=14, column_name='wilder_atr')
 
-        df_tmp = df_tmp.assign(
-            fast=df_tmp[close].ewm(span=period_fast, adjust=False).mean()
+            :param int period: Period, default: 14
+            :param str column_name: Column name, default: wilder_atr
+            :param numpy.ndarray out: Write the values into this numpy array
+                instead of adding a column to df, default: None
+            :return: None
+        """
+        _bars_only("wilder_atr", period=period)
+        if out is not None:
+            return kernels.wilder_atr(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                period,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            value = self._pl.wilder_atr(
+                self._pl_col("High"), self._pl_col("Low"), self._pl_col("Close"), period
+            )
+            self._pl_assign({column_name: value})
+            return
+        values = kernels.wilder_atr(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            period,
+            None,
+            self._buffers,
         )
-        df_tmp = df_tmp.assign(
-            slow=df_tmp[close].ewm(span=period_slow, adjust=False).mean()
+        self._assign({column_name: values})
+
+    def adx(
+        self,
+        period=14,
+        column_name_adx="adx",
+        column_name_plus_di="plus_di",
+        column_name_minus_di="minus_di",
+        out=None,
+    ):
+        """
+        Average Directional Movement Index (ADX)
+        ----------------------------------------
+            https://www.metatrader4.com/en/trading-platform/help/analytics/tech_indicators/average_directional_movement_index
+
+            >>> Indicators.adx(period=14, column_name_adx='adx', column_name_plus_di='plus_di', column_name_minus_di='minus_di')
+
+            :param int period: Period, default: 14
+            :param str column_name_adx: Column name for ADX, default: adx
+            :param str column_name_plus_di: Column name for +DI, default: plus_di
+            :param str column_name_minus_di: Column name for -DI, default: minus_di
+            :param tuple out: Numpy arrays for ADX, +DI and -DI.
+                Values are written into them instead of adding columns
+                to df, default: None
+            :return: None
+        """
+        _bars_only("adx", period=period)
+        if out is not None:
+            return kernels.adx(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                period,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            lines = self._pl.adx(
+                self._pl_col("High"), self._pl_col("Low"), self._pl_col("Close"), period
+            )
+            self._pl_assign(
+                {
+                    column_name_adx: lines["adx"],
+                    column_name_plus_di: lines["plus_di"],
+                    column_name_minus_di: lines["minus_di"],
+                }
+            )
+            return
+        lines = kernels.adx(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            period,
+            buffers=self._buffers,
+        )
+        names = (column_name_adx, column_name_plus_di, column_name_minus_di)
+        self._assign(dict(zip(names, lines)))
+
+    def wilder_suite(
+        self,
+        period=14,
+        column_name_rsi="rsi",
+        column_name_adx="adx",
+        column_name_plus_di="plus_di",
+        column_name_minus_di="minus_di",
+        column_name_atr="wilder_atr",
+        out=None,
+    ):
+        """
+        RSI, ADX and Wilder's ATR together
+        ----------------------------------
+            Same values as ``rsi``, ``adx`` and ``wilder_atr``, with the
+            true range computed once for the ATR and the directional
+            indexes. ``incremental.WilderState`` updates the same values
+            one bar at a time.
+
+            >>> Indicators.wilder_suite(period=14)
+
+            :param int period: Period, default: 14
+            :param str column_name_rsi: Column name for RSI, default: rsi
+            :param str column_name_adx: Column name for ADX, default: adx
+            :param str column_name_plus_di: Column name for +DI, default: plus_di
+            :param str column_name_minus_di: Column name for -DI, default: minus_di
+            :param str column_name_atr: Column name for ATR, default: wilder_atr
+            :param tuple out: Numpy arrays for RSI, ADX, +DI, -DI and ATR.
+                Values are written into them instead of adding columns
+                to df, default: None
+            :return: None
+        """
+        _bars_only("wilder_suite", period=period)
+        if out is not None:
+            return kernels.wilder_suite(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                period,
+                out,
+                self._buffers,
+            )
+        if self._pl is not None:
+            high, low, close = (self._pl_col(c) for c in ("High", "Low", "Close"))
+            lines = self._pl.adx(high, low, close, period)
+            self._pl_assign(
+                {
+                    column_name_rsi: self._pl.rsi(close, period),
+                    column_name_adx: lines["adx"],
+                    column_name_plus_di: lines["plus_di"],
+                    column_name_minus_di: lines["minus_di"],
+                    column_name_atr: self._pl.wilder_atr(high, low, close, period),
+                }
+            )
+            return
+        lines = kernels.wilder_suite(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            period,
+            buffers=self._buffers,
+        )
+        names = (
+            column_name_rsi,
+            column_name_adx,
+            column_name_plus_di,
+            column_name_minus_di,
+            column_name_atr,
+        )
+        self._assign(dict(zip(names, lines)))
+
+    def oscillators(
+        self,
+        period_mfi=5,
+        period_de_marker=14,
+        period_momentum=14,
+        column_name_mfi="mfi",
+        column_name_de_marker="dem",
+        column_name_momentum="momentum",
+        column_name_bw_mfi="bw_mfi",
+        out=None,
+    ):
+        """
+        MFI, DeMarker, Momentum and BW MFI together
+        -------------------------------------------
+            Same values as ``mfi``, ``de_marker``, ``momentum`` and
+            ``bw_mfi``. The intermediate series are computed in the output
+            arrays, so memory beyond the four lines is not allocated.
+
+            >>> Indicators.oscillators(period_mfi=5, period_de_marker=14, period_momentum=14)
+
+            :param period_mfi: MFI period, or a time span such as ``"4h"``,
+                default: 5
+            :param period_de_marker: DeMarker period, or a time span,
+                default: 14
+            :param int period_momentum: Momentum period, default: 14
+            :param str column_name_mfi: Column name for MFI, default: mfi
+            :param str column_name_de_marker: Column name for DeMarker, default: dem
+            :param str column_name_momentum: Column name for Momentum, default: momentum
+            :param str column_name_bw_mfi: Column name for BW MFI, default: bw_mfi
+            :param tuple out: Numpy arrays for MFI, DeMarker, Momentum and
+                BW MFI. Values are written into them instead of adding
+                columns to df, default: None
+            :return: None
+        """
+        _bars_only("oscillators", period_momentum=period_momentum)
+        period_mfi = self._window(period_mfi)
+        period_de_marker = self._window(period_de_marker)
+        periods = (period_mfi, period_de_marker, period_momentum)
+        if out is not None:
+            return kernels.oscillators(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Close"),
+                self._values("Volume"),
+                *periods,
+                out,
+                self._buffers,
+            )
+        names = (
+            column_name_mfi,
+            column_name_de_marker,
+            column_name_momentum,
+            column_name_bw_mfi,
         )
-        df_tmp = df_tmp.assign(value=df_tmp["fast"] - df_tmp["slow"])
-        df_tmp = df_tmp.assign(
-            signal=df_tmp["value"].rolling(window=period_signal).mean()
+        if self._pl is not None:
+            high, low, close, volume = (
+                self._pl_col(c) for c in ("High", "Low", "Close", "Volume")
+            )
+            lines = (
+                self._pl.mfi(high, low, close, volume, period_mfi),
+                self._pl.de_marker(high, low, period_de_marker),
+                self._pl.momentum(close, period_momentum),
+                self._pl.bw_mfi(high, low, volume),
+            )
+            self._pl_assign(dict(zip(names, lines)))
+            return
+        lines = kernels.oscillators(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Close"),
+            self._values("Volume"),
+            *periods,
+            buffers=self._buffers,
         )
+        self._assign(dict(zip(names, lines)))
 
-        df_tmp = df_tmp[["value", "signal"]]
-        df_tmp = df_tmp.rename(
-            columns={"value": column_name_value, "signal": column_name_signal}
+    def bill_williams(
+        self,
+        period_jaws=13,
+        period_teeth=8,
+        period_lips=5,
+        shift_jaws=8,
+        shift_teeth=5,
+        shift_lips=3,
+        column_name_ao="ao",
+        column_name_ac="ac",
+        column_name_jaws="alligator_jaws",
+        column_name_teeth="alligator_teeth",
+        column_name_lips="alligator_lips",
+        column_name_val1="value1",
+        column_name_val2="value2",
+        column_name_fractals_high="fractals_high",
+        column_name_fractals_low="fractals_low",
+        column_name_bw_mfi="bw_mfi",
+        column_name_ao_colour="ao_colour",
+        column_name_ac_colour="ac_colour",
+        out=None,
+    ):
+        """
+        Bill Williams' indicators together
+        ----------------------------------
+            Same values as ``awesome_oscillator``, ``accelerator_oscillator``,
+            ``alligator``, ``gator``, ``fractals`` and ``bw_mfi``, with the
+            median price and the Alligator lines computed once. The colours
+            of the AO and AC bars are 1 (green) when the value is higher
+            than the previous one, -1 (red) when it is lower.
+
+            >>> Indicators.bill_williams(period_jaws=13, period_teeth=8, period_lips=5)
+
+            :param period_jaws: Jaws period, or a time span such as
+                ``"4h"`` (see ``time_col``), default: 13
+            :param period_teeth: Teeth period, or a time span such as
+                ``"4h"`` (see ``time_col``), default: 8
+            :param period_lips: Lips period, or a time span such as
+                ``"4h"`` (see ``time_col``), default: 5
+            :param int shift_jaws: Jaws shift, default: 8
+            :param int shift_teeth: Teeth shift, default: 5
+            :param int shift_lips: Lips shift, default: 3
+            :param str column_name_ao: Column name for AO, default: ao
+            :param str column_name_ac: Column name for AC, default: ac
+            :param str column_name_jaws: Column name for Jaws, default: alligator_jaws
+            :param str column_name_teeth: Column name for Teeth, default: alligator_teeth
+            :param str column_name_lips: Column name for Lips, default: alligator_lips
+            :param str column_name_val1: Column name for Gator Value1, default: value1
+            :param str column_name_val2: Column name for Gator Value2, default: value2
+            :param str column_name_fractals_high: Column name for high fractals, default: fractals_high
+            :param str column_name_fractals_low: Column name for low fractals, default: fractals_low
+            :param str column_name_bw_mfi: Column name for BW MFI, default: bw_mfi
+            :param str column_name_ao_colour: Column name for the AO colour, default: ao_colour
+            :param str column_name_ac_colour: Column name for the AC colour, default: ac_colour
+            :param tuple out: Numpy arrays for AO, AC, Jaws, Teeth, Lips,
+                Value1, Value2, high and low fractals (bool dtype), BW MFI
+                and the AO and AC colours. Values are written into them
+                instead of adding columns to df, default: None
+            :return: None
+        """
+        period_jaws = self._window(period_jaws)
+        period_teeth = self._window(period_teeth)
+        period_lips = self._window(period_lips)
+        periods = (period_jaws, period_teeth, period_lips)
+        shifts = (shift_jaws, shift_teeth, shift_lips)
+        if out is not None:
+            return kernels.bill_williams(
+                self._values("High"),
+                self._values("Low"),
+                self._values("Volume"),
+                *periods,
+                *shifts,
+                out,
+                self._buffers,
+            )
+        names = (
+            column_name_ao,
+            column_name_ac,
+            column_name_jaws,
+            column_name_teeth,
+            column_name_lips,
+            column_name_val1,
+            column_name_val2,
+            column_name_fractals_high,
+            column_name_fractals_low,
+            column_name_bw_mfi,
+            column_name_ao_colour,
+            column_name_ac_colour,
         )
+        if self._pl is not None:
+            high, low, volume = (self._pl_col(c) for c in ("High", "Low", "Volume"))
+            ao = self._pl.awesome_oscillator(high, low)
+            ac = self._pl.accelerator_oscillator(high, low)
+            jaws, teeth, lips = (
+                self._pl.alligator(high, low, period, shift)
+                for period, shift in zip(periods, shifts)
+            )
+            fractals = self._pl.fractals(high, low)
+            lines = (
+                ao,
+                ac,
+                jaws,
+                teeth,
+                lips,
+                jaws - teeth,
+                lips - teeth,
+                fractals["high"],
+                fractals["low"],
+                self._pl.bw_mfi(high, low, volume),
+                self._pl.bar_colours(ao),
+                self._pl.bar_colours(ac),
+            )
+            self._pl_assign(dict(zip(names, lines)))
+            return
+        lines = kernels.bill_williams(
+            self._values("High"),
+            self._values("Low"),
+            self._values("Volume"),
+            *periods,
+            *shifts,
+            buffers=self._buffers,
+        )
+        self._assign(dict(zip(names, lines)))
+
+    def compute_many(self, indicators, max_workers=None):
+        """
+        Compute several indicators concurrently
+        ---------------------------------------
+            Independent indicators are computed on a thread pool into
+            separate arrays, then all columns are added to df at once.
+
+            >>> Indicators.compute_many(['cci', ('sma', {'period': 20}), ('mfi', {})])
+
+            :param list indicators: Method names or (method, kwargs) pairs
+            :param int max_workers: Number of threads, default: chosen by
+                ``concurrent.futures.ThreadPoolExecutor``
+            :return: None
+        """
+        indicators = [
+            (item, {}) if isinstance(item, str) else item for item in indicators
+        ]
+        if self._pl is not None:
+            # Polars runs the expressions on its own thread pool
+            for method, kwargs in indicators:
+                getattr(self, method)(**kwargs)
+            return
+
+        n = len(self.df)
+
+        def compute(method, kwargs):
+            columns, out, arrays = _out_arrays(method, kwargs, n)
+            # Each task needs its own scratch buffers
+            worker = copy.copy(self)
+            worker._buffers = kernels.Buffers()
+            getattr(worker, method)(out=out, **kwargs)
+            return dict(zip(columns, arrays))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            futures = [
+                executor.submit(compute, method, kwargs)
+                for method, kwargs in indicators
+            ]
+            results = {}
+            for future in futures:
+                results.update(future.result())
+        self._assign(results)
 
-        self.df = self.df.merge(df_tmp, left_index=True, right_index=True)
+    def latest(self, indicators, bars=1, tolerance=1e-10):
+        """
+        Last values of indicators
+        -------------------------
+            Every indicator is calculated only on the last bars it needs,
+            so the time does not depend on the length of df, which is not
+            modified.
+
+            >>> Indicators.latest(['macd', 'atr', ('cci', {'period': 20})])
+            {'macd_value': -0.00097, 'macd_signal': -0.00102, 'atr': 0.0011, 'cci': -12.6}
+
+            :param list indicators: Method names or (method, kwargs) pairs
+            :param int bars: Number of last values, default: 1
+            :param float tolerance: Weight left on the bars before the
+                warm-up of recursive indicators (EMA, SMMA, Wilder's
+                smoothing), see ``lookback``, default: 1e-10
+            :return: dict of column name and float, or numpy array of the
+                ``bars`` last values when bars > 1
+        """
+        indicators = [
+            (item, {}) if isinstance(item, str) else item for item in indicators
+        ]
+        rows = [lookback(method, kwargs, tolerance) for method, kwargs in indicators]
+        df = self.df
+        if type(df).__name__ == "LazyFrame":
+            # Collect only the rows the indicators need
+            df = df.tail(None if None in rows else max(rows) + bars - 1).collect()
+        results = {}
+        arrays = {}
+        for (method, kwargs), needed in zip(indicators, rows):
+            worker = copy.copy(self)
+            if needed is not None:
+                worker.df = _Tail(df, needed + bars - 1, arrays)
+            n = len(worker.df)
+            if n not in self._tail_buffers:
+                self._tail_buffers[n] = kernels.Buffers()
+            worker._buffers = self._tail_buffers[n]
+            columns, out, values = _out_arrays(method, kwargs, n)
+            getattr(worker, method)(out=out, **kwargs)
+            for column, line in zip(columns, values):
+                results[column] = line[-1].item() if bars == 1 else line[-bars:]
+        return results
+
+    def features(self, indicators, out=None, zscore=None, dtype=np.float32):
+        """
+        Feature matrix
+        --------------
+            Indicators written into one C-contiguous (bars, features)
+            matrix, e.g. for model training or inference, without adding
+            columns to df. Every indicator is calculated into a reused
+            scratch array and cast into its column of the matrix, with the
+            same vectorized kernels as the columns.
+
+            >>> values, names, warmup = Indicators.features(['rsi', ('sma', {'apply_to': ['Open', 'Close']})], zscore=100)
+            >>> names
+            ['rsi', 'sma_Open', 'sma_Close']
+
+            :param list indicators: Method names or (method, kwargs) pairs
+            :param numpy.ndarray out: C-contiguous (bars, features) matrix
+                to write the values into, default: None
+            :param int zscore: Replace every feature by its rolling z-score
+                over this number of bars, default: None
+            :param dtype: Matrix dtype when out is None, default: float32
+            :return: Features with ``values`` (the matrix), ``names`` (the
+                column names) and ``warmup``: the number of first bars
+                where any feature is not finite, set to NaN in all features
+        """
+        indicators = [
+            (item, {}) if isinstance(item, str) else item for item in indicators
+        ]
+        worker = self
+        if type(self.df).__name__ == "LazyFrame":
+            worker = copy.copy(self)
+            worker.df = self.df.collect()
+        n = len(worker.df)
+        names = [
+            name
+            for method, kwargs in indicators
+            for name in output_columns(method, kwargs)
+        ]
+        if out is None:
+            out = np.empty((n, len(names)), dtype=dtype)
+        elif out.shape != (n, len(names)) or not out.flags.c_contiguous:
+            raise ValueError(
+                f"out should be a C-contiguous array of shape {(n, len(names))}"
+            )
+        buffers = self._buffers
+        finite = buffers.get("features_finite", n, dtype=bool)
+        warmup = 0
+        column = 0
+        for method, kwargs in indicators:
+            _, lines_out, lines = _out_arrays(method, kwargs, n, buffers)
+            getattr(worker, method)(out=lines_out, **kwargs)
+            for line in lines:
+                if zscore:
+                    if line.dtype != np.float64:
+                        # Boolean fractals
+                        values = buffers.get("features_float", n)
+                        np.copyto(values, line)
+                        line = values
+                    line = kernels.rolling_zscore(
+                        line,
+                        zscore,
+                        buffers.get("features_zscore", n),
+                        buffers,
+                    )
+                np.isfinite(line, out=finite)
+                warmup = max(warmup, finite.argmax() if finite.any() else n)
+                out[:, column] = line
+                column += 1
+        out[:warmup] = np.nan
+        return Features(out, names, warmup)
+
+    def verify(self, indicators, rtol=1e-9, atol=1e-12, sample=1.0):
+        """
+        Cross-check with the reference implementations
+        ----------------------------------------------
+            Every indicator is calculated by its usual path and by the
+            original pandas implementation in ``tapy.reference`` (SMMA,
+            CCI, ALMA and ATR) on the same data, without adding columns to
+            df.
+
+            >>> Indicators.verify(['smma', 'cci', ('atr', {'period': 20})], sample=0.01)
+            {'smma': Difference(max_abs=2.2e-16, max_rel=2e-16, nan_mismatch=array([]), passed=True), ...}
+
+            :param list indicators: Method names or (method, kwargs) pairs
+            :param float rtol: Relative tolerance, default: 1e-9
+            :param float atol: Absolute tolerance, default: 1e-12
+            :param float sample: Fraction of the calls that are checked, the
+                others return None at once, default: 1.0
+            :return: dict of column name and ``reference.Difference``, or
+                None when the call is not sampled
+            :raises reference.VerificationError: when a value is beyond the
+                tolerance or NaN values are not at the same positions
+        """
+        if sample < 1 and random.random() >= sample:
+            return None
+        indicators = [
+            (item, {}) if isinstance(item, str) else item for item in indicators
+        ]
+        source = self
+        if self._pl is not None:
+            # The references read the columns of the collected data frame
+            source = copy.copy(self)
+            source._pl = None
+            if type(self.df).__name__ == "LazyFrame":
+                source.df = self.df.collect()
+        report = {}
+        for method, kwargs in indicators:
+            if method not in reference.REFERENCES:
+                raise ValueError(f'There is no reference implementation of "{method}"')
+            arguments = _arguments(method, kwargs)
+            expected = reference.REFERENCES[method](source._values, **arguments)
+            columns = output_columns(method, kwargs)
+            worker = copy.copy(self)
+            if self._pl is not None:
+                getattr(worker, method)(**kwargs)
+                df = worker.df.select(columns)
+                if type(df).__name__ == "LazyFrame":
+                    df = df.collect()
+                actual = [df[column].to_numpy() for column in columns]
+            else:
+                worker.df = _Columns(self.df)
+                getattr(worker, method)(**kwargs)
+                actual = [worker.df.added[column] for column in columns]
+            for column, values, reference_values in zip(columns, actual, expected):
+                report[column] = reference.compare(values, reference_values, rtol, atol)
+        if not all(difference.passed for difference in report.values()):
+            raise reference.VerificationError(report)
+        return report
+
+    def recompute(self, indicators, rows, tolerance=1e-10):
+        """
+        Recalculate indicators after corrections of past bars
+        -----------------------------------------------------
+            After rows of df are corrected, only the values of the
+            indicator columns depending on them are recalculated: the
+            look-back span after a corrected row (and the look-ahead span
+            before it, e.g. for fractals) for windowed indicators, and
+            forward until the difference is below ``tolerance`` for the
+            recursive ones (EMA, SMMA, Wilder's smoothing).
+
+            >>> i.df.loc[i.df.index[3500], 'Volume'] = 7331
+            >>> Indicators.recompute(['mfi', ('ema', {'period': 20})], rows=[3500])
+            {'mfi': [(3500, 3505)], 'ema': []}
+
+            :param list indicators: Method names or (method, kwargs) pairs,
+                already added to df with these arguments
+            :param rows: Positions of the corrected rows
+            :param float tolerance: Relative difference below which a value
+                is unchanged, also the weight left on the bars before the
+                warm-up of recursive indicators, see ``lookback``, default:
+                1e-10
+            :return: dict of column name and list of (start, stop) position
+                ranges where the values changed
+        """
+        if self._pl is not None:
+            raise ValueError("recompute needs a pandas data frame")
+        indicators = [
+            (item, {}) if isinstance(item, str) else item for item in indicators
+        ]
+        n = len(self.df)
+        rows = np.unique(np.asarray(rows, dtype=int))
+        changed = {}
+        for method, kwargs in indicators:
+            columns = output_columns(method, kwargs)
+            for column in columns:
+                changed[column] = []
+            if not len(rows):
+                continue
+            back = lookback(method, kwargs, tolerance)
+            ahead = lookahead(method, kwargs)
+            # Merged ranges of the values depending on the corrected rows
+            if back is None or ahead is None:
+                back, ahead = None, 0
+                spans = [[0, n]]
+            else:
+                spans = []
+                for row in rows:
+                    start, stop = max(row - ahead, 0), min(row + back, n)
+                    if spans and start <= spans[-1][1]:
+                        spans[-1][1] = stop
+                    else:
+                        spans.append([start, stop])
+            for start, stop in spans:
+                first = 0 if back is None else max(start - back + 1, 0)
+                worker = copy.copy(self)
+                worker.df = self.df.iloc[first : min(stop + ahead, n)]
+                worker._buffers = kernels.Buffers()
+                _, out, arrays = _out_arrays(method, kwargs, len(worker.df))
+                getattr(worker, method)(out=out, **kwargs)
+                for column, values in zip(columns, arrays):
+                    values = values[start - first : stop - first]
+                    old = np.asarray(self.df[column])[start:stop]
+                    different = ~np.isclose(
+                        values, old, rtol=tolerance, atol=0, equal_nan=True
+                    )
+                    if not different.any():
+                        continue
+                    # Recursive values after the last different one are
+                    # within the tolerance and kept
+                    low = start + different.argmax()
+                    high = stop - different[::-1].argmax()
+                    position = self.df.columns.get_loc(column)
+                    self.df.iloc[low:high, position] = values[
+                        low - start : high - start
+                    ]
+                    changed[column].append((int(low), int(high)))
+        return changed
@@ -0,0 +1,1351 @@
+"""
+Numpy kernels for the indicators.
+
+Every kernel writes its result into caller-provided ``out`` arrays and takes
+its temporary arrays from a :class:`Buffers` object, so calling a kernel
+again with arrays of the same length does not allocate memory proportional
+to the data size. Without ``out`` the result is allocated, and the
+recursive averages (EMA, SMMA) use the compiled pandas implementation.
+
+The moving averages also accept a 2-D block of columns (one row per column,
+time along the last axis) and compute all rows in one pass.
+"""
+
+import bisect
+import collections
+import functools
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def _shape(size):
+    return (size,) if np.ndim(size) == 0 else tuple(size)
+
+
+class Buffers:
+    """Scratch arrays reused between calls with the same data shape."""
+
+    def __init__(self):
+        self._arrays = {}
+
+    def get(self, key, size, dtype=float):
+        """Return the array of ``key``, ``size`` is a length or a shape."""
+        shape = _shape(size)
+        arr = self._arrays.get(key)
+        if arr is None or arr.shape != shape or arr.dtype != dtype:
+            arr = np.empty(shape, dtype=dtype)
+            self._arrays[key] = arr
+        return arr
+
+
+def _buffers(buffers):
+    return Buffers() if buffers is None else buffers
+
+
+def check_out(out, size, dtype=float):
+    """Check an output array or create one when ``out`` is None. ``size``
+    is a length or a shape."""
+    shape = _shape(size)
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError(f"out should have shape {shape}, got {out.shape}")
+    return out
+
+
+def shift(values, periods, out):
+    """Shift values like ``pandas.Series.shift``, filling with NaN."""
+    n = len(values)
+    if periods == 0:
+        out[:] = values
+    elif periods > 0:
+        out[: min(periods, n)] = np.nan
+        out[periods:] = values[: n - periods]
+    else:
+        out[max(n + periods, 0) :] = np.nan
+        out[: n + periods] = values[-periods:]
+    return out
+
+
+def timestamps(values):
+    """Return datetime values (a column, an index or an array) as int64
+    nanoseconds."""
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        raise ValueError(
+            'The "period" can be a time span only with a "time_col" or a DatetimeIndex'
+        )
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        values = pd.DatetimeIndex(values).tz_convert(None)
+    return np.asarray(values, dtype="datetime64[ns]").view(np.int64)
+
+
+class TimeWindows:
+    """Windows (t - span, t] of every row, accepted by the rolling kernels
+    in place of a number of bars for irregular bar series.
+
+    The first row of every window is found with one vectorized
+    ``searchsorted`` over the sorted timestamps. The rows whose window
+    begins before the first timestamp are incomplete, the rolling kernels
+    give them NaN like the first ``period - 1`` rows of a bar window.
+
+    :param numpy.ndarray times: Non-decreasing int64 nanoseconds, see
+        ``timestamps``
+    :param span: Length of the windows, a ``pandas.Timedelta`` or anything
+        it accepts, e.g. ``"4h"``
+    """
+
+    def __init__(self, times, span):
+        self.span = pd.Timedelta(span).value
+        if self.span <= 0:
+            raise ValueError(f"The time span should be positive, got {span!r}")
+        if len(times) > 1 and (times[1:] < times[:-1]).any():
+            raise ValueError("The timestamps should be in increasing order")
+        self.times = times
+        self.starts = np.searchsorted(times, times - self.span, side="right")
+        self.counts = np.arange(1, len(times) + 1) - self.starts
+        self.warmup = (
+            int(np.searchsorted(times, times[0] + self.span)) if len(times) else 0
+        )
+
+    def lag(self, values, out):
+        """Value of the last row at least ``span`` before every row, the
+        time span counterpart of ``shift(values, period, out)``."""
+        before = self.starts - 1
+        np.take(values, before, out=out)
+        out[before < 0] = np.nan
+        return out
+
+    def lead(self, values, out):
+        """Value of the first row at least ``span`` after every row, the
+        time span counterpart of ``shift(values, -period, out)``."""
+        after = np.searchsorted(self.times, self.times + self.span)
+        inside = after < len(values)
+        out[~inside] = np.nan
+        out[inside] = values[after[inside]]
+        return out
+
+
+def _time_sums(values, windows, out, buffers):
+    """Sum of every time window, NaN for the windows including NaN.
+
+    Like ``_block_scan`` the values are split into blocks as long as the
+    longest window, so a window covers a suffix of one block and a prefix
+    of the next one, or lies inside one block and is the difference of two
+    suffix sums of it. Either way only values of the window's own blocks
+    are summed, without drift over the history, and windows of zeros are
+    exactly zero.
+    """
+    *rows, n = values.shape
+    block = max(int(windows.counts.max()), 1) if n else 1
+    missing = np.isnan(values, out=buffers.get("time_missing", values.shape, bool))
+    finite = buffers.get("time_finite", values.shape)
+    np.copyto(finite, values)
+    np.copyto(finite, 0.0, where=missing)
+    prefix, suffix = _block_scans(finite, block, np.add, 0.0, "time", buffers)
+
+    # Windows inside a block: the suffix at their start minus the one after
+    # their end (0 at the end of the block), the others: the suffix at their
+    # start plus the prefix at their end
+    rest = buffers.get("time_rest", values.shape)
+    rest[..., :-1] = suffix[..., 1:n]
+    rest[..., -1] = 0
+    rest[..., block - 1 :: block] = 0
+    np.negative(rest, out=rest)
+    across = np.less(windows.starts // block, np.arange(n) // block)
+    np.copyto(rest, prefix[..., :n], where=across)
+    np.take(suffix, windows.starts, axis=-1, out=out)
+    out += rest
+
+    if missing.any():
+        nans = np.zeros((*rows, n + 1), dtype=int)
+        np.cumsum(missing, axis=-1, out=nans[..., 1:])
+        out[nans[..., 1:] > nans[..., windows.starts]] = np.nan
+    out[..., : windows.warmup] = np.nan
+    return out
+
+
+def _time_extremes(values, windows, ufunc, out, buffers):
+    """Maximum or minimum of every time window of a 1-D array from a
+    sparse table: the reductions of the 2**k rows from every row, so a
+    window is reduced from the two overlapping ranges covering it."""
+    n = len(values)
+    levels = int(windows.counts.max()).bit_length() if n else 1
+    table = buffers.get(f"time_{ufunc.__name__}_{levels}", (levels, n))
+    table[0] = values
+    for k in range(1, levels):
+        step = 1 << (k - 1)
+        ufunc(table[k - 1, : n - step], table[k - 1, step:], out=table[k, : n - step])
+    level = np.frexp(windows.counts)[1] - 1
+    flat = table.reshape(-1)
+    ends = np.arange(n) + level * n
+    ufunc(flat[windows.starts + level * n], flat[ends - (1 << level) + 1], out=out)
+    out[: windows.warmup] = np.nan
+    return out
+
+
+def _decay(values, decays, out):
+    """Solve ``y = d y_prev + (1 - d) x`` along a 1-D array with the decays
+    ``d`` of every row (``decays[0]`` is unused), seeded with the first
+    value.
+
+    Solved by doubling like ``_smooth_finite``, with the products of the
+    decays over the windows doubled as well, until all of them are below
+    1e-20.
+    """
+    n = len(values)
+    if not n:
+        return out
+    products = decays.copy()
+    seed = values[0]
+    tmp = np.subtract(1, decays)
+    np.multiply(values, tmp, out=out)
+    out[0] = seed
+    step = 1
+    while step < n and products[step:].max() > 1e-20:
+        np.multiply(products[step:], out[:-step], out=tmp[step:])
+        out[step:] += tmp[step:]
+        np.multiply(products[step:], products[:-step], out=tmp[step:])
+        products[step:] = tmp[step:]
+        step *= 2
+    return out
+
+
+def time_decay(values, times, tau, out=None):
+    """Exponential smoothing over time, ``y = d y_prev + (1 - d) x`` with
+    the decay ``d = exp(-dt / tau)`` of the time since the previous row,
+    seeded with the first value."""
+    out = check_out(out, values.shape)
+    if values.ndim > 1:
+        for row, out_row in zip(values, out):
+            time_decay(row, times, tau, out_row)
+        return out
+    if not len(values):
+        return out
+    decays = np.diff(times, prepend=times[0]) / -tau
+    np.exp(decays, out=decays)
+    return _decay(values, decays, out)
+
+
+def _block_scans(values, period, ufunc, identity, key, buffers):
+    """Prefix and suffix scans of ``values`` within blocks of ``period``
+    along the last axis, padded with ``identity`` to a whole number of
+    blocks."""
+    *rows, n = values.shape
+    shape = (*rows, -(-n // period) * period)
+    # Keyed by period, as the padded size depends on it
+    prefix = buffers.get(f"{key}_prefix_{period}", shape)
+    suffix = buffers.get(f"{key}_suffix_{period}", shape)
+    for scan in (prefix, suffix):
+        scan[..., :n] = values
+        scan[..., n:] = identity
+    blocks = prefix.reshape(*rows, -1, period)
+    ufunc.accumulate(blocks, axis=-1, out=blocks)
+    blocks = suffix.reshape(*rows, -1, period)[..., ::-1]
+    ufunc.accumulate(blocks, axis=-1, out=blocks)
+    return prefix, suffix
+
+
+def _block_scan(values, period, ufunc, identity, out, buffers):
+    """Reduce every window of ``period`` values with ``ufunc`` in O(n).
+
+    The values are split into blocks of ``period``: a window covers a
+    suffix of one block and a prefix of the next one, so it is reduced from
+    the prefix and suffix scans of the blocks (van Herk/Gil-Werman).
+    """
+    if isinstance(period, TimeWindows):
+        if ufunc is np.add:
+            return _time_sums(values, period, out, _buffers(buffers))
+        return _time_extremes(values, period, ufunc, out, _buffers(buffers))
+    n = values.shape[-1]
+    if n >= period:
+        prefix, suffix = _block_scans(
+            values, period, ufunc, identity, "scan", _buffers(buffers)
+        )
+        ufunc(
+            suffix[..., : n - period + 1],
+            prefix[..., period - 1 : n],
+            out=out[..., period - 1 :],
+        )
+        # A window aligned with a block is the whole block
+        out[..., period - 1 :: period] = prefix[..., period - 1 : n : period]
+    # Last, so that ``out`` can be ``values``
+    out[..., : period - 1] = np.nan
+    return out
+
+
+def rolling_sum(values, period, out, buffers=None):
+    return _block_scan(values, period, np.add, 0.0, out, buffers)
+
+
+def rolling_max(values, period, out, buffers=None):
+    return _block_scan(values, period, np.maximum, -np.inf, out, buffers)
+
+
+def rolling_min(values, period, out, buffers=None):
+    return _block_scan(values, period, np.minimum, np.inf, out, buffers)
+
+
+def sma(values, period, out=None, buffers=None):
+    """Simple Moving Average."""
+    out = check_out(out, values.shape)
+    if isinstance(period, TimeWindows):
+        _time_sums(values, period, out, _buffers(buffers))
+        out /= period.counts
+        return out
+    rolling_sum(values, period, out, buffers)
+    out[..., period - 1 :] /= period
+    return out
+
+
+def lwma(values, period, out=None, buffers=None):
+    """Linear Weighted Moving Average, the newest value has weight ``period``.
+
+    Computed in O(n) from block scans like the rolling sums: with ``l`` the
+    position of a value in its block, the weighted sum of a window is a
+    linear combination of the scans of ``values`` and ``l * values``. The
+    weights stay below ``period``, so there is no drift as with global
+    running sums.
+    """
+    *rows, n = values.shape
+    out = check_out(out, values.shape)
+    out[..., : period - 1] = np.nan
+    if n < period:
+        return out
+    buffers = _buffers(buffers)
+    m = n - period + 1
+    size = -(-n // period) * period
+    local = buffers.get(f"lwma_local_{period}", size)
+    local.reshape(-1, period)[:] = np.arange(period)
+    weighted = np.multiply(
+        local[:n], values, out=buffers.get("lwma_weighted", values.shape)
+    )
+    prefix, suffix = _block_scans(values, period, np.add, 0.0, "scan", buffers)
+    wprefix, wsuffix = _block_scans(weighted, period, np.add, 0.0, "lwma", buffers)
+
+    # Window [i, t]: i is at position r of its block, weights are 1..period
+    r = local[:m]
+    res = out[..., period - 1 :]
+    tmp = buffers.get("lwma_tmp", (*rows, m))
+    # Suffix of the block of i, weights l - r + 1
+    np.subtract(r, 1, out=tmp)
+    tmp *= suffix[..., :m]
+    np.subtract(wsuffix[..., :m], tmp, out=res)
+    # Prefix of the next block up to t, weights l + period - r + 1
+    np.subtract(period + 1, r, out=tmp)
+    tmp *= prefix[..., period - 1 : n]
+    tmp += wprefix[..., period - 1 : n]
+    # Windows aligned with a block have no part in the next one
+    tmp[..., ::period] = 0
+    res += tmp
+    res /= period * (period + 1) / 2
+    return out
+
+
+def _pandas_ewm(values, alpha):
+    """``ewm(alpha=alpha, adjust=False).mean()`` along the last axis."""
+    if values.ndim > 1:
+        frame = pd.DataFrame(values.T, copy=False)
+        return frame.ewm(alpha=alpha, adjust=False).mean().to_numpy().T
+    series = pd.Series(values, copy=False)
+    return series.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def _smooth_finite(values, alpha, out, tmp):
+    """``y = (1 - alpha) y_prev + alpha x`` along a 1-D array without NaN,
+    seeded with the first value.
+
+    Solved by doubling: after adding ``(1 - alpha) ** s`` times the values
+    ``s`` rows before for ``s = 1, 2, 4, ...`` every row sums the last
+    ``2 s`` weighted values, until the weight of the older ones is below
+    1e-20.
+    """
+    n = len(values)
+    if not n:
+        return out
+    # Read first, ``out`` can be ``values``
+    seed = values[0]
+    np.multiply(values, alpha, out=out)
+    out[0] = seed
+    decay = 1 - alpha
+    step = 1
+    while step < n and decay > 1e-20:
+        np.multiply(out[:-step], decay, out=tmp[step:])
+        out[step:] += tmp[step:]
+        decay *= decay
+        step *= 2
+    return out
+
+
+def _smooth(values, alpha, out, buffers):
+    """``ewm(alpha=alpha, adjust=False).mean()`` along the last axis,
+    written into ``out``.
+
+    Leading NaN stay NaN. Inside the values a NaN repeats the previous
+    result, and the next value is weighted against the previous one decayed
+    over the gap, the same way as pandas (``ignore_na=False``).
+    """
+    if values.ndim > 1:
+        for row, out_row in zip(values, out):
+            _smooth(row, alpha, out_row, buffers)
+        return out
+    n = len(values)
+    missing = np.isnan(values, out=buffers.get("smooth_missing", n, dtype=bool))
+    first = int(missing.argmin()) if n else 0
+    if not n or missing[first]:
+        out[:] = np.nan
+        return out
+    out[:first] = np.nan
+    if not missing[first:].any():
+        tmp = buffers.get("smooth", n)
+        _smooth_finite(values[first:], alpha, out[first:], tmp[first:])
+        return out
+    # Gaps: every value is weighted against the previous one decayed over
+    # the rows since it, q ** gap, normalized like pandas does
+    valid = np.flatnonzero(~missing)
+    result = values[valid]
+    if alpha < 1:
+        decays = np.ones(len(valid))
+        decayed = np.power(1 - alpha, np.diff(valid))
+        np.divide(decayed, decayed + alpha, out=decays[1:])
+        _decay(result, decays, result)
+    # Forward fill the results over the gaps
+    rows = np.zeros(n, dtype=np.intp)
+    rows[valid] = np.arange(len(valid))
+    np.maximum.accumulate(rows, out=rows)
+    np.take(result, rows[first:], out=out[first:])
+    return out
+
+
+def _scratch(out, buffers, key, size):
+    """Buffer for an intermediate recursive average: None (so the fast,
+    allocating path is used) when the caller did not provide ``out``."""
+    return None if out is None else buffers.get(key, size)
+
+
+def ema(values, period, out=None, buffers=None):
+    """Exponential Moving Average, same as ``ewm(span=period, adjust=False)``.
+
+    Without ``out`` the compiled pandas implementation is used, with ``out``
+    the vectorized ``_smooth``. Over ``TimeWindows`` the values decay with
+    ``exp(-2 dt / span)``, see ``time_decay``.
+    """
+    if isinstance(period, TimeWindows):
+        return time_decay(values, period.times, period.span / 2, out)
+    alpha = 2 / (period + 1)
+    if out is None:
+        out = check_out(out, values.shape)
+        out[...] = _pandas_ewm(values, alpha)
+        return out
+    out = check_out(out, values.shape)
+    return _smooth(values, alpha, out, _buffers(buffers))
+
+
+def _seeded(values, period, seed_at, start, out, buffers):
+    """Smoothing with ``alpha = 1 / period`` from ``seed_at``, seeded there
+    with the mean of ``values[start:start + period]``, NaN before."""
+    n = values.shape[-1]
+    fast = out is None
+    out = check_out(out, values.shape)
+    out[..., : min(seed_at, n)] = np.nan
+    if n <= seed_at:
+        return out
+    seed = values[..., start : start + period].mean(axis=-1)
+    if fast:
+        seeded = values[..., seed_at:].copy()
+        seeded[..., 0] = seed
+        out[..., seed_at:] = _pandas_ewm(seeded, 1 / period)
+        return out
+    # NaN before the seed are skipped like leading NaN
+    out[..., seed_at:] = values[..., seed_at:]
+    out[..., seed_at] = seed
+    return _smooth(out, 1 / period, out, _buffers(buffers))
+
+
+def smma(values, period, out=None, buffers=None):
+    """Smoothed Moving Average, seeded with the mean of the first ``period``
+    values at position ``period``.
+
+    Without ``out`` the compiled pandas implementation is used, with ``out``
+    the vectorized ``_smooth``. Over ``TimeWindows`` the values decay with
+    ``exp(-dt / span)`` from the first one, see ``time_decay``.
+    """
+    if isinstance(period, TimeWindows):
+        return time_decay(values, period.times, period.span, out)
+    return _seeded(values, period, period, 0, out, buffers)
+
+
+def wilder(values, period, start=0, out=None, buffers=None):
+    """Wilder's smoothing of ``values[start:]``: the mean of the first
+    ``period`` values is placed at ``start + period - 1``, then
+    ``y = (y_prev * (period - 1) + x) / period``.
+
+    Without ``out`` the compiled pandas implementation is used, with ``out``
+    the vectorized ``_smooth``.
+    """
+    return _seeded(values, period, start + period - 1, start, out, buffers)
+
+
+def alma(values, weights, out=None, buffers=None):
+    """Arnaud Legoux Moving Average with precalculated weights."""
+    *rows, n = values.shape
+    period = len(weights)
+    out = check_out(out, values.shape)
+    out[..., : period - 1] = np.nan
+    if n < period:
+        return out
+    tmp = _buffers(buffers).get("alma", (*rows, n - period + 1))
+    res = out[..., period - 1 :]
+    res[...] = 0
+    for k in range(period):
+        np.multiply(values[..., k : n - period + 1 + k], weights[k], out=tmp)
+        res += tmp
+    return out
+
+
+def median_price(high, low, out):
+    np.add(high, low, out=out)
+    out /= 2
+    return out
+
+
+def typical_price(high, low, close, out):
+    np.add(high, low, out=out)
+    out += close
+    out /= 3
+    return out
+
+
+def awesome_oscillator(high, low, out=None, buffers=None):
+    buffers = _buffers(buffers)
+    n = len(high)
+    out = check_out(out, n)
+    mp = median_price(high, low, buffers.get("median_price", n))
+    sma34 = sma(mp, 34, buffers.get("sma34", n), buffers)
+    sma(mp, 5, out, buffers)
+    out -= sma34
+    return out
+
+
+def accelerator_oscillator(high, low, out=None, buffers=None):
+    buffers = _buffers(buffers)
+    n = len(high)
+    out = check_out(out, n)
+    ao = awesome_oscillator(high, low, buffers.get("ao", n), buffers)
+    sma(ao, 5, out, buffers)
+    np.subtract(ao, out, out=out)
+    return out
+
+
+def accumulation_distribution(high, low, close, volume, out=None, buffers=None):
+    n = len(high)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    calc = buffers.get("calc", n)
+    tmp = buffers.get("calc_tmp", n)
+    # ((close - low) - (high - close)) * volume / (high - low)
+    np.subtract(close, low, out=calc)
+    np.subtract(high, close, out=tmp)
+    calc -= tmp
+    calc *= volume
+    np.subtract(high, low, out=tmp)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calc /= tmp
+    # Sum skipping NaN like pandas
+    missing = np.isnan(calc, out=buffers.get("calc_missing", n, dtype=bool))
+    np.copyto(calc, 0.0, where=missing)
+    out.fill(calc.sum())
+    return out
+
+
+def alligator_line(high, low, period, shift_by, out=None, buffers=None):
+    buffers = _buffers(buffers)
+    n = len(high)
+    mp = median_price(high, low, buffers.get("median_price", n))
+    line = smma(mp, period, _scratch(out, buffers, "smma", n), buffers)
+    return shift(line, shift_by, check_out(out, n))
+
+
+def atr(high, low, close, period, out=None, buffers=None):
+    n = len(high)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    tr = np.subtract(high, low, out=buffers.get("true_range", n))
+    tmp = buffers.get("true_range_tmp", n)
+    if n > 1:
+        np.subtract(close[:-1], high[1:], out=tmp[1:])
+        np.fmax(tr[1:], tmp[1:], out=tr[1:])
+        np.subtract(close[:-1], low[1:], out=tmp[1:])
+        np.fmax(tr[1:], tmp[1:], out=tr[1:])
+    return sma(tr, period, out, buffers)
+
+
+def true_range(high, low, close, out, buffers=None):
+    """max(High - Low, |High - previous Close|, |Low - previous Close|),
+    High - Low at the first bar."""
+    n = len(high)
+    np.subtract(high, low, out=out)
+    if n > 1:
+        tmp = _buffers(buffers).get("true_range_tmp", n - 1)
+        np.subtract(high[1:], close[:-1], out=tmp)
+        np.abs(tmp, out=tmp)
+        np.maximum(out[1:], tmp, out=out[1:])
+        np.subtract(low[1:], close[:-1], out=tmp)
+        np.abs(tmp, out=tmp)
+        np.maximum(out[1:], tmp, out=out[1:])
+    return out
+
+
+def _directional_movement(high, low, plus, minus, buffers):
+    """+DM and -DM, zero at the first bar."""
+    n = len(high)
+    plus[:1] = 0
+    minus[:1] = 0
+    if n < 2:
+        return
+    up, down = plus[1:], minus[1:]
+    np.subtract(high[1:], high[:-1], out=up)
+    np.subtract(low[:-1], low[1:], out=down)
+    not_up = np.less_equal(up, down, out=buffers.get("dm_not_up", n - 1, dtype=bool))
+    not_down = np.less_equal(
+        down, up, out=buffers.get("dm_not_down", n - 1, dtype=bool)
+    )
+    np.copyto(up, 0.0, where=not_up)
+    np.copyto(down, 0.0, where=not_down)
+    np.maximum(up, 0, out=up)
+    np.maximum(down, 0, out=down)
+
+
+def _fill_nan(values, value, buffers):
+    """Replace NaN in place like ``np.nan_to_num``, without its temporary
+    arrays."""
+    nan = np.isnan(values, out=buffers.get("nan", values.shape, dtype=bool))
+    np.copyto(values, value, where=nan)
+    return values
+
+
+def rsi(close, period, out=None, buffers=None):
+    """Relative Strength Index with Wilder's smoothing, 50 when the price
+    did not move during the whole smoothing."""
+    shape = close.shape
+    buffers = _buffers(buffers)
+    gain = buffers.get("gain", shape)
+    loss = buffers.get("loss", shape)
+    gain[..., :1] = 0
+    np.subtract(close[..., 1:], close[..., :-1], out=gain[..., 1:])
+    np.negative(gain, out=loss)
+    np.maximum(gain, 0, out=gain)
+    np.maximum(loss, 0, out=loss)
+    avg_gain = wilder(
+        gain, period, 1, _scratch(out, buffers, "avg_gain", shape), buffers
+    )
+    avg_loss = wilder(
+        loss, period, 1, _scratch(out, buffers, "avg_loss", shape), buffers
+    )
+    # 100 - 100 / (1 + gain / loss) written without the division by loss
+    out = np.add(avg_gain, avg_loss, out=check_out(out, shape))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(avg_gain, out, out=out)
+    out *= 100
+    _fill_nan(out[..., period:], 50.0, buffers)
+    return out
+
+
+def wilder_atr(high, low, close, period, out=None, buffers=None):
+    """Average True Range with Wilder's smoothing."""
+    buffers = _buffers(buffers)
+    tr = true_range(high, low, close, buffers.get("true_range", len(high)), buffers)
+    return wilder(tr, period, 1, out, buffers)
+
+
+def _dmi(high, low, atr, period, out, buffers):
+    n = len(high)
+    plus_dm = buffers.get("plus_dm", n)
+    minus_dm = buffers.get("minus_dm", n)
+    _directional_movement(high, low, plus_dm, minus_dm, buffers)
+    plus_di = wilder(plus_dm, period, 1, out[1], buffers)
+    minus_di = wilder(minus_dm, period, 1, out[2], buffers)
+    for di in (plus_di, minus_di):
+        # The smoothed DM is 0 when the ATR is
+        with np.errstate(divide="ignore", invalid="ignore"):
+            di /= atr
+        di *= 100
+        _fill_nan(di[period:], 0.0, buffers)
+    dx = np.subtract(plus_di, minus_di, out=buffers.get("dx", n))
+    np.abs(dx, out=dx)
+    tmp = np.add(plus_di, minus_di, out=buffers.get("dx_tmp", n))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx /= tmp
+    dx *= 100
+    _fill_nan(dx[period:], 0.0, buffers)
+    adx = wilder(dx, period, period, out[0], buffers)
+    return adx, plus_di, minus_di
+
+
+def adx(high, low, close, period, out=(None, None, None), buffers=None):
+    """Average Directional Movement Index, return (ADX, +DI, -DI) lines."""
+    n = len(high)
+    buffers = _buffers(buffers)
+    atr = wilder_atr(
+        high, low, close, period, _scratch(out[1], buffers, "wilder_atr", n), buffers
+    )
+    return _dmi(high, low, atr, period, out, buffers)
+
+
+def wilder_suite(
+    high, low, close, period, out=(None, None, None, None, None), buffers=None
+):
+    """Return (RSI, ADX, +DI, -DI, ATR) lines. The true range is computed
+    once for the ATR and the directional indexes."""
+    buffers = _buffers(buffers)
+    atr = wilder_atr(high, low, close, period, out[4], buffers)
+    lines = _dmi(high, low, atr, period, out[1:4], buffers)
+    return (rsi(close, period, out[0], buffers), *lines, atr)
+
+
+def bears_power(close, low, period, out=None, buffers=None):
+    out = ema(close, period, out, buffers)
+    np.subtract(out, low, out=out)
+    return out
+
+
+def bulls_power(close, high, period, out=None, buffers=None):
+    out = ema(close, period, out, buffers)
+    np.subtract(high, out, out=out)
+    return out
+
+
+def _centered_scans(values, period, centers, key, buffers):
+    """Block scans of ``values`` minus the center of their block and of
+    the squares."""
+    n = len(values)
+    centered = buffers.get(f"std_centered_{period}", (len(centers), period))
+    # Subtracting centers[:, None] in place would buffer the broadcast
+    repeated = buffers.get(f"std_repeated_{period}", centered.shape)
+    repeated[:] = centers[:, None]
+    flat = centered.reshape(-1)
+    flat[:n] = values
+    centered -= repeated
+    flat = flat[:n]
+    scans = _block_scans(flat, period, np.add, 0.0, key, buffers)
+    np.square(flat, out=flat)
+    return scans + _block_scans(flat, period, np.add, 0.0, f"{key}_sq", buffers)
+
+
+def rolling_std(values, period, out=None, buffers=None):
+    """Population standard deviation of every window.
+
+    The sums over a window are taken from the prefix and suffix scans of its
+    two blocks of ``period`` values (see ``_block_scan``), to avoid
+    cancellation in E[x^2] - E[x]^2 the suffixes are centered on the last
+    value of their block and the prefixes on the first one, two neighbouring
+    values of the window.
+    """
+    n = len(values)
+    out = check_out(out, n)
+    if isinstance(period, TimeWindows):
+        # The compiled pandas rolling variance over time is updated row by
+        # row, without the cancellation of E[x^2] - E[x]^2 in flat windows
+        series = pd.Series(values, index=pd.DatetimeIndex(period.times), copy=False)
+        out[:] = series.rolling(pd.Timedelta(period.span)).std(ddof=0).to_numpy()
+        # NaN for the windows the sums give NaN for
+        buffers = _buffers(buffers)
+        sums = _time_sums(values, period, buffers.get("time_std", n), buffers)
+        np.copyto(out, np.nan, where=np.isnan(sums))
+        return out
+    out[: period - 1] = np.nan
+    if n < period:
+        return out
+    buffers = _buffers(buffers)
+    blocks = -(-n // period)
+    windows = n - period + 1
+    first = buffers.get(f"std_first_{period}", blocks)
+    first[:] = values[::period]
+    last = buffers.get(f"std_last_{period}", blocks)
+    last[:-1] = values[period - 1 :: period][: blocks - 1]
+    last[-1] = values[-1]
+    _, suffix, _, suffix_sq = _centered_scans(values, period, last, "std_l", buffers)
+    prefix, _, prefix_sq, _ = _centered_scans(values, period, first, "std_f", buffers)
+
+    # Distance between the centers of the two blocks of every window and
+    # number of values of the window in the first one, ``first`` is free
+    shift = buffers.get(f"std_shift_{period}", (blocks, period))
+    np.subtract(last[:-1], first[1:], out=first[:-1])
+    shift[:-1] = first[:-1, None]
+    shift[-1] = 0.0
+    count = buffers.get(f"std_count_{period}", (blocks, period))
+    count[:] = np.arange(period, 0, -1)
+    shift, count = shift.reshape(-1)[:windows], count.reshape(-1)[:windows]
+
+    total = buffers.get(f"std_total_{period}", windows)
+    tmp = buffers.get(f"std_tmp_{period}", windows)
+    res = out[period - 1 :]
+    # Sum of the squares around the center of the second block
+    np.multiply(shift, suffix[:windows], out=tmp)
+    tmp *= 2
+    np.add(suffix_sq[:windows], tmp, out=res)
+    np.multiply(shift, shift, out=tmp)
+    tmp *= count
+    res += tmp
+    res += prefix_sq[period - 1 : n]
+    # Sum around the center of the second block
+    np.multiply(shift, count, out=total)
+    total += suffix[:windows]
+    total += prefix[period - 1 : n]
+    # A window aligned with a block is the whole block
+    res[::period] = prefix_sq[period - 1 : n : period]
+    total[::period] = prefix[period - 1 : n : period]
+
+    res /= period
+    total /= period
+    np.square(total, out=total)
+    res -= total
+    np.maximum(res, 0, out=res)
+    np.sqrt(res, out=res)
+    return out
+
+
+def rolling_zscore(values, period, out=None, buffers=None):
+    """Distance of every value from the mean of its window, in standard
+    deviations of the window."""
+    n = len(values)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    std = rolling_std(values, period, buffers.get("zscore_std", n), buffers)
+    sma(values, period, out, buffers)
+    np.subtract(values, out, out=out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out /= std
+    return out
+
+
+def linear_regression(values, period, deviation, out=(None,) * 6, buffers=None):
+    """Return the (slope, intercept, r2, forecast, top, bottom) lines of the
+    least-squares line of every window, with x = 0 at its oldest value.
+
+    The sums of the window come from the O(n) moving averages: with
+    ``d = LWMA - SMA``, the slope is ``6 d / (period - 1)`` and the line is
+    ``SMA + 3 d`` at the last bar. The forecast is the line at the next bar,
+    the channel the line at the last bar plus and minus ``deviation``
+    standard errors of the fit. Values can be a (columns, rows) block.
+    """
+    buffers = _buffers(buffers)
+    slope, intercept, r2, forecast, top, bottom = (
+        check_out(arr, values.shape) for arr in out
+    )
+    mean = sma(values, period, buffers.get("lr_mean", values.shape), buffers)
+    d = lwma(values, period, buffers.get("lr_d", values.shape), buffers)
+    d -= mean
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.multiply(d, 6 / (period - 1), out=slope)
+        np.multiply(d, 3 * (period + 1) / (period - 1), out=forecast)
+        forecast += mean
+        np.multiply(d, -3, out=intercept)
+        intercept += mean
+        # Line at the last bar, the middle of the channel
+        np.multiply(d, 3, out=top)
+        top += mean
+
+        # Population variance of the values and its part explained by the
+        # line, r2 = explained / variance
+        for row, var in zip(
+            values.reshape(-1, values.shape[-1]), r2.reshape(-1, values.shape[-1])
+        ):
+            rolling_std(row, period, var, buffers)
+        np.square(r2, out=r2)
+        np.square(d, out=d)
+        d *= 3 * (period + 1) / (period - 1)
+        width = buffers.get("lr_width", values.shape)
+        np.subtract(r2, d, out=width)
+        np.maximum(width, 0, out=width)
+        width *= period / (period - 2)
+        np.sqrt(width, out=width)
+        width *= deviation
+        np.divide(d, r2, out=r2)
+        np.minimum(r2, 1, out=r2)
+    np.subtract(top, width, out=bottom)
+    top += width
+    return slope, intercept, r2, forecast, top, bottom
+
+
+def bollinger_bands(close, period, deviation, out=(None, None, None), buffers=None):
+    """Return (top, mid, bottom) lines."""
+    n = len(close)
+    buffers = _buffers(buffers)
+    top, mid, bottom = (check_out(arr, n) for arr in out)
+    sma(close, period, mid, buffers)
+    rolling_std(close, period, bottom, buffers)
+    bottom *= deviation
+    np.add(mid, bottom, out=top)
+    np.subtract(mid, bottom, out=bottom)
+    return top, mid, bottom
+
+
+def mean_deviation(values, period, mean=None, out=None, buffers=None):
+    """Mean absolute deviation of every window of ``period`` values from
+    its own mean (``mean``, the SMA of the values, when it is known).
+
+    The deviations are not a running sum, so they are added in ``period``
+    passes over the values, without a (values x period) temporary array.
+    """
+    n = len(values)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    if mean is None:
+        mean = sma(values, period, buffers.get("mean_deviation_sma", n), buffers)
+    out[: period - 1] = np.nan
+    if n >= period:
+        tmp = buffers.get("mean_deviation", n - period + 1)
+        res = out[period - 1 :]
+        res[:] = 0
+        for k in range(period):
+            np.subtract(values[k : n - period + 1 + k], mean[period - 1 :], out=tmp)
+            np.abs(tmp, out=tmp)
+            res += tmp
+        res /= period
+    return out
+
+
+def cci(high, low, close, period, out=None, buffers=None):
+    n = len(high)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    tp = typical_price(high, low, close, buffers.get("typical_price", n))
+    tp_sma = sma(tp, period, buffers.get("tp_sma", n), buffers)
+    tp_mad = mean_deviation(tp, period, tp_sma, buffers.get("tp_mad", n), buffers)
+    np.subtract(tp, tp_sma, out=out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out /= tp_mad
+    out *= 1 / 0.015
+    return out
+
+
+def _kth_deviation(window, j, m, k):
+    """k-th smallest |x - m| of a sorted window, where ``window[j]`` is the
+    first value not below ``m``. The deviations left of ``j`` and right of
+    it are two sorted sequences, the number taken from the left one is
+    found by bisection."""
+    lo, hi = max(0, k + 1 - (len(window) - j)), min(k + 1, j)
+    while lo < hi:
+        a = (lo + hi) // 2
+        if m - window[j - 1 - a] < window[j + k - a] - m:
+            lo = a + 1
+        else:
+            hi = a
+    kth = m - window[j - lo] if lo > 0 else -np.inf
+    if k >= lo:
+        kth = max(kth, window[j + k - lo] - m)
+    return kth
+
+
+def rolling_median_mad(values, period, median, mad):
+    """Rolling median and median absolute deviation from it.
+
+    The window is kept sorted, values are inserted and removed by
+    bisection, and the median absolute deviation is selected in
+    O(log period) by ``_kth_deviation``. Windows with NaN give NaN.
+    """
+    n = len(values)
+    median[: period - 1] = np.nan
+    mad[: period - 1] = np.nan
+    window = []
+    recent = collections.deque()
+    nans = 0
+    mid = period // 2
+    for start in range(0, n, 1024):
+        chunk = values[start : start + 1024].tolist()
+        for i, value in enumerate(chunk, start):
+            recent.append(value)
+            if math.isnan(value):
+                nans += 1
+            else:
+                bisect.insort(window, value)
+            if len(recent) > period:
+                old = recent.popleft()
+                if math.isnan(old):
+                    nans -= 1
+                else:
+                    del window[bisect.bisect_left(window, old)]
+            if i < period - 1:
+                continue
+            if nans:
+                median[i] = mad[i] = np.nan
+                continue
+            if period % 2:
+                m = window[mid]
+                j = bisect.bisect_left(window, m)
+                mad[i] = _kth_deviation(window, j, m, mid)
+            else:
+                m = (window[mid - 1] + window[mid]) / 2
+                j = bisect.bisect_left(window, m)
+                low = _kth_deviation(window, j, m, mid - 1)
+                mad[i] = (low + _kth_deviation(window, j, m, mid)) / 2
+            median[i] = m
+    return median, mad
+
+
+def robust_cci(high, low, close, period, out=None, buffers=None):
+    """CCI around the rolling median of the typical price, scaled by the
+    median absolute deviation."""
+    n = len(high)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    tp = typical_price(high, low, close, buffers.get("typical_price", n))
+    median, mad = rolling_median_mad(
+        tp, period, buffers.get("tp_median", n), buffers.get("tp_median_mad", n)
+    )
+    np.subtract(tp, median, out=out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out /= mad
+    out *= 1 / 0.015
+    return out
+
+
+def de_marker(high, low, period, out=None, buffers=None):
+    n = len(high)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    demax = buffers.get("demax", n)
+    demin = buffers.get("demin", n)
+    demax[:1] = 0
+    demin[:1] = 0
+    np.subtract(high[1:], high[:-1], out=demax[1:])
+    np.subtract(low[:-1], low[1:], out=demin[1:])
+    np.maximum(demax, 0, out=demax)
+    np.maximum(demin, 0, out=demin)
+    sma_demax = sma(demax, period, buffers.get("sma_demax", n), buffers)
+    sma_demin = sma(demin, period, buffers.get("sma_demin", n), buffers)
+    sma_demin += sma_demax
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(sma_demax, sma_demin, out=out)
+    return out
+
+
+def moving_average(values, period, method, out=None, buffers=None):
+    if method == "sma":
+        return sma(values, period, out, buffers)
+    if method == "smma":
+        return smma(values, period, out, buffers)
+    if method == "ema":
+        return ema(values, period, out, buffers)
+    if method == "lwma":
+        return lwma(values, period, out, buffers)
+    raise ValueError('The "method" can be only "sma", "ema", "smma" or "lwma"')
+
+
+def force_index(values, volume, period, method, out=None, buffers=None):
+    shape = values.shape
+    buffers = _buffers(buffers)
+    ma = moving_average(
+        values, period, method, _scratch(out, buffers, "ma", shape), buffers
+    )
+    out = check_out(out, shape)
+    out[..., :1] = np.nan
+    np.subtract(ma[..., 1:], ma[..., :-1], out=out[..., 1:])
+    out *= volume
+    return out
+
+
+def _fractal(values, compare, out, tmp):
+    out[:] = False
+    if len(values) < 5:
+        return out
+    res = out[2:-2]
+    center = values[2:-2]
+    compare(center, values[1:-3], out=res)
+    for other in (values[:-4], values[3:-1], values[4:]):
+        compare(center, other, out=tmp[2:-2])
+        res &= tmp[2:-2]
+    return out
+
+
+def fractals(high, low, out=(None, None), buffers=None):
+    """Return (fractals_high, fractals_low) boolean arrays."""
+    n = len(high)
+    fh, fl = (check_out(arr, n, dtype=bool) for arr in out)
+    tmp = _buffers(buffers).get("fractal", n, dtype=bool)
+    _fractal(high, np.greater, fh, tmp)
+    _fractal(low, np.less, fl, tmp)
+    return fh, fl
+
+
+def gator(
+    high,
+    low,
+    period_jaws,
+    period_teeth,
+    period_lips,
+    shift_jaws,
+    shift_teeth,
+    shift_lips,
+    out=(None, None),
+    buffers=None,
+):
+    """Return (value1, value2) lines."""
+    n = len(high)
+    buffers = _buffers(buffers)
+    teeth = alligator_line(
+        high,
+        low,
+        period_teeth,
+        shift_teeth,
+        _scratch(out[0], buffers, "teeth", n),
+        buffers,
+    )
+    val1 = alligator_line(high, low, period_jaws, shift_jaws, out[0], buffers)
+    val1 -= teeth
+    val2 = alligator_line(high, low, period_lips, shift_lips, out[1], buffers)
+    val2 -= teeth
+    return val1, val2
+
+
+def bar_colours(values, out=None, buffers=None):
+    """1 for the values higher than the previous one (green bars of the
+    AO and AC histograms), -1 for the lower ones (red bars) and the colour
+    of the previous bar for equal ones."""
+    n = len(values)
+    out = check_out(out, n)
+    out[:1] = np.nan
+    if n < 2:
+        return out
+    np.subtract(values[1:], values[:-1], out=out[1:])
+    np.sign(out, out=out)
+    buffers = _buffers(buffers)
+    ties = np.equal(out, 0, out=buffers.get("colour_ties", n, dtype=bool))
+    if ties.any():
+        # Position of the last bar which is not a tie, forward filled
+        previous = buffers.get("colour_previous", n, dtype=np.intp)
+        previous.fill(1)
+        previous[0] = 0
+        np.cumsum(previous, out=previous)
+        np.copyto(previous, 0, where=ties)
+        np.maximum.accumulate(previous, out=previous)
+        signs = buffers.get("colour_signs", n)
+        np.copyto(signs, out)
+        np.take(signs, previous, out=out, mode="clip")
+    return out
+
+
+def bill_williams(
+    high,
+    low,
+    volume,
+    period_jaws,
+    period_teeth,
+    period_lips,
+    shift_jaws,
+    shift_teeth,
+    shift_lips,
+    out=(None,) * 12,
+    buffers=None,
+):
+    """Return (AO, AC, jaws, teeth, lips, gator value1, gator value2,
+    fractals high, fractals low, BW MFI, AO colour, AC colour) lines.
+
+    The median price is computed once for the oscillators and the
+    Alligator lines, and the Gator Oscillator is taken from these lines.
+    """
+    n = len(high)
+    buffers = _buffers(buffers)
+    ao, ac, jaws, teeth, lips, val1, val2 = (check_out(arr, n) for arr in out[:7])
+    mp = median_price(high, low, buffers.get("median_price", n))
+    sma(mp, 34, ac, buffers)
+    sma(mp, 5, ao, buffers)
+    ao -= ac
+    sma(ao, 5, ac, buffers)
+    np.subtract(ao, ac, out=ac)
+    lines = zip(
+        (jaws, teeth, lips),
+        (period_jaws, period_teeth, period_lips),
+        (shift_jaws, shift_teeth, shift_lips),
+    )
+    for line, period, shift_by in lines:
+        smoothed = smma(mp, period, _scratch(out[2], buffers, "smma", n), buffers)
+        shift(smoothed, shift_by, line)
+    np.subtract(jaws, teeth, out=val1)
+    np.subtract(lips, teeth, out=val2)
+    fh, fl = fractals(high, low, out[7:9], buffers)
+    return (
+        ao,
+        ac,
+        jaws,
+        teeth,
+        lips,
+        val1,
+        val2,
+        fh,
+        fl,
+        bw_mfi(high, low, volume, out[9]),
+        bar_colours(ao, out[10], buffers),
+        bar_colours(ac, out[11], buffers),
+    )
+
+
+def _high_low_mid(high, low, period, out, tmp, buffers):
+    rolling_max(high, period, out, buffers)
+    out += rolling_min(low, period, tmp, buffers)
+    out /= 2
+    return out
+
+
+def ichimoku_kinko_hyo(
+    high,
+    low,
+    close,
+    period_tenkan_sen,
+    period_kijun_sen,
+    period_senkou_span_b,
+    out=(None, None, None, None, None),
+    buffers=None,
+):
+    """Return (tenkan, kijun, senkou_span_a, senkou_span_b, chikou) lines.
+
+    The spans are displaced by ``period_kijun_sen``, by its span over the
+    timestamps (see ``TimeWindows.lag``) for a time window.
+    """
+    n = len(high)
+    buffers = _buffers(buffers)
+    tenkan, kijun, ssa, ssb, chikou = (check_out(arr, n) for arr in out)
+    tmp = buffers.get("ichimoku_tmp", n)
+    mid = buffers.get("ichimoku_mid", n)
+    _high_low_mid(high, low, period_tenkan_sen, tenkan, tmp, buffers)
+    _high_low_mid(high, low, period_kijun_sen, kijun, tmp, buffers)
+    np.add(tenkan, kijun, out=mid)
+    mid /= 2
+    if isinstance(period_kijun_sen, TimeWindows):
+        lag, lead = period_kijun_sen.lag, period_kijun_sen.lead
+    else:
+        lag = functools.partial(shift, periods=period_kijun_sen)
+        lead = functools.partial(shift, periods=-period_kijun_sen)
+    lag(mid, out=ssa)
+    _high_low_mid(high, low, period_senkou_span_b, mid, tmp, buffers)
+    lag(mid, out=ssb)
+    lead(close, out=chikou)
+    return tenkan, kijun, ssa, ssb, chikou
+
+
+def bw_mfi(high, low, volume, out=None):
+    out = check_out(out, len(high))
+    np.subtract(high, low, out=out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out /= volume
+    out *= 100000
+    return out
+
+
+def momentum(close, period, out=None):
+    out = check_out(out, len(close))
+    shift(close, period, out)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(close, out, out=out)
+    out *= 100
+    return out
+
+
+def mfi(high, low, close, volume, period, out=None, buffers=None):
+    n = len(high)
+    out = check_out(out, n)
+    buffers = _buffers(buffers)
+    tp = typical_price(high, low, close, buffers.get("typical_price", n))
+    mf = np.multiply(tp, volume, out=buffers.get("money_flow", n))
+    flow = buffers.get("flow", n)
+    mask = buffers.get("flow_mask", n, dtype=bool)
+    mask[:1] = False
+
+    np.greater(tp[1:], tp[:-1], out=mask[1:])
+    flow.fill(0)
+    np.copyto(flow, mf, where=mask)
+    pmfs = rolling_sum(flow, period, buffers.get("pmfs", n), buffers)
+
+    np.less(tp[1:], tp[:-1], out=mask[1:])
+    flow.fill(0)
+    np.copyto(flow, mf, where=mask)
+    nmfs = rolling_sum(flow, period, buffers.get("nmfs", n), buffers)
+
+    np.round(pmfs, 10, out=pmfs)
+    np.round(nmfs, 10, out=nmfs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(pmfs, nmfs, out=out)
+        out += 1
+        np.divide(100, out, out=out)
+    np.subtract(100, out, out=out)
+    return out
+
+
+def _flow(values, mask, out):
+    """``values`` where ``mask`` is set, else 0."""
+    out.fill(0)
+    np.copyto(out, values, where=mask)
+    return out
+
+
+def oscillators(
+    high,
+    low,
+    close,
+    volume,
+    period_mfi,
+    period_de_marker,
+    period_momentum,
+    out=(None, None, None, None),
+    buffers=None,
+):
+    """Return (MFI, DeMarker, momentum, BW MFI) lines.
+
+    The intermediate series (typical price, money flows, DeMarker ranges
+    and their sums) are computed in place in the output arrays before the
+    lines that own them, so only a mask and the scans of the rolling sums
+    are allocated besides the outputs.
+    """
+    n = len(high)
+    buffers = _buffers(buffers)
+    mfi_, dem, mom, bw = (check_out(arr, n) for arr in out)
+    mask = buffers.get("flow_mask", n, dtype=bool)
+    mask[:1] = False
+
+    tp = typical_price(high, low, close, mom)
+    mf = np.multiply(tp, volume, out=bw)
+    np.greater(tp[1:], tp[:-1], out=mask[1:])
+    pmfs = rolling_sum(_flow(mf, mask, mfi_), period_mfi, mfi_, buffers)
+    np.less(tp[1:], tp[:-1], out=mask[1:])
+    nmfs = rolling_sum(_flow(mf, mask, dem), period_mfi, dem, buffers)
+    np.round(pmfs, 10, out=pmfs)
+    np.round(nmfs, 10, out=nmfs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmfs /= nmfs
+    pmfs += 1
+    np.divide(100, pmfs, out=pmfs)
+    np.subtract(100, pmfs, out=mfi_)
+
+    demax, demin = dem, mom
+    demax[:1] = 0
+    demin[:1] = 0
+    np.subtract(high[1:], high[:-1], out=demax[1:])
+    np.subtract(low[:-1], low[1:], out=demin[1:])
+    np.maximum(demax, 0, out=demax)
+    np.maximum(demin, 0, out=demin)
+    sma(demax, period_de_marker, demax, buffers)
+    sma(demin, period_de_marker, demin, buffers)
+    demin += demax
+    with np.errstate(divide="ignore", invalid="ignore"):
+        demax /= demin
+
+    return (
+        mfi_,
+        dem,
+        momentum(close, period_momentum, mom),
+        bw_mfi(high, low, volume, bw),
+    )
+
+
+def macd(
+    close, period_fast, period_slow, period_signal, out=(None, None), buffers=None
+):
+    """Return (value, signal) lines."""
+    n = len(close)
+    buffers = _buffers(buffers)
+    value = ema(close, period_fast, out[0], buffers)
+    value -= ema(close, period_slow, _scratch(out[0], buffers, "slow", n), buffers)
+    signal = sma(value, period_signal, out[1], buffers)
+    return value, signal
@@ -0,0 +1,149 @@
+"""
+Reference implementations of the indicators.
+
+These are the original pandas implementations of SMMA, CCI, ALMA and ATR,
+slow but simple, kept to check that the numpy kernels give the same
+values (see ``Indicators.verify``):
+
+    >>> report = i.verify(["smma", "cci", ("alma", {"period": 9})])
+    >>> report["cci"]
+    Difference(max_abs=5.7e-14, max_rel=1.2e-15, nan_mismatch=array([]), passed=True)
+
+A difference is allowed where ``|actual - expected| <= atol + rtol *
+|expected|``, like ``numpy.isclose``, and NaN values must be at the same
+positions.
+"""
+
+import collections
+
+import numpy as np
+import pandas as pd
+
+from .utils import alma_weights
+
+Difference = collections.namedtuple(
+    "Difference", ["max_abs", "max_rel", "nan_mismatch", "passed"]
+)
+
+
+class VerificationError(ValueError):
+    """Raised when the values of an indicator differ from the reference.
+
+    :param dict report: Difference by column name
+    """
+
+    def __init__(self, report):
+        self.report = report
+        failed = ", ".join(
+            f"{name} (max abs {d.max_abs:.3g}, max rel {d.max_rel:.3g}, "
+            f"{len(d.nan_mismatch)} NaN mismatches)"
+            for name, d in report.items()
+            if not d.passed
+        )
+        super().__init__(f"Values differ from the reference: {failed}")
+
+
+def _columns(apply_to):
+    return [apply_to] if isinstance(apply_to, str) else apply_to
+
+
+def smma(values, period):
+    """Smoothed Moving Average, the loop of the original
+    ``calculate_smma``: the mean of the first ``period`` values at position
+    ``period``, then ``(previous * (period - 1) + value) / period``."""
+    result = np.full(len(values), np.nan)
+    if len(values) <= period:
+        return result
+    previous = pd.Series(values[:period]).mean()
+    result[period] = previous
+    for index in range(period + 1, len(values)):
+        previous = (previous * (period - 1) + values[index]) / period
+        result[index] = previous
+    return result
+
+
+def mad(data, axis=None):
+    """Calculate Average absolute deviation."""
+    return np.mean(np.absolute(data - np.mean(data, axis)), axis)
+
+
+def cci(high, low, close, period):
+    """Commodity Channel Index with a rolling apply of ``mad``."""
+    tp = (pd.Series(high) + pd.Series(low) + pd.Series(close)) / 3
+    tp_sma = tp.rolling(window=period).mean()
+    tp_mad = tp.rolling(window=period).apply(mad, raw=True)
+    return ((1 / 0.015) * ((tp - tp_sma) / tp_mad)).to_numpy()
+
+
+def alma(values, period, offset, sigma):
+    """Arnaud Legoux Moving Average with a rolling apply of the weights."""
+    weights = alma_weights(period, offset, sigma)
+    return (
+        pd.Series(values)
+        .rolling(window=period)
+        .apply(lambda x: np.sum(weights * x), raw=True)
+        .to_numpy()
+    )
+
+
+def atr(high, low, close, period):
+    """Average True Range as the simple moving average of the largest of
+    High - Low, previous Close - High and previous Close - Low."""
+    high, low, close = pd.Series(high), pd.Series(low), pd.Series(close)
+    ranges = pd.DataFrame(
+        {
+            "max_min": high - low,
+            "prev_close-high": close.shift(1) - high,
+            "prev_close-min": close.shift(1) - low,
+        }
+    )
+    return ranges.max(axis=1).rolling(window=period).mean().to_numpy()
+
+
+def _smma(values, period, apply_to, **kwargs):
+    return [smma(values(name), period) for name in _columns(apply_to)]
+
+
+def _cci(values, period, method, **kwargs):
+    if method != "mean":
+        raise ValueError('The reference "cci" is only for method="mean"')
+    return [cci(values("High"), values("Low"), values("Close"), period)]
+
+
+def _alma(values, period, offset, sigma, apply_to, **kwargs):
+    return [alma(values(name), period, offset, sigma) for name in _columns(apply_to)]
+
+
+def _atr(values, period, **kwargs):
+    return [atr(values("High"), values("Low"), values("Close"), period)]
+
+
+# Reference of every method, called with a function returning the values
+# of a column and all the arguments of the method, returns one array per
+# column in the order of ``output_columns``
+REFERENCES = {"smma": _smma, "cci": _cci, "alma": _alma, "atr": _atr}
+
+
+def compare(actual, expected, rtol, atol):
+    """Compare the values of a column with its reference values.
+
+    :return: Difference with the max absolute and relative differences,
+        the positions where only one of the values is NaN, and whether all
+        the values are within the tolerance
+    """
+    actual = np.asarray(actual, dtype=float)
+    expected = np.asarray(expected, dtype=float)
+    nan_mismatch = np.flatnonzero(np.isnan(actual) != np.isnan(expected))
+    both = ~(np.isnan(actual) | np.isnan(expected))
+    actual, expected = actual[both], expected[both]
+    error = np.abs(actual - expected)
+    scale = np.abs(expected)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative = np.where(error == 0, 0.0, error / scale)
+    passed = not len(nan_mismatch) and bool(np.all(error <= atol + rtol * scale))
+    return Difference(
+        float(error.max(initial=0.0)),
+        float(relative.max(initial=0.0)),
+        nan_mismatch,
+        passed,
+    )
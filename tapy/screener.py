@@ -0,0 +1,175 @@
+"""
+Screening of a universe of symbols by the latest values of indicators.
+
+``bars`` maps every symbol to a data frame (or a dict of arrays) of its
+bars, a score is a column or a function of the latest values of all the
+symbols:
+
+    >>> top = screen(bars, ["cci", "momentum", ("mfi", {"period": 14})], by="cci", k=20)
+    >>> far = screen(
+    ...     bars,
+    ...     ["bollinger_bands"],
+    ...     by=lambda v: (v["Close"] - v["bollinger_top"]) / v["Close"],
+    ...     where=lambda v: v["Close"] > v["bollinger_top"],
+    ... )
+
+Only the last bars the indicators need (see ``lookback``) are taken from
+every symbol, and these tails are concatenated so that every indicator is
+calculated once for the whole universe. The values of the windowed
+indicators are exact. The recursive ones (EMA, SMMA, Wilder's smoothing)
+also carry the state of the previous symbol into the warm-up, so their
+tolerance is divided by the spread of the price levels of the symbols.
+
+Symbols with less history than needed or non finite values in their tail,
+and indicators depending on the whole history, are calculated symbol by
+symbol with ``Indicators.latest``. The top ``k`` symbols are found with
+``numpy.argpartition`` and only they are sorted.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .indicators import Indicators, _Columns, lookback, output_columns
+
+SOURCES = ("Open", "High", "Low", "Close", "Volume")
+
+
+def _indicators(indicators):
+    return [(item, {}) if isinstance(item, str) else item for item in indicators]
+
+
+def _spread(prices):
+    """Ratio of the largest to the smallest non-zero absolute price."""
+    ratio = 1.0
+    for values in prices.values():
+        values = np.abs(values[np.isfinite(values)])
+        values = values[values > 0]
+        if len(values):
+            ratio = max(ratio, values.max() / values.min())
+    return ratio
+
+
+def latest_values(bars, indicators, tolerance=1e-10, **columns):
+    """Latest values of indicators for every symbol of a universe.
+
+    :param dict bars: Data frame or dict of arrays of the bars of every
+        symbol
+    :param list indicators: Method names or (method, kwargs) pairs
+    :param float tolerance: Weight left on the bars before the warm-up of
+        recursive indicators, see ``lookback``, default: 1e-10
+    :param columns: Column names passed to ``Indicators``, e.g.
+        ``close_col="close"``
+    :return: dict of column name and array of the latest values in the
+        order of ``bars``, including the last bar of the source columns
+    """
+    indicators = _indicators(indicators)
+    frames = list(bars.values())
+    names = [columns.get(f"{name.lower()}_col", name) for name in SOURCES]
+    names = [name for name in names if frames and name in frames[0]]
+    sources = {name: [np.asarray(frame[name]) for frame in frames] for name in names}
+    lengths = np.array([len(values) for values in sources[names[0]]], dtype=int)
+    results = {}
+    for name, arrays in sources.items():
+        results[name] = np.array(
+            [values[-1] if len(values) else np.nan for values in arrays], dtype=float
+        )
+    for method, kwargs in indicators:
+        for column in output_columns(method, kwargs):
+            results[column] = np.full(len(frames), np.nan)
+
+    prices = [columns.get(f"{name.lower()}_col", name) for name in SOURCES[:4]]
+    tolerance = tolerance / _spread(
+        {name: values for name, values in results.items() if name in prices}
+    )
+    rows = [lookback(method, kwargs, tolerance) for method, kwargs in indicators]
+    windowed = [item for item, needed in zip(indicators, rows) if needed is not None]
+    needed = max((needed for needed in rows if needed is not None), default=1)
+
+    # The tails of the symbols with enough finite bars, one row per symbol
+    fast = lengths >= needed
+    selected = np.flatnonzero(fast)
+    blocks = {}
+    for column, arrays in sources.items():
+        block = np.empty((len(selected), needed))
+        for row, symbol in zip(block, selected):
+            row[:] = arrays[symbol][-needed:]
+        blocks[column] = block
+        fast[selected[~np.isfinite(block).all(axis=1)]] = False
+    keep = fast[selected]
+    if windowed and keep.any():
+        # The tails of all symbols are calculated as one long frame, the
+        # values of a symbol are read at the end of its tail
+        df = {column: block[keep].ravel() for column, block in blocks.items()}
+        universe = Indicators(_Columns(pd.DataFrame(df, copy=False)), **columns)
+        ends = np.arange(needed - 1, keep.sum() * needed, needed)
+        for method, kwargs in windowed:
+            getattr(universe, method)(**kwargs)
+            for column in output_columns(method, kwargs):
+                results[column][fast] = universe.df.added[column][ends]
+
+    for symbol, frame in enumerate(frames):
+        pending = (
+            indicators
+            if not fast[symbol]
+            else [item for item, needed in zip(indicators, rows) if needed is None]
+        )
+        if pending and lengths[symbol]:
+            if isinstance(frame, dict):
+                frame = pd.DataFrame(frame)
+            values = Indicators(frame, **columns).latest(pending, tolerance=tolerance)
+            for column, value in values.items():
+                results[column][symbol] = value
+    return results
+
+
+def screen(
+    bars,
+    indicators,
+    by=None,
+    k=None,
+    ascending=False,
+    where=None,
+    tolerance=1e-10,
+    **columns,
+):
+    """Rank or filter the symbols of a universe by the latest values of
+    indicators.
+
+    :param dict bars: Data frame or dict of arrays of the bars of every
+        symbol
+    :param list indicators: Method names or (method, kwargs) pairs
+    :param by: Column name, or function of the dict of latest values
+        returning one score per symbol, default: None (no ranking)
+    :param int k: Number of symbols with the largest scores (the smallest
+        when ascending) to return, default: all
+    :param bool ascending: Rank the smallest scores first, default: False
+    :param where: Function of the dict of latest values returning a boolean
+        mask of the symbols to keep, default: None
+    :param float tolerance: See ``latest_values``, default: 1e-10
+    :param columns: Column names passed to ``Indicators``
+    :return: pandas data frame of the latest values indexed by symbol, and
+        ``score``, sorted by score. Symbols without a finite score are left
+        out.
+    """
+    values = latest_values(bars, indicators, tolerance, **columns)
+    symbols = np.array(list(bars), dtype=object)
+    keep = np.ones(len(symbols), dtype=bool)
+    if where is not None:
+        keep &= np.asarray(where(values), dtype=bool)
+    if by is not None:
+        score = np.asarray(values[by] if isinstance(by, str) else by(values), float)
+        keep &= np.isfinite(score)
+    selected = np.flatnonzero(keep)
+    if by is not None:
+        key = score[selected] if ascending else -score[selected]
+        if k is not None and k < len(selected):
+            part = np.argpartition(key, k - 1)[:k]
+            selected, key = selected[part], key[part]
+        selected = selected[np.argsort(key, kind="stable")]
+        values = {**values, "score": score}
+    elif k is not None:
+        selected = selected[:k]
+    return pd.DataFrame(
+        {column: array[selected] for column, array in values.items()},
+        index=pd.Index(symbols[selected], name="symbol"),
+    )
@@ -0,0 +1,518 @@
+"""
+Local indicator service.
+
+The server keeps the bars of the symbols in memory and answers HTTP
+requests on localhost or on a Unix socket:
+
+    $ python -m tapy.server EURUSD=EURUSD60.csv --port 8765
+
+    POST /indicators
+    {"symbol": "EURUSD", "indicators": ["cci", ["sma", {"period": 20}]],
+     "bars": 100}
+
+``bars`` is optional and limits the response to the last bars, which are
+then calculated like ``Indicators.latest``. The response body contains the
+indicator columns in the layout of ``tapy.shared.pack_columns``
+(``Content-Type: application/x-tapy-columns``), errors are JSON with an
+``error`` key. Requests are validated before the calculation: unknown
+indicators, columns and parameters of the wrong type are answered with a
+4xx status, any failure of the calculation with 500 and logged with its
+traceback. Periods are numbers of bars, the bars of the server have no
+timestamps for time spans.
+
+Identical indicators requested for a symbol while they are being
+calculated are calculated once, and the indicators requested for the same
+symbol at the same time are calculated together on one ``Indicators``
+object, in an executor so the event loop is not blocked:
+
+    >>> server = IndicatorServer({"EURUSD": df})
+    >>> await server.start_http(port=8765)
+    >>> await fetch("EURUSD", ["cci", ("sma", {"period": 20})], port=8765)
+    {'cci': array([...]), 'sma': array([...])}
+
+Bars can be added while serving, from a ``tapy.feed.replay`` of a CSV file
+for local tests:
+
+    >>> await server.run_feed({"EURUSD": replay("EURUSD60.csv", delay=0.1)})
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import math
+import pathlib
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .feed import replay
+from .indicators import (
+    MIN_PERIOD,
+    OUTPUTS,
+    PRICES,
+    Indicators,
+    _out_arrays,
+    output_columns,
+)
+from .shared import pack_columns, unpack_columns
+
+CONTENT_TYPE = "application/x-tapy-columns"
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("Open", "High", "Low", "Close", "Volume")
+
+# Choices of the ``method`` parameter of the indicators
+METHODS = {
+    "cci": ("mean", "median"),
+    "force_index": ("sma", "smma", "ema", "lwma"),
+}
+
+# Indicators accepting a list of periods
+PERIOD_LISTS = ("linear_regression",)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class RequestError(ValueError):
+    """Invalid request, answered with ``status``."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class SymbolBars:
+    """Bars of a symbol as growing numpy columns.
+
+    ``snapshot`` returns a frame-like view of the bars at that time, which
+    stays valid while bars are appended: the arrays are only written past
+    its rows, or replaced when they are full.
+
+    :param df: pandas data frame of the first bars
+    :param int window: Number of last bars kept, default: all
+    """
+
+    def __init__(self, df, window=None):
+        self.window = window
+        self.length = len(df)
+        self._arrays = {name: df[name].to_numpy().copy() for name in df.columns}
+
+    def append(self, bar):
+        """Add a bar, a dict of the column values."""
+        if self.length == len(next(iter(self._arrays.values()))):
+            # Move the kept bars into larger arrays, appending is amortized
+            # O(1) per bar
+            keep = self.length if self.window is None else min(self.length, self.window)
+            size = 2 * keep + 1024
+            arrays = {}
+            for name, arr in self._arrays.items():
+                arrays[name] = np.empty(size, dtype=arr.dtype)
+                arrays[name][:keep] = arr[self.length - keep : self.length]
+            self._arrays = arrays
+            self.length = keep
+        for name, arr in self._arrays.items():
+            arr[self.length] = bar[name]
+        self.length += 1
+
+    @property
+    def columns(self):
+        return self._arrays.keys()
+
+    def snapshot(self):
+        """Return a frame-like view of the current bars."""
+        start = 0 if self.window is None else max(self.length - self.window, 0)
+        return _Snapshot(self._arrays, start, self.length)
+
+
+class _Snapshot:
+    """Frame-like view of rows ``start:stop`` of arrays."""
+
+    def __init__(self, arrays, start, stop):
+        self._arrays = arrays
+        self._start = start
+        self._stop = stop
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __getitem__(self, name):
+        return self._arrays[name][self._start : self._stop]
+
+    def __len__(self):
+        return self._stop - self._start
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_argument(method, name, value, columns):
+    """Raise a RequestError for an invalid argument of an indicator."""
+    if name.startswith("period"):
+        if isinstance(value, str):
+            raise RequestError(
+                f"{method}: {name} should be a number of bars, time spans are "
+                "not supported by the server"
+            )
+        periods = value if isinstance(value, list) else [value]
+        if isinstance(value, list) and (method not in PERIOD_LISTS or not value):
+            raise RequestError(f"{method}: {name} should be a number of bars")
+        minimum = MIN_PERIOD.get(method, 1)
+        if not all(_is_int(period) and period >= minimum for period in periods):
+            raise RequestError(
+                f"{method}: {name} should be an integer of at least {minimum}"
+            )
+    elif name.startswith("shift"):
+        if not _is_int(value):
+            raise RequestError(f"{method}: {name} should be an integer")
+    elif name.startswith("column_name"):
+        if not isinstance(value, str):
+            raise RequestError(f"{method}: {name} should be a string")
+    elif name == "method":
+        if value not in METHODS[method]:
+            raise RequestError(f"{method}: method should be one of {METHODS[method]}")
+    elif name == "apply_to":
+        names = value if isinstance(value, list) else [value]
+        if not names or not all(isinstance(n, str) and n in columns for n in names):
+            raise RequestError(f"{method}: unknown column in apply_to {value!r}")
+    elif not (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+    ):
+        raise RequestError(f"{method}: {name} should be a number")
+
+
+def _spec(item, columns):
+    """Return a hashable (method, kwargs) spec of a requested indicator,
+    ``columns`` are the names ``apply_to`` can take."""
+    if isinstance(item, str):
+        method, kwargs = item, {}
+    elif isinstance(item, list) and len(item) == 2:
+        method, kwargs = item
+    else:
+        raise RequestError(f"invalid indicator {item!r}")
+    if (
+        not isinstance(method, str)
+        or method not in OUTPUTS
+        or not isinstance(kwargs, dict)
+        or "out" in kwargs
+    ):
+        raise RequestError(f"unknown indicator {method!r}")
+    try:
+        inspect.signature(getattr(Indicators, method)).bind(None, **kwargs)
+    except TypeError as e:
+        raise RequestError(f"{method}: {e}")
+    for name, value in kwargs.items():
+        _check_argument(method, name, value, columns)
+    return method, json.dumps(kwargs, sort_keys=True)
+
+
+def _calculate(df, specs, bars, columns):
+    """Calculate specs on a snapshot, return the columns of every spec."""
+    i = Indicators(df, **columns)
+    results = {}
+    for spec in specs:
+        method, kwargs = spec[0], json.loads(spec[1])
+        if bars is None:
+            names, out, arrays = _out_arrays(method, kwargs, len(df))
+            getattr(i, method)(out=out, **kwargs)
+        else:
+            values = i.latest([(method, kwargs)], bars=bars)
+            names = output_columns(method, kwargs)
+            arrays = [np.atleast_1d(values[name]) for name in names]
+        results[spec] = dict(zip(names, arrays))
+    return results
+
+
+class IndicatorServer:
+    """Serve indicators of in-memory symbols.
+
+    :param dict frames: Symbol and pandas data frame of its bars
+    :param load: Function returning the data frame of a symbol which is
+        not in memory yet, or None for unknown symbols, default: None
+    :param int window: Number of last bars kept per symbol, default: all
+    :param executor: ``concurrent.futures.Executor`` of the calculations,
+        default: the event loop's default executor
+    :param columns: Column names passed to ``Indicators``
+        (``open_col``, ``high_col``, ...)
+    """
+
+    def __init__(self, frames=None, load=None, window=None, executor=None, **columns):
+        self.window = window
+        self.load = load
+        self.executor = executor
+        self.columns = columns
+        self.symbols = {
+            symbol: SymbolBars(df, window) for symbol, df in (frames or {}).items()
+        }
+        # Number of calculations run in the executor and of indicator
+        # requests, the difference is what coalescing saved
+        self.calculations = 0
+        self.requests = 0
+        self._inflight = {}
+        self._batches = {}
+        self._servers = []
+
+    def _bars(self, symbol):
+        if symbol not in self.symbols:
+            df = self.load(symbol) if self.load is not None else None
+            if df is None:
+                raise RequestError(f"unknown symbol {symbol!r}", 404)
+            self.symbols[symbol] = SymbolBars(df, self.window)
+        return self.symbols[symbol]
+
+    async def compute(self, symbol, indicators, bars=None):
+        """Return the columns of indicators of a symbol.
+
+        :param str symbol: Symbol
+        :param list indicators: Method names or (method, kwargs) pairs
+        :param int bars: Number of last bars, default: all
+        :return: dict of column name and numpy array
+        """
+        if bars is not None and (not _is_int(bars) or bars < 1):
+            raise RequestError("bars should be a positive integer")
+        symbol_bars = self._bars(symbol)
+        if not isinstance(indicators, list):
+            raise RequestError("indicators should be a list")
+        columns = set(symbol_bars.columns) | set(PRICES)
+        columns.update(
+            name
+            for name in SOURCES
+            if self.columns.get(f"{name.lower()}_col", name) in symbol_bars.columns
+        )
+        specs = list(dict.fromkeys(_spec(item, columns) for item in indicators))
+        self.requests += len(specs)
+        loop = asyncio.get_running_loop()
+        futures = []
+        for spec in specs:
+            key = (symbol, bars, spec)
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = loop.create_future()
+                batch = self._batches.setdefault((symbol, bars), [])
+                batch.append(spec)
+                if len(batch) == 1:
+                    # Indicators requested until the next loop iteration
+                    # join this batch
+                    loop.call_soon(self._run_batch, symbol, bars, symbol_bars)
+            futures.append(future)
+        results = {}
+        for columns in await asyncio.gather(*futures):
+            results.update(columns)
+        return results
+
+    def _run_batch(self, symbol, bars, symbol_bars):
+        specs = self._batches.pop((symbol, bars))
+        self.calculations += 1
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(
+            self.executor,
+            _calculate,
+            symbol_bars.snapshot(),
+            specs,
+            bars,
+            self.columns,
+        )
+        task.add_done_callback(lambda done: self._finish(symbol, bars, specs, done))
+
+    def _finish(self, symbol, bars, specs, done):
+        for spec in specs:
+            future = self._inflight.pop((symbol, bars, spec))
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result()[spec])
+
+    async def run_feed(self, feeds):
+        """Append bars from async iterators, e.g. ``tapy.feed.replay``.
+
+        :param dict feeds: Symbol and async iterator of bars (dicts)
+        """
+
+        async def consume(symbol, bars):
+            async for bar in bars:
+                if symbol in self.symbols:
+                    self.symbols[symbol].append(bar)
+                else:
+                    self.symbols[symbol] = SymbolBars(pd.DataFrame([bar]), self.window)
+
+        await asyncio.gather(*(consume(symbol, bars) for symbol, bars in feeds.items()))
+
+    async def _respond(self, method, path, body):
+        if path != "/indicators":
+            raise RequestError(f"unknown path {path!r}", 404)
+        if method != "POST":
+            raise RequestError("use POST", 405)
+        try:
+            request = json.loads(body)
+            symbol = request["symbol"]
+            indicators = request["indicators"]
+        except (ValueError, KeyError, TypeError):
+            raise RequestError("the body should be JSON with symbol and indicators")
+        columns = await self.compute(symbol, indicators, request.get("bars"))
+        return pack_columns(columns)
+
+    @staticmethod
+    async def _write(writer, status, payload):
+        """Send a response, errors are a dict sent as JSON."""
+        content_type = CONTENT_TYPE
+        if isinstance(payload, dict):
+            payload = json.dumps(payload).encode()
+            content_type = "application/json"
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n".encode("latin-1")
+        )
+        writer.write(payload)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        """Answer the HTTP requests of a connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    # The body can not be told from the next request
+                    await self._write(writer, 400, {"error": "malformed request"})
+                    break
+                body = await reader.readexactly(length)
+                try:
+                    payload = await self._respond(method, path, body)
+                except RequestError as e:
+                    await self._write(writer, e.status, {"error": str(e)})
+                except Exception:
+                    logger.exception("%s %s failed", method, path)
+                    await self._write(writer, 500, {"error": "internal error"})
+                else:
+                    await self._write(writer, 200, payload)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start_http(self, host="127.0.0.1", port=0):
+        """Listen on a TCP port of localhost.
+
+        :return: The port, useful with port 0 which picks a free one
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path):
+        """Listen on a Unix socket."""
+        self._servers.append(await asyncio.start_unix_server(self.handle, path))
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+
+async def fetch(symbol, indicators, bars=None, host="127.0.0.1", port=None, path=None):
+    """Request indicators from an ``IndicatorServer``.
+
+    :param str symbol: Symbol
+    :param list indicators: Method names or (method, kwargs) pairs
+    :param int bars: Number of last bars, default: all
+    :param str host: Host of the HTTP server, default: 127.0.0.1
+    :param int port: Port of the HTTP server
+    :param str path: Path of the Unix socket, used instead of the port
+    :return: dict of column name and numpy array
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(
+        {"symbol": symbol, "indicators": indicators, "bars": bars}
+    ).encode()
+    writer.write(
+        b"POST /indicators HTTP/1.1\r\n"
+        + f"Host: {host}\r\nContent-Length: {len(body)}\r\n".encode()
+        + b"Connection: close\r\n\r\n"
+        + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    payload = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    if status != 200:
+        raise RuntimeError(f"{status}: {json.loads(payload)['error']}")
+    return unpack_columns(payload)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m tapy.server", description="Serve indicators of CSV files."
+    )
+    parser.add_argument(
+        "symbols", nargs="+", help="SYMBOL=path.csv, the bars of a symbol"
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Localhost port")
+    parser.add_argument("--unix", help="Unix socket path, instead of the port")
+    parser.add_argument("--window", type=int, help="Number of last bars kept")
+    parser.add_argument(
+        "--replay",
+        type=float,
+        metavar="DELAY",
+        help="Add the bars one by one every DELAY seconds instead of at once",
+    )
+    args = parser.parse_args(argv)
+    paths = dict(item.split("=", 1) for item in args.symbols)
+
+    async def serve():
+        if args.replay is None:
+            frames = {symbol: pd.read_csv(path) for symbol, path in paths.items()}
+            server = IndicatorServer(frames, window=args.window)
+        else:
+            server = IndicatorServer(window=args.window)
+        if args.unix:
+            await server.start_unix(args.unix)
+            print(f"Listening on {pathlib.Path(args.unix).resolve()}")
+        else:
+            port = await server.start_http(port=args.port)
+            print(f"Listening on http://127.0.0.1:{port}/indicators")
+        if args.replay is not None:
+            await server.run_feed(
+                {symbol: replay(path, args.replay) for symbol, path in paths.items()}
+            )
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
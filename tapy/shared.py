@@ -0,0 +1,216 @@
+"""
+Zero-copy export of indicator columns to other processes.
+
+Columns can be published into a named shared memory block:
+
+    >>> block = SharedColumns.create(i.df, ["sma", "cci"], name="eurusd")
+    >>> # in another process
+    >>> block = SharedColumns.attach("eurusd")
+    >>> block.arrays["cci"]  # numpy view of the shared memory
+
+serialized into bytes with the same layout, e.g. for a network response:
+
+    >>> payload = pack_columns(i.df, ["sma", "cci"])
+    >>> unpack_columns(payload)["cci"]  # numpy view of payload
+
+or written as an Arrow IPC file/stream (requires ``pyarrow``), which is
+read back memory-mapped:
+
+    >>> write_arrow(i.df, "eurusd.arrow", ["sma", "cci"])
+    >>> table = read_arrow("eurusd.arrow")
+
+The shared memory block starts with an 8 byte little-endian header size
+followed by a JSON header with the length and the name, dtype and offset of
+every column. Column data follows the header, 64-byte aligned, and the
+offsets are relative to its start.
+"""
+
+import json
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .indicators import Indicators
+
+ALIGNMENT = 64
+
+# Blocks created by this process, they stay registered for unlinking
+_created = set()
+
+
+def _columns(data, columns):
+    if isinstance(data, Indicators):
+        data = data.df
+    if columns is None:
+        columns = list(data.keys())
+    return {name: np.asarray(data[name]) for name in columns}
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _layout(arrays):
+    """Return the header, the encoded header and the total size of the
+    layout of arrays."""
+    length = len(next(iter(arrays.values()))) if arrays else 0
+    header = {"length": length, "columns": []}
+    offset = 0
+    for column, arr in arrays.items():
+        if arr.dtype == object:
+            raise TypeError(f"Column {column!r} has object dtype")
+        header["columns"].append(
+            {"name": column, "dtype": arr.dtype.str, "offset": offset}
+        )
+        offset = _align(offset + arr.nbytes)
+    encoded = json.dumps(header).encode()
+    return header, encoded, _align(8 + len(encoded)) + offset
+
+
+def _views(buffer, header, data_offset):
+    return {
+        column["name"]: np.ndarray(
+            header["length"],
+            dtype=np.dtype(column["dtype"]),
+            buffer=buffer,
+            offset=data_offset + column["offset"],
+        )
+        for column in header["columns"]
+    }
+
+
+def pack_columns(data, columns=None):
+    """Serialize columns into bytes with the layout of the shared memory
+    blocks.
+
+    :param data: data frame, ``Indicators`` or dict of arrays
+    :param list columns: Column names, default: all columns
+    :return: bytearray
+    """
+    arrays = _columns(data, columns)
+    header, encoded, size = _layout(arrays)
+    buffer = bytearray(size)
+    buffer[:8] = struct.pack("<Q", len(encoded))
+    buffer[8 : 8 + len(encoded)] = encoded
+    for name, arr in _views(buffer, header, _align(8 + len(encoded))).items():
+        arr[:] = arrays[name]
+    return buffer
+
+
+def unpack_columns(buffer):
+    """Read columns serialized by ``pack_columns`` without copying them.
+
+    :return: dict of numpy arrays, views of buffer
+    """
+    (size,) = struct.unpack("<Q", buffer[:8])
+    header = json.loads(bytes(buffer[8 : 8 + size]))
+    return _views(buffer, header, _align(8 + size))
+
+
+class SharedColumns:
+    """Columns stored in a named shared memory block."""
+
+    def __init__(self, shm, header, data_offset):
+        self.shm = shm
+        self.header = header
+        self.arrays = _views(shm.buf, header, data_offset)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @classmethod
+    def create(cls, data, columns=None, name=None):
+        """Create a block and copy the columns into it.
+
+        :param data: data frame, ``Indicators`` or dict of arrays
+        :param list columns: Column names, default: all columns
+        :param str name: Block name, default: a random name
+        :return: SharedColumns
+        """
+        arrays = _columns(data, columns)
+        header, encoded, size = _layout(arrays)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        _created.add(shm.name)
+        shm.buf[:8] = struct.pack("<Q", len(encoded))
+        shm.buf[8 : 8 + len(encoded)] = encoded
+        block = cls(shm, header, _align(8 + len(encoded)))
+        block.write(arrays)
+        return block
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a block created by another process.
+
+        :param str name: Block name
+        :return: SharedColumns
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Only the creator should unlink the block at exit
+            if shm.name not in _created:
+                resource_tracker.unregister(shm._name, "shared_memory")
+        (size,) = struct.unpack("<Q", shm.buf[:8])
+        header = json.loads(bytes(shm.buf[8 : 8 + size]))
+        return cls(shm, header, _align(8 + size))
+
+    def write(self, data):
+        """Copy new values of the same length into the block's columns
+        present in data (data frame, ``Indicators`` or dict of arrays)."""
+        if isinstance(data, Indicators):
+            data = data.df
+        for name, arr in self.arrays.items():
+            if name in data:
+                arr[:] = data[name]
+
+    def close(self):
+        """Release the views and close the block in this process."""
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self):
+        """Destroy the block, should be called once by its creator."""
+        _created.discard(self.shm.name)
+        self.shm.unlink()
+
+
+def _table(data, columns):
+    import pyarrow as pa
+
+    arrays = _columns(data, columns)
+    return pa.table({name: pa.array(arr) for name, arr in arrays.items()})
+
+
+def write_arrow(data, sink, columns=None, stream=False):
+    """Write columns in Arrow IPC file format, or stream format when
+    ``stream`` is True.
+
+    :param data: data frame, ``Indicators`` or dict of arrays
+    :param sink: Path or writable pyarrow sink
+    :param list columns: Column names, default: all columns
+    """
+    import pyarrow as pa
+
+    table = _table(data, columns)
+    new = pa.ipc.new_stream if stream else pa.ipc.new_file
+    with new(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_arrow(source, stream=False):
+    """Read an Arrow IPC file or stream without copying the column data.
+    Paths are memory-mapped.
+
+    :return: pyarrow Table, ``column.to_numpy()`` gives numpy views
+    """
+    import pyarrow as pa
+
+    if isinstance(source, str) or hasattr(source, "__fspath__"):
+        source = pa.memory_map(str(source))
+    if stream:
+        return pa.ipc.open_stream(source).read_all()
+    return pa.ipc.open_file(source).read_all()
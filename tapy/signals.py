@@ -0,0 +1,170 @@
+"""
+Vectorized signal detection over indicator columns.
+
+A signal rule compares a left column with a right operand, which is a
+column, a number, or a list of columns (their maximum for ``above`` rules
+and their minimum for ``below`` rules, e.g. the Ichimoku cloud, skipping the
+columns that are NaN at a bar):
+
+    >>> rules = [
+    ...     cross_above("macd_value", "macd_signal"),
+    ...     cross_below("alligator_lips", "alligator_jaws"),
+    ...     above("High", "bollinger_top"),
+    ...     cross_above("Close", ["senkou_span_a", "senkou_span_b"]),
+    ...     cross_above("cci", 100),
+    ... ]
+    >>> events = scan({"EURUSD": i.df, "GBPUSD": j.df}, rules)
+    >>> events[events["signal"] == 0]["bar"]  # MACD crosses of all symbols
+
+All rules are evaluated on all symbols at once, and only the bars where a
+rule fires are returned.
+"""
+
+import collections
+
+import numpy as np
+
+from .indicators import Indicators
+
+Rule = collections.namedtuple("Rule", ["name", "kind", "left", "right"])
+
+KINDS = ("cross_above", "cross_below", "above", "below")
+
+EVENT_DTYPE = np.dtype([("symbol", np.int32), ("bar", np.int64), ("signal", np.int32)])
+
+
+def _rule(kind, left, right, name):
+    if isinstance(right, list):
+        right = tuple(right)
+    if name is None:
+        right_name = "|".join(right) if isinstance(right, tuple) else right
+        name = f"{left} {kind} {right_name}"
+    return Rule(name, kind, left, right)
+
+
+def cross_above(left, right, name=None):
+    """Fire on the bar where ``left`` moves from ``<= right`` to ``> right``."""
+    return _rule("cross_above", left, right, name)
+
+
+def cross_below(left, right, name=None):
+    """Fire on the bar where ``left`` moves from ``>= right`` to ``< right``."""
+    return _rule("cross_below", left, right, name)
+
+
+def above(left, right, name=None):
+    """Fire on every bar where ``left >= right``, e.g. a band touch."""
+    return _rule("above", left, right, name)
+
+
+def below(left, right, name=None):
+    """Fire on every bar where ``left <= right``."""
+    return _rule("below", left, right, name)
+
+
+def _frames(frames):
+    if isinstance(frames, dict):
+        frames = list(frames.values())
+    elif not isinstance(frames, (list, tuple)):
+        frames = [frames]
+    return [f.df if isinstance(f, Indicators) else f for f in frames]
+
+
+def _columns(rules):
+    columns = []
+    for rule in rules:
+        if rule.kind not in KINDS:
+            raise ValueError(f'The "kind" can be only one of {", ".join(KINDS)}')
+        operands = [rule.left]
+        if isinstance(rule.right, tuple):
+            operands.extend(rule.right)
+        elif isinstance(rule.right, str):
+            operands.append(rule.right)
+        columns.extend(c for c in operands if c not in columns)
+    return columns
+
+
+def _evaluate(values, first, rules, columns):
+    """Return a (bars x rules) boolean matrix of fired rules."""
+    position = {column: k for k, column in enumerate(columns)}
+    n = len(values)
+    left = values[:, [position[rule.left] for rule in rules]]
+    right = np.empty((n, len(rules)))
+    for k, rule in enumerate(rules):
+        if isinstance(rule.right, tuple):
+            group = values[:, [position[c] for c in rule.right]]
+            if rule.kind in ("cross_above", "above"):
+                np.fmax.reduce(group, axis=1, out=right[:, k])
+            else:
+                np.fmin.reduce(group, axis=1, out=right[:, k])
+        elif isinstance(rule.right, str):
+            right[:, k] = values[:, position[rule.right]]
+        else:
+            right[:, k] = rule.right
+    diff = np.subtract(left, right, out=left)
+
+    kinds = np.array([rule.kind for rule in rules])
+    fired = np.zeros((n, len(rules)), dtype=bool)
+    for kind, now, before in (
+        ("above", diff >= 0, None),
+        ("below", diff <= 0, None),
+        ("cross_above", diff[1:] > 0, diff[:-1] <= 0),
+        ("cross_below", diff[1:] < 0, diff[:-1] >= 0),
+    ):
+        selected = kinds == kind
+        if not selected.any():
+            continue
+        if before is None:
+            fired[:, selected] = now[:, selected]
+        else:
+            fired[1:, selected] = now[:, selected] & before[:, selected]
+            # A cross needs the previous bar of the same symbol
+            fired[first, np.flatnonzero(selected)[:, None]] = False
+    return fired
+
+
+def scan(frames, rules, chunk_bars=1_000_000):
+    """Evaluate signal rules on one or many data frames.
+
+    :param frames: data frame, ``Indicators`` or a list/dict of them
+        (one per symbol)
+    :param list rules: Rules made by ``cross_above``, ``cross_below``,
+        ``above`` and ``below``
+    :param int chunk_bars: Approximate number of bars evaluated at once,
+        limits memory use for large universes
+    :return: numpy structured array with ``symbol`` (position in
+        ``frames``), ``bar`` (row position in the frame) and ``signal``
+        (position in ``rules``) fields, ordered by symbol and bar
+    """
+    frames = _frames(frames)
+    rules = list(rules)
+    columns = _columns(rules)
+    events = []
+
+    start = 0
+    while start < len(frames):
+        stop, bars = start, 0
+        while stop < len(frames) and (stop == start or bars < chunk_bars):
+            bars += len(frames[stop])
+            stop += 1
+        chunk = [f[columns].to_numpy(dtype=float) for f in frames[start:stop]]
+        lengths = np.array([len(values) for values in chunk])
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        first = offsets[lengths > 0]
+
+        fired = _evaluate(np.concatenate(chunk), first, rules, columns)
+        rows, signal = np.nonzero(fired)
+        # Empty frames share their offset with the next frame, "right"
+        # picks the frame the row belongs to
+        symbol = np.searchsorted(offsets, rows, side="right") - 1
+
+        chunk_events = np.empty(len(rows), dtype=EVENT_DTYPE)
+        chunk_events["symbol"] = symbol + start
+        chunk_events["bar"] = rows - offsets[symbol]
+        chunk_events["signal"] = signal
+        events.append(chunk_events)
+        start = stop
+
+    if not events:
+        return np.empty(0, dtype=EVENT_DTYPE)
+    return np.concatenate(events)
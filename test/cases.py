@@ -0,0 +1,76 @@
+"""(method, kwargs, output columns) for every indicator with default column
+names, shared by the tests comparing alternative code paths."""
+
+CASES = [
+    ("sma", {}, ["sma"]),
+    ("smma", {}, ["smma"]),
+    ("ema", {}, ["ema"]),
+    ("lwma", {}, ["lwma"]),
+    ("alma", {}, ["alma"]),
+    ("awesome_oscillator", {}, ["ao"]),
+    ("accelerator_oscillator", {}, ["ac"]),
+    ("accumulation_distribution", {}, ["a/d"]),
+    (
+        "alligator",
+        {},
+        ["alligator_jaws", "alligator_teeth", "alligator_lips"],
+    ),
+    ("atr", {}, ["atr"]),
+    ("bears_power", {}, ["bears_power"]),
+    (
+        "bollinger_bands",
+        {},
+        ["bollinger_top", "bollinger_mid", "bollinger_bottom"],
+    ),
+    ("bulls_power", {}, ["bulls_power"]),
+    (
+        "linear_regression",
+        {},
+        ["lr_slope", "lr_intercept", "lr_r2", "lr_forecast", "lr_top", "lr_bottom"],
+    ),
+    ("cci", {}, ["cci"]),
+    ("cci", {"method": "median", "period": 20}, ["cci"]),
+    ("de_marker", {}, ["dem"]),
+    ("force_index", {"method": "sma"}, ["frc"]),
+    ("force_index", {"method": "smma"}, ["frc"]),
+    ("force_index", {"method": "ema"}, ["frc"]),
+    ("force_index", {"method": "lwma"}, ["frc"]),
+    ("fractals", {}, ["fractals_high", "fractals_low"]),
+    ("gator", {}, ["value1", "value2"]),
+    (
+        "ichimoku_kinko_hyo",
+        {},
+        ["tenkan_sen", "kijun_sen", "senkou_span_a", "senkou_span_b", "chikou_span"],
+    ),
+    ("bw_mfi", {}, ["bw_mfi"]),
+    ("momentum", {}, ["momentum"]),
+    ("mfi", {}, ["mfi"]),
+    ("macd", {}, ["macd_value", "macd_signal"]),
+    ("rsi", {}, ["rsi"]),
+    ("wilder_atr", {}, ["wilder_atr"]),
+    ("adx", {}, ["adx", "plus_di", "minus_di"]),
+    (
+        "wilder_suite",
+        {},
+        ["rsi", "adx", "plus_di", "minus_di", "wilder_atr"],
+    ),
+    ("oscillators", {}, ["mfi", "dem", "momentum", "bw_mfi"]),
+    (
+        "bill_williams",
+        {},
+        [
+            "ao",
+            "ac",
+            "alligator_jaws",
+            "alligator_teeth",
+            "alligator_lips",
+            "value1",
+            "value2",
+            "fractals_high",
+            "fractals_low",
+            "bw_mfi",
+            "ao_colour",
+            "ac_colour",
+        ],
+    ),
+]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.bars import BarAggregator, dollar_bars, tick_bars, time_bars, volume_bars
+
+
+@pytest.fixture()
+def ticks():
+    rng = np.random.default_rng(0)
+    n = 10_000
+    timestamp = np.datetime64("2019-02-15T14:00") + np.cumsum(
+        rng.integers(1, 5_000, n)
+    ).astype("timedelta64[ms]")
+    price = 1.12 + np.cumsum(rng.normal(0, 1e-5, n))
+    size = rng.integers(1, 100, n)
+    return timestamp, price, size
+
+
+def test_time_bars(ticks):
+    timestamp, price, size = ticks
+    bars = time_bars(timestamp, price, size, "1h", chunk_size=777)
+
+    df = pd.DataFrame({"price": price, "size": size}, index=timestamp)
+    expected = df["price"].resample("1h").ohlc().dropna()
+    np.testing.assert_array_equal(bars["Timestamp"], expected.index)
+    np.testing.assert_array_equal(bars["Open"], expected["open"])
+    np.testing.assert_array_equal(bars["High"], expected["high"])
+    np.testing.assert_array_equal(bars["Low"], expected["low"])
+    np.testing.assert_array_equal(bars["Close"], expected["close"])
+    assert bars["Volume"].sum() == size.sum()
+
+    i = Indicators(bars)
+    i.sma()
+    assert "sma" in i.df
+
+
+def test_tick_bars(ticks):
+    timestamp, price, size = ticks
+    bars = tick_bars(timestamp, price, size, 100, chunk_size=333)
+    assert len(bars) == 100
+    assert (bars["Ticks"] == 100).all()
+    assert bars["High"].iloc[3] == price[300:400].max()
+    assert bars["Close"].iloc[-1] == price[-1]
+
+
+@pytest.mark.parametrize("chunk_size", [50, 1_000, 100_000])
+def test_volume_and_dollar_bars(ticks, chunk_size):
+    timestamp, price, size = ticks
+    bars = volume_bars(timestamp, price, size, 5_000, chunk_size=chunk_size)
+    cumulative = np.cumsum(size)
+    closes = np.searchsorted(cumulative, np.arange(5_000, cumulative[-1], 5_000))
+    np.testing.assert_array_equal(bars["Close"].iloc[:-1], price[np.unique(closes)])
+    assert bars["Ticks"].sum() == len(price)
+
+    bars = dollar_bars(timestamp, price, size, 5_000, chunk_size=chunk_size)
+    assert bars["Volume"].sum() == size.sum()
+
+
+@pytest.mark.parametrize("chunk_size", [13, 1_000])
+def test_bars_spanning_chunks(ticks, chunk_size):
+    timestamp, price, size = ticks
+    for make, threshold in ((time_bars, "1h"), (tick_bars, 1_000)):
+        bars = make(timestamp, price, size, threshold, chunk_size=chunk_size)
+        expected = make(timestamp, price, size, threshold, chunk_size=len(price))
+        pd.testing.assert_frame_equal(bars, expected)
+        assert bars.index.equals(pd.RangeIndex(len(bars)))
+
+
+def test_aggregator_errors():
+    with pytest.raises(ValueError):
+        BarAggregator("range", 10)
+    with pytest.raises(ValueError):
+        BarAggregator("tick", 0)
@@ -0,0 +1,81 @@
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.cli import load_spec, main
+
+SPEC = {
+    "indicators": [
+        {"method": "sma", "period": 5},
+        {"method": "macd", "column_name_value": "macd"},
+    ]
+}
+
+
+@pytest.fixture()
+def inputs(tmp_path):
+    paths = []
+    for name in ("a.csv", "b.csv"):
+        path = tmp_path / "in" / name
+        path.parent.mkdir(exist_ok=True)
+        shutil.copy("EURUSD60.csv", path)
+        paths.append(str(path))
+    return paths
+
+
+def test_cli(tmp_path, inputs, capsys):
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    output = tmp_path / "out"
+
+    assert main([str(spec), *inputs, "-o", str(output), "-j", "2"]) == 0
+    assert "2 computed, 0 skipped, 7456 bars" in capsys.readouterr().out
+
+    expected = Indicators(pd.read_csv("EURUSD60.csv"))
+    expected.sma(period=5)
+    result = pd.read_csv(output / "a.csv")
+    assert result["sma"].iloc[-1] == pytest.approx(expected.df["sma"].iloc[-1])
+    assert "macd" in result
+
+    main([str(spec), *inputs, "-o", str(output)])
+    assert "0 computed, 2 skipped" in capsys.readouterr().out
+
+    with open(inputs[1], "a") as f:
+        f.write("2019.09.20,21:00,1.10167,1.10200,1.10150,1.10190,1000\n")
+    main([str(spec), *inputs, "-o", str(output)])
+    assert "1 computed, 1 skipped" in capsys.readouterr().out
+
+
+def test_cli_same_names(tmp_path):
+    inputs = []
+    for directory, rows in (("eurusd", 100), ("gbpusd", 200)):
+        path = tmp_path / "in" / directory / "H1.csv"
+        path.parent.mkdir(parents=True)
+        pd.read_csv("EURUSD60.csv").iloc[:rows].to_csv(path, index=False)
+        inputs.append(str(path))
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    output = tmp_path / "out"
+
+    main([str(spec), *inputs, "-o", str(output), "-j", "1"])
+    assert len(pd.read_csv(output / "eurusd" / "H1.csv")) == 100
+    assert len(pd.read_csv(output / "gbpusd" / "H1.csv")) == 200
+    manifest = json.loads((output / "tapy-manifest.json").read_text())
+    assert sorted(entry["output"] for entry in manifest.values()) == [
+        "eurusd/H1.csv",
+        "gbpusd/H1.csv",
+    ]
+
+
+def test_load_spec(tmp_path):
+    spec = tmp_path / "spec.yaml"
+    spec.write_text("indicators:\n  - method: cci\n    period: 20\n")
+    pytest.importorskip("yaml")
+    assert load_spec(spec) == {"indicators": [{"method": "cci", "period": 20}]}
+
+    spec.write_text("indicators:\n  - method: _values\n")
+    with pytest.raises(SystemExit):
+        load_spec(spec)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy.cross import RollingMoments, rolling_beta, rolling_cov
+
+WINDOW = 20
+
+
+@pytest.fixture()
+def prices():
+    # Large prices check the cancellation of the sums of products
+    rng = np.random.default_rng(0)
+    return 1000 + rng.standard_normal((300, 6)).cumsum(axis=0)
+
+
+def expected(prices, method):
+    rolling = getattr(pd.DataFrame(prices).rolling(WINDOW), method)()
+    return rolling.to_numpy().reshape(len(prices), prices.shape[1], -1)
+
+
+@pytest.mark.parametrize("chunk_bars", [7, 64, None])
+@pytest.mark.parametrize("corr", [False, True])
+def test_rolling_cov(prices, corr, chunk_bars):
+    chunks = list(rolling_cov(prices, WINDOW, corr=corr, chunk_bars=chunk_bars))
+    assert [start for start, _ in chunks] == list(
+        range(0, len(prices), chunk_bars or len(prices))
+    )
+    matrices = np.concatenate([matrices for _, matrices in chunks])
+    np.testing.assert_allclose(
+        matrices, expected(prices, "corr" if corr else "cov"), rtol=1e-9, atol=1e-9
+    )
+
+
+def test_rolling_beta(prices):
+    cov = expected(prices, "cov")
+    beta = rolling_beta(prices, prices[:, 2], WINDOW)
+    assert beta.shape == prices.shape
+    assert np.isnan(beta[: WINDOW - 1]).all()
+    np.testing.assert_allclose(
+        beta, cov[:, :, 2] / cov[:, 2:3, 2], rtol=1e-9, atol=1e-9
+    )
+
+
+def test_rolling_moments(prices):
+    cov = expected(prices, "cov")
+    corr = expected(prices, "corr")
+    moments = RollingMoments(prices.shape[1], WINDOW)
+    out = np.empty(prices.shape[1])
+    for bar, row in enumerate(prices):
+        moments.update(row)
+        if bar < WINDOW - 1:
+            assert np.isnan(moments.cov()).all()
+            continue
+        np.testing.assert_allclose(moments.cov(), cov[bar], rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(moments.corr(), corr[bar], rtol=1e-9, atol=1e-9)
+        assert moments.beta(0, out) is out
+        np.testing.assert_allclose(
+            out, cov[bar, :, 0] / cov[bar, 0, 0], rtol=1e-9, atol=1e-9
+        )
+
+
+def test_nan(prices):
+    # Returns start with a NaN, and one series misses a bar later
+    returns = pd.DataFrame(prices).pct_change().to_numpy(copy=True)
+    returns[100, 3] = np.nan
+    rolling = pd.DataFrame(returns).rolling(WINDOW)
+    cov = rolling.cov().to_numpy().reshape(len(returns), returns.shape[1], -1)
+    corr = rolling.corr().to_numpy().reshape(cov.shape)
+    assert np.isnan(cov[100 : 100 + WINDOW, 3]).all()
+    assert np.isfinite(cov[100 + WINDOW :]).all()
+
+    beta = rolling_beta(returns, returns[:, 2], WINDOW)
+    np.testing.assert_allclose(beta, cov[:, :, 2] / cov[:, 2:3, 2], rtol=1e-9)
+    assert np.isnan(beta[:WINDOW]).all()
+    matrices = np.concatenate(
+        [m for _, m in rolling_cov(returns, WINDOW, chunk_bars=64)]
+    )
+    np.testing.assert_allclose(matrices, cov, rtol=1e-9, atol=1e-12)
+    matrices = np.concatenate([m for _, m in rolling_cov(returns, WINDOW, corr=True)])
+    np.testing.assert_allclose(matrices, corr, rtol=1e-9, atol=1e-12)
+
+    moments = RollingMoments(returns.shape[1], WINDOW)
+    for bar, row in enumerate(returns):
+        moments.update(row)
+        np.testing.assert_allclose(moments.cov(), cov[bar], rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(
+            moments.beta(3), cov[bar, :, 3] / cov[bar, 3, 3], rtol=1e-9
+        )
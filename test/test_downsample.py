@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.downsample import downsample, lttb, minmax
+from tapy.indicators import output_columns
+
+
+def reference_lttb(y, threshold):
+    """Straightforward Largest-Triangle-Three-Buckets."""
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    a, rows = 0, [0]
+    for i in range(threshold - 2):
+        start, stop = int(i * every) + 1, int((i + 1) * every) + 1
+        next_stop = min(int((i + 2) * every) + 1, n)
+        mean_x = np.arange(stop, next_stop).mean()
+        mean_y = y[stop:next_stop].mean()
+        x = np.arange(start, stop)
+        area = np.abs((a - mean_x) * (y[start:stop] - y[a]) - (a - x) * (mean_y - y[a]))
+        a = start + int(np.argmax(area))
+        rows.append(a)
+    return np.array([*rows, n - 1])
+
+
+@pytest.fixture()
+def walk():
+    return np.random.default_rng(0).standard_normal(10_007).cumsum()
+
+
+def test_lttb(walk):
+    np.testing.assert_array_equal(lttb(walk, 500), reference_lttb(walk, 500))
+    np.testing.assert_array_equal(lttb(walk[:10], 20), np.arange(10))
+
+
+def test_minmax(walk):
+    rows = minmax(walk, 100)
+    assert rows[0] == 0 and rows[-1] == len(walk) - 1
+    assert len(rows) <= 102
+    edges = (np.arange(1, 50) * (len(walk) / 50)).astype(int)
+    for bucket in np.split(walk, edges):
+        assert bucket.min() in walk[rows] and bucket.max() in walk[rows]
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_group(indicators: Indicators, method):
+    indicators.alligator()
+    lines = output_columns("alligator", {})
+    chart = downsample(indicators, lines, 200, method=method)
+    assert list(chart.columns) == lines
+    assert len(chart) <= 202
+    assert chart.index.is_monotonic_increasing
+    # The lines share the rows of the data frame
+    pd.testing.assert_frame_equal(chart, indicators.df.loc[chart.index, lines])
+
+
+def test_downsample_x(indicators: Indicators):
+    df = indicators.df
+    df["Datetime"] = pd.to_datetime(
+        df["Date"] + " " + df["Time"], format="%Y.%m.%d %H:%M"
+    )
+    indicators.cci()
+    chart = downsample(df, "cci", 300, x="Datetime")
+    assert list(chart.columns) == ["Datetime", "cci"]
+    assert len(chart) == 300
+    arrays = downsample({"cci": df["cci"].to_numpy()}, ["cci"], 300, method="minmax")
+    assert set(arrays) == {"cci"}
+    with pytest.raises(ValueError):
+        downsample(df, "cci", 300, method="blah")
+
+
+def test_downsample_polars(indicators: Indicators):
+    pl = pytest.importorskip("polars")
+    indicators.macd()
+    lines = output_columns("macd", {})
+    expected = downsample(indicators, lines, 100)
+    chart = downsample(pl.from_pandas(indicators.df), lines, 100)
+    np.testing.assert_array_equal(chart.to_numpy(), expected.to_numpy())
@@ -0,0 +1,97 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+
+SPECS = [
+    "rsi",
+    ("sma", {"period": 10, "apply_to": ["Open", "Close"]}),
+    "macd",
+    "fractals",
+    "bollinger_bands",
+]
+NAMES = [
+    "rsi",
+    "sma_Open",
+    "sma_Close",
+    "macd_value",
+    "macd_signal",
+    "fractals_high",
+    "fractals_low",
+    "bollinger_top",
+    "bollinger_mid",
+    "bollinger_bottom",
+]
+
+
+def expected_columns(df):
+    expected = Indicators(df.copy())
+    for spec in SPECS:
+        method, kwargs = (spec, {}) if isinstance(spec, str) else spec
+        getattr(expected, method)(**kwargs)
+    return expected.df[NAMES].to_numpy(dtype=float)
+
+
+def test_features_matrix(indicators: Indicators):
+    expected = expected_columns(indicators.df)
+    values, names, warmup = indicators.features(SPECS)
+    assert names == NAMES
+    assert values.dtype == np.float32 and values.flags.c_contiguous
+    assert warmup == 19
+    assert np.isnan(values[:warmup]).all()
+    np.testing.assert_allclose(values[warmup:], expected[warmup:], rtol=1e-6)
+    assert list(indicators.df.columns)[-1] == "Volume"
+
+
+def test_features_zscore(indicators: Indicators):
+    features = indicators.features(["rsi", "cci"], zscore=50)
+    df = indicators.df.copy()
+    Indicators(df).rsi()
+    rsi = df["rsi"]
+    zscore = (rsi - rsi.rolling(50).mean()) / rsi.rolling(50).std(ddof=0)
+    assert features.warmup == 63
+    np.testing.assert_allclose(
+        features.values[63:, 0], zscore.to_numpy()[63:], rtol=1e-5, atol=1e-5
+    )
+
+
+def test_features_out():
+    df = pd.concat([pd.read_csv("EURUSD60.csv")] * 5, ignore_index=True)
+    i = Indicators(df)
+    out = np.empty((len(df), len(NAMES)), dtype=np.float32)
+    assert i.features(SPECS, out=out, zscore=100).values is out
+    tracemalloc.start()
+    i.features(SPECS, out=out, zscore=100)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Far less than a single float32 column
+    assert peak < len(df) * 4 / 2
+    with pytest.raises(ValueError):
+        i.features(SPECS, out=np.empty((len(NAMES), len(df)), dtype=np.float32).T)
+
+
+def test_features_recursive():
+    # MACD, RSI and ADX go through the vectorized EMA and Wilder smoothings
+    df = pd.concat([pd.read_csv("EURUSD60.csv")] * 3, ignore_index=True)
+    specs = ["macd", "rsi", "adx", "alligator"]
+    values, names, warmup = Indicators(df).features(specs, dtype=np.float64)
+    expected = Indicators(df.copy())
+    for method in specs:
+        getattr(expected, method)()
+    expected = expected.df[names].to_numpy()
+    np.testing.assert_allclose(
+        values[warmup:], expected[warmup:], rtol=1e-12, atol=1e-12
+    )
+
+
+def test_features_polars_lazy():
+    pl = pytest.importorskip("polars")
+    df = pd.read_csv("EURUSD60.csv")
+    features = Indicators(pl.scan_csv("EURUSD60.csv")).features(SPECS)
+    expected = expected_columns(df)
+    np.testing.assert_allclose(
+        features.values[features.warmup :], expected[features.warmup :], rtol=1e-6
+    )
@@ -0,0 +1,87 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.feed import LiveFeed, _Window, replay
+from tapy.indicators import lookback
+
+
+def test_live_feed():
+    df = pd.read_csv("EURUSD60.csv").iloc[:120]
+    feed = LiveFeed([("sma", {"period": 5}), ("cci", {})], window=60)
+    subscription = feed.subscribe(maxsize=2)
+
+    async def main():
+        task = asyncio.create_task(
+            feed.run({"EURUSD": replay(df), "EURUSD_2": replay(df.iloc[:80])})
+        )
+        received = [item async for item in subscription]
+        await task
+        return received
+
+    received = asyncio.run(main())
+
+    assert len(received) == 200
+    symbols = [symbol for symbol, _, _ in received]
+    assert symbols.count("EURUSD") == 120
+
+    expected = Indicators(df.iloc[-60:].reset_index(drop=True))
+    expected.sma(period=5)
+    expected.cci()
+    values = feed.values["EURUSD"]
+    assert values["sma"] == expected.df["sma"].iloc[-1]
+    assert values["cci"] == expected.df["cci"].iloc[-1]
+
+
+def test_live_feed_replays_csv():
+    feed = LiveFeed([("momentum", {"period": 3})], window=10)
+
+    async def first_bars(bars, n):
+        async for bar in bars:
+            if n == 0:
+                return
+            n -= 1
+            yield bar
+
+    asyncio.run(feed.run({"EURUSD": first_bars(replay("EURUSD60.csv"), 20)}))
+
+    expected = Indicators(pd.read_csv("EURUSD60.csv").iloc[10:20])
+    expected.momentum(period=3)
+    assert feed.values["EURUSD"]["momentum"] == expected.df["momentum"].iloc[-1]
+
+
+def test_live_feed_window_covers_warmup():
+    df = pd.read_csv("EURUSD60.csv").iloc[:800]
+    indicators = [("smma", {"period": 14}), ("rsi", {}), ("sma", {"period": 5})]
+    feed = LiveFeed(indicators)
+    assert feed.window == max(lookback(*item) for item in indicators) > 300
+
+    asyncio.run(feed.run({"EURUSD": replay(df)}))
+
+    assert len(feed.bars["EURUSD"]) == feed.window
+    expected = Indicators(df)
+    expected.smma(period=14)
+    expected.rsi()
+    expected.sma(period=5)
+    for column in ("smma", "rsi", "sma"):
+        np.testing.assert_allclose(
+            feed.values["EURUSD"][column], expected.df[column].iloc[-1], rtol=1e-9
+        )
+
+
+def test_live_feed_window_required():
+    with pytest.raises(ValueError, match="window"):
+        LiveFeed([("accumulation_distribution", {})])
+
+
+def test_live_feed_window_dtype():
+    window = _Window(3)
+    window.append({"Close": 1, "Volume": 10, "Symbol": "EURUSD"})
+    window.append({"Close": 1.5, "Volume": 10.25, "Symbol": "EURUSD"})
+    frame = window.frame()
+    assert frame["Close"].tolist() == [1.0, 1.5]
+    assert frame["Volume"].tolist() == [10.0, 10.25]
+    assert frame["Symbol"].tolist() == ["EURUSD", "EURUSD"]
@@ -0,0 +1,21 @@
+import numpy as np
+
+from tapy import Indicators
+from tapy.incremental import WilderState
+
+
+def test_wilder_state_matches_batch(indicators: Indicators):
+    indicators.wilder_suite(period=14)
+    df = indicators.df
+    state = WilderState(period=14)
+    rows = [
+        state.update(high, low, close)
+        for high, low, close in zip(df["High"], df["Low"], df["Close"])
+    ]
+    values = np.array(rows)
+    for k, column in enumerate(["rsi", "adx", "plus_di", "minus_di", "wilder_atr"]):
+        np.testing.assert_allclose(
+            values[:, k], df[column].to_numpy(), rtol=1e-9, atol=1e-12
+        )
+    assert np.isnan(values[:14]).all()
+    assert np.isnan(values[:27, 1]).all() and not np.isnan(values[27, 1])
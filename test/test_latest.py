@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.indicators import lookback
+
+from .cases import CASES
+
+
+@pytest.mark.parametrize("method, kwargs, columns", CASES)
+def test_latest_matches_columns(method, kwargs, columns):
+    df = pd.read_csv("EURUSD60.csv")
+    expected = Indicators(df.copy())
+    getattr(expected, method)(**kwargs)
+
+    i = Indicators(df)
+    last = i.latest([(method, kwargs)])
+    tail = i.latest([(method, kwargs)], bars=3)
+    assert list(i.df.columns) == list(df.columns)
+    for column in columns:
+        values = expected.df[column].to_numpy(dtype=float, na_value=np.nan)
+        assert isinstance(last[column], (float, bool))
+        np.testing.assert_allclose(last[column], values[-1], rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(tail[column], values[-3:], rtol=1e-9, atol=1e-9)
+
+
+def test_latest_reads_only_lookback(indicators: Indicators):
+    assert lookback("sma", {"period": 20}) == 20
+    assert lookback("ema", {"period": 5}) < lookback("ema", {"period": 20})
+    assert lookback("accumulation_distribution", {}) is None
+
+    # Changing bars before the look-back does not change the result
+    expected = indicators.latest(["cci", "atr", "bollinger_bands"])
+    indicators.df.loc[: len(indicators.df) - 30, ["High", "Low", "Close"]] = 0.0
+    assert indicators.latest(["cci", "atr", "bollinger_bands"]) == pytest.approx(
+        expected, rel=1e-12
+    )
+
+
+def test_latest_polars_lazy():
+    pl = pytest.importorskip("polars")
+    expected = Indicators(pd.read_csv("EURUSD60.csv"))
+    expected.macd()
+    result = Indicators(pl.scan_csv("EURUSD60.csv")).latest(["macd"])
+    assert result["macd_value"] == pytest.approx(
+        expected.df["macd_value"].iloc[-1], rel=1e-9
+    )
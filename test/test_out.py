@@ -0,0 +1,91 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators, kernels
+
+from .cases import CASES
+
+
+def make_out(columns, n):
+    arrays = tuple(
+        np.empty(n, dtype=bool if column.startswith("fractals") else float)
+        for column in columns
+    )
+    return arrays[0] if len(arrays) == 1 else arrays
+
+
+@pytest.mark.parametrize("method, kwargs, columns", CASES)
+def test_out_matches_columns(method, kwargs, columns):
+    df = pd.read_csv("EURUSD60.csv")
+    expected = Indicators(df.copy())
+    getattr(expected, method)(**kwargs)
+
+    out = make_out(columns, len(df))
+    i = Indicators(df)
+    result = getattr(i, method)(out=out, **kwargs)
+    if isinstance(out, tuple):
+        assert all(a is b for a, b in zip(result, out))
+    else:
+        assert result is out
+    assert list(i.df.columns) == list(df.columns)
+
+    arrays = out if isinstance(out, tuple) else (out,)
+    for column, arr in zip(columns, arrays):
+        left = expected.df[column].to_numpy(dtype=arr.dtype, na_value=np.nan)
+        np.testing.assert_allclose(arr, left, rtol=1e-9, atol=1e-9)
+
+
+def test_out_wrong_shape(indicators: Indicators):
+    with pytest.raises(ValueError):
+        indicators.sma(out=np.empty(3))
+
+
+@pytest.mark.parametrize("method, kwargs, columns", CASES)
+def test_out_reuses_buffers(method, kwargs, columns):
+    df = pd.concat([pd.read_csv("EURUSD60.csv")] * 6, ignore_index=True)
+    n = 20000
+    i = Indicators(df.iloc[:n])
+    out = make_out(columns, n)
+
+    def step(start):
+        i.df = df.iloc[start : start + n]
+        getattr(i, method)(out=out, **kwargs)
+
+    step(0)
+    tracemalloc.start()
+    for start in range(1, 5):
+        step(start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Far less than a single float array of the slice length
+    assert peak < n * 8 / 2
+
+
+@pytest.mark.parametrize("period", [1, 7, 20])
+def test_rolling_std_level_changes(period):
+    # Series of very different levels, e.g. symbols concatenated together
+    rng = np.random.default_rng(0)
+    levels = [0.1, 5000.0, 1.1, 30000.0, 0.5]
+    values = np.concatenate([rng.normal(size=100) * 1e-3 + x for x in levels])
+    values[250] = np.nan
+    std = kernels.rolling_std(values, period)
+
+    windows = np.lib.stride_tricks.sliding_window_view(values, period)
+    expected = np.concatenate([np.full(period - 1, np.nan), windows.std(axis=1)])
+    np.testing.assert_array_equal(np.isnan(std), np.isnan(expected))
+    inside = np.arange(len(values)) % 100 >= period - 1
+    np.testing.assert_allclose(std[inside], expected[inside], rtol=1e-12)
+
+
+@pytest.mark.parametrize("period", [1, 2, 14, 200])
+def test_ema_out_matches_pandas(period):
+    rng = np.random.default_rng(1)
+    values = 1 + np.cumsum(rng.normal(size=(2, 50000)), axis=1) * 1e-3
+    values[0, :3] = np.nan
+    values[1, rng.random(50000) < 0.05] = np.nan
+    out = kernels.ema(values, period, np.empty_like(values))
+    expected = pd.DataFrame(values.T).ewm(span=period, adjust=False).mean()
+    np.testing.assert_allclose(out, expected.to_numpy().T, rtol=1e-13)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+
+from .cases import CASES
+
+pl = pytest.importorskip("polars")
+
+
+@pytest.mark.parametrize("method, kwargs, columns", CASES)
+def test_polars_matches_pandas(method, kwargs, columns):
+    df = pd.read_csv("EURUSD60.csv")
+    expected = Indicators(df.copy())
+    getattr(expected, method)(**kwargs)
+
+    result = Indicators(pl.from_pandas(df))
+    getattr(result, method)(**kwargs)
+    assert isinstance(result.df, pl.DataFrame)
+
+    for column in columns:
+        left = expected.df[column].to_numpy(dtype=float, na_value=np.nan)
+        right = result.df[column].cast(pl.Float64).fill_null(np.nan).to_numpy()
+        np.testing.assert_allclose(right, left, rtol=1e-9, atol=1e-9)
+
+
+def test_polars_lazy_frame():
+    lf = pl.scan_csv("EURUSD60.csv")
+    i = Indicators(lf)
+    i.smma(period=5)
+    i.macd()
+    assert isinstance(i.df, pl.LazyFrame)
+    df = i.df.collect()
+    assert round(df["smma"][-1], 5) == 1.10192
+    assert round(df["macd_value"][-1], 6) == -0.000973
+
+
+def test_polars_apply_to_list():
+    df = pd.read_csv("EURUSD60.csv")
+    expected = Indicators(df.copy())
+    result = Indicators(
+        pl.from_pandas(df).rename({"Close": "close"}), close_col="close"
+    )
+    apply_to = ["Close", "Median", "Typical"]
+    for method in ("sma", "alma", "force_index"):
+        getattr(expected, method)(apply_to=apply_to, column_name=method)
+        getattr(result, method)(apply_to=apply_to, column_name=method)
+        for name in apply_to:
+            column = f"{method}_{name}"
+            left = expected.df[column].to_numpy(dtype=float, na_value=np.nan)
+            right = result.df[column].fill_null(np.nan).to_numpy()
+            np.testing.assert_allclose(right, left, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.indicators import lookback
+
+INDICATORS = [
+    "sma",
+    "bollinger_bands",
+    "ichimoku_kinko_hyo",
+    "fractals",
+    ("ema", {"period": 20}),
+    "smma",
+    "macd",
+    "mfi",
+    "rsi",
+    "alligator",
+    "accumulation_distribution",
+]
+
+CORRECTIONS = [
+    (5, "Close", 1.01),
+    (1000, "Volume", 2),
+    (1001, "Close", 1.001),
+    (3000, "High", 1.01),
+    (3700, "Low", 0.99),
+]
+
+
+def _add(indicators, items):
+    for item in items:
+        method, kwargs = (item, {}) if isinstance(item, str) else item
+        getattr(indicators, method)(**kwargs)
+
+
+def test_recompute():
+    df = pd.read_csv("EURUSD60.csv")
+    i = Indicators(df.copy())
+    _add(i, INDICATORS)
+    corrected = df.copy()
+    for row, column, factor in CORRECTIONS:
+        for frame in (i.df, corrected):
+            frame.iloc[row, frame.columns.get_loc(column)] *= factor
+    changed = i.recompute(INDICATORS, [row for row, _, _ in CORRECTIONS])
+
+    expected = Indicators(corrected)
+    _add(expected, INDICATORS)
+    for column in expected.df.columns[len(df.columns) :]:
+        np.testing.assert_allclose(
+            i.df[column].to_numpy(dtype=float),
+            expected.df[column].to_numpy(dtype=float),
+            rtol=1e-8,
+            atol=1e-10,
+            err_msg=column,
+        )
+
+    # Windows after the corrected rows, only the values that changed
+    assert changed["sma"] == [(5, 10), (1001, 1006)]
+    assert changed["mfi"] == [(5, 11), (1000, 1007), (3000, 3006), (3700, 3706)]
+    # Fractals look two bars ahead, the chikou span 26 bars
+    assert all(3000 - 2 <= a and b <= 3000 + 3 for a, b in changed["fractals_high"])
+    assert changed["chikou_span"] == [(1001 - 26, 1001 - 25)]
+    # Recursive indicators until the difference is below the tolerance
+    start, stop = changed["ema"][-1]
+    assert start == 1001 and 1001 + 20 < stop < 1001 + lookback("ema", {"period": 20})
+    assert changed["a/d"] == [(0, len(df))]
+
+
+def test_recompute_nothing_changed(indicators: Indicators):
+    indicators.cci()
+    indicators.ema()
+    assert indicators.recompute(["cci", "ema"], [100, 2000]) == {"cci": [], "ema": []}
+    assert indicators.recompute(["cci"], []) == {"cci": []}
+
+
+def test_recompute_polars():
+    pl = pytest.importorskip("polars")
+    i = Indicators(pl.read_csv("EURUSD60.csv"))
+    i.sma()
+    with pytest.raises(ValueError):
+        i.recompute(["sma"], [10])
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from tapy import Indicators, kernels, reference
+
+INDICATORS = [
+    "smma",
+    "cci",
+    "alma",
+    "atr",
+    ("smma", {"period": 13, "apply_to": ["Open", "Median"]}),
+    ("alma", {"period": 9, "offset": 0.5, "sigma": 4}),
+]
+
+
+def test_verify(indicators: Indicators):
+    columns = list(indicators.df.columns)
+    report = indicators.verify(INDICATORS)
+    assert list(indicators.df.columns) == columns
+    assert set(report) == {"smma", "cci", "alma", "atr", "smma_Open", "smma_Median"}
+    for difference in report.values():
+        assert difference.passed
+        assert difference.max_rel < 1e-9
+        assert not len(difference.nan_mismatch)
+
+
+def test_verify_polars():
+    pl = pytest.importorskip("polars")
+    indicators = Indicators(pl.scan_csv("EURUSD60.csv"))
+    report = indicators.verify(["smma", "cci", "atr"])
+    assert all(difference.passed for difference in report.values())
+
+
+def test_verify_raises(indicators: Indicators, monkeypatch):
+    atr = kernels.atr
+
+    def drifting_atr(*args, **kwargs):
+        values = atr(*args, **kwargs)
+        values[20] *= 1 + 1e-6
+        values[30] = np.nan
+        return values
+
+    monkeypatch.setattr(kernels, "atr", drifting_atr)
+    with pytest.raises(reference.VerificationError) as error:
+        indicators.verify(["atr", "cci"])
+    report = error.value.report
+    assert not report["atr"].passed
+    assert report["atr"].max_rel == pytest.approx(1e-6)
+    assert report["atr"].nan_mismatch.tolist() == [30]
+    assert report["cci"].passed
+    # A looser tolerance accepts the drift but not the NaN mismatch
+    with pytest.raises(reference.VerificationError, match="1 NaN mismatches"):
+        indicators.verify(["atr"], rtol=1e-5)
+
+
+def test_verify_sample(indicators: Indicators):
+    assert indicators.verify(["cci"], sample=0) is None
+    with pytest.raises(ValueError, match="reference"):
+        indicators.verify(["rsi"])
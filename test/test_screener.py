@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.screener import latest_values, screen
+
+INDICATORS = [
+    "cci",
+    "momentum",
+    "mfi",
+    "bollinger_bands",
+    "rsi",
+    "macd",
+    "accumulation_distribution",
+    ("ema", {"period": 20}),
+]
+
+
+@pytest.fixture(scope="module")
+def universe():
+    df = pd.read_csv("EURUSD60.csv")
+    rng = np.random.default_rng(0)
+    bars = {}
+    for symbol in range(30):
+        frame = df.iloc[rng.integers(0, 2000) :].reset_index(drop=True)
+        scale = 10 ** rng.uniform(-1, 3)
+        bars[f"S{symbol}"] = frame.assign(
+            **{c: frame[c] * scale for c in ["Open", "High", "Low", "Close"]}
+        )
+    bars["short"] = df.iloc[:30]
+    bars["gap"] = df.iloc[:1500].copy()
+    bars["gap"].loc[1490, "Close"] = np.nan
+    bars["empty"] = df.iloc[:0]
+    return bars
+
+
+def test_latest_values(universe):
+    values = latest_values(universe, INDICATORS)
+    for position, (symbol, frame) in enumerate(universe.items()):
+        if not len(frame):
+            assert np.isnan(values["cci"][position])
+            continue
+        expected = Indicators(frame).latest(INDICATORS)
+        assert values["Close"][position] == frame["Close"].iloc[-1]
+        for column, value in expected.items():
+            np.testing.assert_allclose(
+                values[column][position], value, rtol=1e-8, err_msg=symbol
+            )
+
+
+def test_screen(universe):
+    values = latest_values(universe, ["cci", "bollinger_bands"])
+    top = screen(universe, ["cci", "bollinger_bands"], by="cci", k=5)
+    order = np.argsort(-np.nan_to_num(values["cci"], nan=-np.inf))[:5]
+    assert list(top.index) == [list(universe)[i] for i in order]
+    assert (np.diff(top["score"]) <= 0).all()
+
+    bottom = screen(universe, ["cci"], by="cci", k=3, ascending=True)
+    assert bottom["cci"].max() <= top["cci"].min()
+
+    def distance(v):
+        return (v["Close"] - v["bollinger_mid"]) / (
+            v["bollinger_top"] - v["bollinger_mid"]
+        )
+
+    above = screen(
+        universe,
+        ["bollinger_bands"],
+        by=distance,
+        where=lambda v: v["Close"] > v["bollinger_mid"],
+    )
+    assert (above["Close"] > above["bollinger_mid"]).all()
+    assert (above["score"] > 0).all()
+    assert len(above) == (distance(values) > 0).sum()
+
+
+def test_screen_arrays():
+    df = pd.read_csv("EURUSD60.csv")
+    bars = {
+        "a": {c: df[c].to_numpy() for c in df.columns},
+        "b": {c: df[c].to_numpy()[:-10] for c in df.columns},
+    }
+    result = screen(
+        bars, [("momentum", {"period": 5})], where=lambda v: v["Volume"] > 0
+    )
+    expected = Indicators(df.iloc[:-10]).latest([("momentum", {"period": 5})])
+    assert result.loc["b", "momentum"] == pytest.approx(expected["momentum"])
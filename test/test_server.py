@@ -0,0 +1,141 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.feed import replay
+from tapy.server import IndicatorServer, fetch
+from tapy.shared import pack_columns, unpack_columns
+
+
+def test_pack_columns():
+    data = {"a": np.arange(5.0), "b": np.array([True, False, True, True, False])}
+    arrays = unpack_columns(pack_columns(data))
+    assert list(arrays) == ["a", "b"]
+    for name, values in data.items():
+        np.testing.assert_array_equal(arrays[name], values)
+        assert arrays[name].dtype == values.dtype
+
+
+def test_server_coalesces_requests():
+    df = pd.read_csv("EURUSD60.csv")
+
+    async def main():
+        server = IndicatorServer({"EURUSD": df})
+        port = await server.start_http()
+        try:
+            same = [fetch("EURUSD", ["cci"], port=port) for _ in range(5)]
+            other = fetch("EURUSD", [["sma", {"period": 20}]], port=port)
+            last = fetch("EURUSD", ["rsi"], bars=3, port=port)
+            results = await asyncio.gather(*same, other, last)
+        finally:
+            await server.close()
+        return server, results
+
+    server, results = asyncio.run(main())
+    # Identical requests share one calculation, the others of the same
+    # symbol are batched together
+    assert server.requests == 7
+    assert server.calculations < 7
+
+    expected = Indicators(df.copy())
+    expected.cci()
+    expected.sma(period=20)
+    expected.rsi()
+    for result in results[:5]:
+        np.testing.assert_allclose(result["cci"], expected.df["cci"])
+    np.testing.assert_allclose(results[5]["sma"], expected.df["sma"])
+    np.testing.assert_allclose(results[6]["rsi"], expected.df["rsi"].iloc[-3:])
+
+
+def test_server_errors(tmp_path):
+    df = pd.read_csv("EURUSD60.csv").iloc[:200]
+
+    async def main():
+        server = IndicatorServer({"EURUSD": df})
+        path = str(tmp_path / "tapy.sock")
+        await server.start_unix(path)
+        try:
+            with pytest.raises(RuntimeError, match="404"):
+                await fetch("GBPUSD", ["cci"], path=path)
+            with pytest.raises(RuntimeError, match="400"):
+                await fetch("EURUSD", [["sma", {"perid": 3}]], path=path)
+            with pytest.raises(RuntimeError, match="400"):
+                await fetch("EURUSD", ["not_an_indicator"], path=path)
+            return await fetch("EURUSD", ["atr"], bars=1, path=path)
+        finally:
+            await server.close()
+
+    result = asyncio.run(main())
+    expected = Indicators(df.copy())
+    expected.atr()
+    np.testing.assert_allclose(result["atr"], expected.df["atr"].iloc[-1:])
+
+
+def test_server_failures(caplog):
+    df = pd.read_csv("EURUSD60.csv").iloc[:200]
+
+    def load(symbol):
+        raise RuntimeError("storage is down")
+
+    async def main():
+        server = IndicatorServer({"EURUSD": df}, load=load)
+        port = await server.start_http()
+        try:
+            invalid = [
+                ["sma", {"apply_to": "Mid"}],
+                ["sma", {"period": "4h"}],
+                ["sma", {"period": 0}],
+                ["linear_regression", {"period": 2}],
+                ["cci", {"method": "mode"}],
+                ["bollinger_bands", {"deviation": "2"}],
+                ["sma", 5],
+            ]
+            for item in invalid:
+                with pytest.raises(RuntimeError, match="400"):
+                    await fetch("EURUSD", [item], port=port)
+            with pytest.raises(RuntimeError, match="500: internal error"):
+                await fetch("GBPUSD", ["cci"], port=port)
+            # A malformed request line is answered and closes the connection
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GARBAGE\r\n\r\n")
+            status = await reader.readline()
+            writer.close()
+            return status
+        finally:
+            await server.close()
+
+    assert asyncio.run(main()).startswith(b"HTTP/1.1 400")
+    # Only the failure of the server is logged
+    assert "storage is down" in caplog.text
+    assert caplog.text.count("Traceback") == 1
+
+
+def test_server_rejects_time_spans():
+    df = pd.read_csv("EURUSD60.csv").iloc[:200]
+
+    async def main():
+        server = IndicatorServer({"EURUSD": df})
+        port = await server.start_http()
+        try:
+            await fetch("EURUSD", [["ema", {"period": "4h"}]], port=port)
+        finally:
+            await server.close()
+
+    with pytest.raises(RuntimeError, match="400: ema: period .* time spans"):
+        asyncio.run(main())
+
+
+def test_server_feed():
+    df = pd.read_csv("EURUSD60.csv").iloc[:130]
+
+    async def main():
+        server = IndicatorServer(window=50)
+        await server.run_feed({"EURUSD": replay(df)})
+        return await server.compute("EURUSD", ["sma"])
+
+    result = asyncio.run(main())
+    assert len(result["sma"]) == 50
+    assert result["sma"][-1] == pytest.approx(df["Close"].iloc[-5:].mean())
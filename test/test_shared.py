@@ -0,0 +1,57 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from tapy import Indicators
+from tapy.shared import SharedColumns, read_arrow, write_arrow
+
+
+def _read_block(name, queue):
+    block = SharedColumns.attach(name)
+    queue.put({k: float(np.nansum(v)) for k, v in block.arrays.items()})
+    block.close()
+
+
+def test_shared_columns(indicators: Indicators):
+    indicators.sma()
+    indicators.fractals()
+    columns = ["sma", "fractals_high", "Volume"]
+    block = SharedColumns.create(indicators, columns)
+    try:
+        attached = SharedColumns.attach(block.name)
+        for column in columns:
+            np.testing.assert_array_equal(
+                attached.arrays[column], indicators.df[column].to_numpy()
+            )
+        assert attached.arrays["sma"].ctypes.data % 64 == 0
+
+        # Updates are visible to attached readers without copying
+        block.write({"sma": np.zeros(len(indicators.df))})
+        assert not attached.arrays["sma"].any()
+        attached.close()
+
+        queue = multiprocessing.get_context("spawn").Queue()
+        process = multiprocessing.get_context("spawn").Process(
+            target=_read_block, args=(block.name, queue)
+        )
+        process.start()
+        sums = queue.get(timeout=30)
+        process.join()
+        assert sums["Volume"] == indicators.df["Volume"].sum()
+    finally:
+        block.close()
+        block.unlink()
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_arrow(tmp_path, indicators: Indicators, stream):
+    pytest.importorskip("pyarrow")
+    indicators.macd()
+    path = tmp_path / "eurusd.arrow"
+    write_arrow(indicators.df, str(path), ["macd_value", "macd_signal"], stream)
+    table = read_arrow(path, stream)
+    assert table.column_names == ["macd_value", "macd_signal"]
+    np.testing.assert_array_equal(
+        table.column("macd_signal").to_numpy(), indicators.df["macd_signal"]
+    )
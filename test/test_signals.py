@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators
+from tapy.signals import above, below, cross_above, cross_below, scan
+
+
+@pytest.fixture()
+def df():
+    i = Indicators(pd.read_csv("EURUSD60.csv"))
+    i.macd()
+    i.bollinger_bands()
+    i.ichimoku_kinko_hyo()
+    i.cci()
+    return i.df
+
+
+RULES = [
+    cross_above("macd_value", "macd_signal"),
+    cross_below("macd_value", "macd_signal"),
+    above("High", "bollinger_top"),
+    below("Low", "bollinger_bottom"),
+    cross_above("Close", ["senkou_span_a", "senkou_span_b"]),
+    cross_above("cci", 100),
+]
+
+
+def test_scan(df):
+    events = scan(df, RULES)
+    assert set(events["symbol"]) == {0}
+
+    value, signal = df["macd_value"], df["macd_signal"]
+    expected = np.flatnonzero((value > signal) & (value.shift(1) <= signal.shift(1)))
+    np.testing.assert_array_equal(events["bar"][events["signal"] == 0], expected)
+
+    expected = np.flatnonzero(df["High"] >= df["bollinger_top"])
+    np.testing.assert_array_equal(events["bar"][events["signal"] == 2], expected)
+
+    cloud = df[["senkou_span_a", "senkou_span_b"]].max(axis=1)
+    expected = np.flatnonzero(
+        (df["Close"] > cloud) & (df["Close"].shift(1) <= cloud.shift(1))
+    )
+    np.testing.assert_array_equal(events["bar"][events["signal"] == 4], expected)
+
+
+def test_scan_many_symbols(df):
+    frames = {"a": df.iloc[:1000], "empty": df.iloc[:0], "b": df.iloc[1000:]}
+    events = scan(frames, RULES, chunk_bars=500)
+    single = scan(df.iloc[1000:].reset_index(drop=True), RULES)
+
+    b_events = events[events["symbol"] == 2]
+    np.testing.assert_array_equal(b_events["bar"], single["bar"])
+    np.testing.assert_array_equal(b_events["signal"], single["signal"])
+    assert not (events["symbol"] == 1).any()
+    assert (np.diff(events["symbol"]) >= 0).all()
+
+
+def test_scan_cloud_with_nan():
+    # Senkou span B is still warming up while Close crosses span A
+    df = pd.DataFrame(
+        {
+            "Close": [1.0, 1.0, 3.0, 3.0, 1.0, 5.0],
+            "senkou_span_a": [2.0, 2.0, 2.0, 2.0, 2.0, 2.0],
+            "senkou_span_b": [np.nan, np.nan, np.nan, 4.0, 4.0, 4.0],
+        }
+    )
+    rules = [
+        cross_above("Close", ["senkou_span_a", "senkou_span_b"]),
+        cross_below("Close", ["senkou_span_a", "senkou_span_b"]),
+    ]
+    events = scan(df, rules)
+    np.testing.assert_array_equal(events["bar"][events["signal"] == 0], [2, 5])
+    np.testing.assert_array_equal(events["bar"][events["signal"] == 1], [4])
@@ -1,6 +1,10 @@
+import numpy as np
+import pandas as pd
 import pytest
 
-from tapy import Indicators
+from tapy import Indicators, kernels, utils
+
+from .cases import CASES
 
 
 def get_val(df, column, val_index, round_to):
@@ -24,6 +28,14 @@ def test_ema(indicators: Indicators):
     assert val == 1.10164
 
 
+def test_lwma(indicators: Indicators):
+    col = "lwma"
+    indicators.lwma(period=5, column_name=col)
+    close = indicators.df["Close"].to_numpy()[-5:]
+    expected = np.dot(close, np.arange(1, 6)) / 15
+    assert indicators.df[col].iloc[-1] == pytest.approx(expected, abs=1e-12)
+
+
 def test_awesome_oscillator(indicators: Indicators):
     col = "ao"
     indicators.awesome_oscillator(column_name=col)
@@ -137,7 +149,10 @@ def test_force_index_error(indicators: Indicators):
     with pytest.raises(Exception) as exception:
         indicators.force_index(column_name=col, method="blah")
 
-    assert str(exception.value) == 'The "method" can be only "sma", "ema" or "smma"'
+    assert (
+        str(exception.value)
+        == 'The "method" can be only "sma", "ema", "smma" or "lwma"'
+    )
 
 
 def test_force_index(indicators: Indicators):
@@ -250,3 +265,250 @@ def test_alma(indicators: Indicators):
     df = indicators.df
     value = get_val(df, col, -1, 6)
     assert value == 1.101739
+
+
+def test_compute_many(indicators: Indicators):
+    specs = [
+        "cci",
+        ("mfi", {"column_name": "mfi_5"}),
+        ("bollinger_bands", {"period": 10}),
+        ("ichimoku_kinko_hyo", {}),
+        ("fractals", {}),
+    ]
+    expected = Indicators(indicators.df.copy())
+    for method, kwargs in [(s, {}) if isinstance(s, str) else s for s in specs]:
+        getattr(expected, method)(**kwargs)
+
+    indicators.compute_many(specs, max_workers=4)
+    assert sorted(indicators.df.columns) == sorted(expected.df.columns)
+    for column in expected.df.columns[7:]:
+        left = expected.df[column].to_numpy(dtype=float)
+        right = indicators.df[column].to_numpy(dtype=float)
+        assert abs(left - right)[~np.isnan(left)].max() < 1e-9
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        lambda n: pd.date_range("2019-01-01", periods=n, freq="h"),
+        lambda n: np.arange(n)[::-1],
+        lambda n: np.zeros(n, dtype=int),
+    ],
+    ids=["datetime", "descending", "duplicated"],
+)
+def test_any_index(index):
+    df = pd.read_csv("EURUSD60.csv")
+    expected = Indicators(df.copy())
+    indexed = df.set_index(index(len(df)))
+    indicators = Indicators(indexed)
+    for method, kwargs, columns in CASES:
+        getattr(expected, method)(**kwargs)
+        getattr(indicators, method)(**kwargs)
+        for column in columns:
+            np.testing.assert_array_equal(
+                indicators.df[column].to_numpy(), expected.df[column].to_numpy()
+            )
+    assert indicators.df is indexed
+
+
+def test_rsi(indicators: Indicators):
+    indicators.rsi(period=14)
+    close = indicators.df["Close"].to_numpy()
+    change = np.diff(close)
+    gain = change[:14].clip(min=0).mean()
+    loss = (-change[:14]).clip(min=0).mean()
+    for value in change[14:]:
+        gain = (gain * 13 + max(value, 0)) / 14
+        loss = (loss * 13 + max(-value, 0)) / 14
+    expected = 100 - 100 / (1 + gain / loss)
+    assert indicators.df["rsi"].iloc[-1] == pytest.approx(expected, abs=1e-9)
+    assert indicators.df["rsi"].iloc[:14].isna().all()
+
+
+def test_robust_cci(indicators: Indicators):
+    indicators.cci(period=20, method="median")
+    df = indicators.df
+    tp = ((df["High"] + df["Low"] + df["Close"]) / 3).to_numpy()[-20:]
+    median = np.median(tp)
+    mad = np.median(np.abs(tp - median))
+    expected = (tp[-1] - median) / (0.015 * mad)
+    assert df["cci"].iloc[-1] == pytest.approx(expected, rel=1e-9)
+    with pytest.raises(ValueError):
+        indicators.cci(method="blah")
+
+
+APPLY_TO = ["Open", "High", "Close", "Typical"]
+
+
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("sma", {}),
+        ("smma", {}),
+        ("ema", {}),
+        ("lwma", {}),
+        ("alma", {}),
+        ("rsi", {}),
+        ("force_index", {"method": "sma"}),
+        ("force_index", {"method": "ema"}),
+    ],
+)
+def test_apply_to_list(method, kwargs):
+    # Renamed columns go through the column mapping
+    df = pd.read_csv("EURUSD60.csv").rename(columns=str.lower)
+    columns = {f"{name}_col": name.lower() for name in ("open", "high", "low")}
+    columns.update(close_col="close", volume_col="volume")
+    expected = Indicators(df.copy(), **columns)
+    for name in APPLY_TO:
+        getattr(expected, method)(column_name=name, apply_to=name, **kwargs)
+
+    indicators = Indicators(df, **columns)
+    getattr(indicators, method)(column_name="x", apply_to=APPLY_TO, **kwargs)
+    out = np.empty((len(APPLY_TO), len(df)))
+    result = getattr(indicators, method)(apply_to=APPLY_TO, out=out, **kwargs)
+    assert result is out
+    for row, name in zip(out, APPLY_TO):
+        left = expected.df[name].to_numpy()
+        right = indicators.df[f"x_{name}"].to_numpy()
+        np.testing.assert_allclose(right, left, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(row, left, rtol=1e-9, atol=1e-12)
+
+
+def test_compute_many_apply_to_list(indicators: Indicators):
+    expected = Indicators(indicators.df.copy())
+    expected.ema(period=10, apply_to=APPLY_TO)
+    indicators.compute_many([("ema", {"period": 10, "apply_to": APPLY_TO})])
+    for name in APPLY_TO:
+        np.testing.assert_allclose(
+            indicators.df[f"ema_{name}"].to_numpy(),
+            expected.df[f"ema_{name}"].to_numpy(),
+            rtol=1e-12,
+        )
+
+
+def test_linear_regression(indicators: Indicators):
+    period = 14
+    indicators.linear_regression(period=period, deviation=2)
+    df = indicators.df
+    x = np.arange(period)
+    for end in (period, 100, len(df)):
+        window = df["Close"].to_numpy()[end - period : end]
+        slope, intercept = np.polyfit(x, window, 1)
+        residuals = window - (intercept + slope * x)
+        r2 = 1 - (residuals**2).sum() / ((window - window.mean()) ** 2).sum()
+        error = np.sqrt((residuals**2).sum() / (period - 2))
+        last = intercept + slope * (period - 1)
+        row = df.iloc[end - 1]
+        assert row["lr_slope"] == pytest.approx(slope, rel=1e-8)
+        assert row["lr_intercept"] == pytest.approx(intercept, rel=1e-12)
+        assert row["lr_r2"] == pytest.approx(r2, rel=1e-8)
+        assert row["lr_forecast"] == pytest.approx(intercept + slope * period)
+        assert row["lr_top"] == pytest.approx(last + 2 * error)
+        assert row["lr_bottom"] == pytest.approx(last - 2 * error)
+    assert df["lr_slope"].iloc[: period - 1].isna().all()
+
+
+def test_linear_regression_period(indicators: Indicators):
+    for period in (1, 2, [10, 2]):
+        with pytest.raises(ValueError, match="3 bars or more"):
+            indicators.linear_regression(period=period)
+    indicators.linear_regression(period=3)
+    assert indicators.df["lr_top"].iloc[2:].notna().all()
+
+
+def test_linear_regression_sweep(indicators: Indicators):
+    periods, columns = [10, 20, 50], ["High", "Low"]
+    n = len(indicators.df)
+    out = tuple(np.empty((len(periods), len(columns), n)) for _ in range(6))
+    indicators.linear_regression(period=periods, apply_to=columns, out=out)
+    indicators.linear_regression(period=periods, apply_to=columns)
+    for k, period in enumerate(periods):
+        single = Indicators(indicators.df.copy())
+        single.linear_regression(period=period, apply_to="Low")
+        np.testing.assert_array_equal(
+            indicators.df[f"lr_top_{period}_Low"], single.df["lr_top"]
+        )
+        np.testing.assert_array_equal(out[4][k, 1], single.df["lr_top"])
+
+
+def test_bill_williams(indicators: Indicators):
+    df = indicators.df.copy()
+    indicators.bill_williams()
+    expected = Indicators(df)
+    for method in (
+        "awesome_oscillator",
+        "accelerator_oscillator",
+        "alligator",
+        "gator",
+        "fractals",
+        "bw_mfi",
+    ):
+        getattr(expected, method)()
+    for column in expected.df.columns[len(df.columns) :]:
+        np.testing.assert_array_equal(
+            indicators.df[column], expected.df[column], err_msg=column
+        )
+
+    ao = indicators.df["ao"].to_numpy()
+    colour = indicators.df["ao_colour"].to_numpy()
+    assert np.isnan(colour[:34]).all()
+    rising = ao[34:] > ao[33:-1]
+    assert (colour[34:][rising] == 1).all()
+    assert (colour[34:][ao[34:] < ao[33:-1]] == -1).all()
+    assert np.isnan(indicators.df["ac_colour"].to_numpy()[:38]).all()
+
+
+def test_bar_colours_ties():
+    values = np.array([np.nan, 1.0, 2.0, 2.0, 1.0, 1.0, 1.0, 3.0])
+    colours = kernels.bar_colours(values)
+    np.testing.assert_array_equal(colours, [np.nan, np.nan, 1, 1, -1, -1, -1, 1])
+    # The scratch arrays are reused
+    buffers = kernels.Buffers()
+    out = np.empty(len(values))
+    for shift in (0.0, 1.0):
+        assert kernels.bar_colours(values + shift, out, buffers) is out
+        np.testing.assert_array_equal(out, colours)
+
+
+@pytest.mark.parametrize(
+    "periods",
+    [
+        {},
+        {"period_mfi": 3, "period_de_marker": 3, "period_momentum": 1},
+    ],
+)
+def test_oscillators(indicators: Indicators, periods):
+    df = indicators.df.copy()
+    indicators.oscillators(**periods)
+    expected = Indicators(df)
+    expected.mfi(period=periods.get("period_mfi", 5))
+    expected.de_marker(period=periods.get("period_de_marker", 14))
+    expected.momentum(period=periods.get("period_momentum", 14))
+    expected.bw_mfi()
+    for column in expected.df.columns[len(df.columns) :]:
+        np.testing.assert_array_equal(
+            indicators.df[column], expected.df[column], err_msg=column
+        )
+
+
+def test_rolling_sum_in_place():
+    values = np.arange(10.0)
+    expected = kernels.rolling_sum(values, 3, np.empty(10))
+    np.testing.assert_array_equal(kernels.rolling_sum(values, 3, values), expected)
+
+
+def test_utils_helpers(indicators: Indicators):
+    df = indicators.df.copy()
+    close, median = df["Close"], (df["High"] + df["Low"]) / 2
+    utils.calculate_sma(df, 5, "sma", "Close")
+    np.testing.assert_allclose(df["sma"], close.rolling(5).mean())
+    utils.calculate_ao(df, "ao")
+    ao = median.rolling(5).mean() - median.rolling(34).mean()
+    np.testing.assert_allclose(df["ao"], ao, atol=1e-14)
+    smma = utils.calculate_smma(df, 5, "smma", "Close")["smma"]
+    assert smma.iloc[5] == pytest.approx(close.iloc[:5].mean())
+    assert smma.iloc[6] == pytest.approx((smma.iloc[5] * 4 + close.iloc[6]) / 5)
+    weights = utils.alma_weights(9, 0.85, 6)
+    utils.calculate_alma(df, 9, 0.85, 6, "Close", "alma")
+    assert df["alma"].iloc[8] == pytest.approx(np.dot(weights, close.iloc[:9]))
+    assert utils.mad(np.arange(5.0)) == 1.2
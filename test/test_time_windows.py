@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tapy import Indicators, kernels
+
+
+@pytest.fixture
+def bars():
+    """Hourly bars with weekend and session gaps."""
+    df = pd.read_csv("EURUSD60.csv")
+    time = pd.to_datetime(df["Date"] + " " + df["Time"], format="%Y.%m.%d %H:%M")
+    return df.set_index(pd.DatetimeIndex(time, name="time"))
+
+
+def _regular(df):
+    """The same bars one hour apart, so time spans are numbers of bars."""
+    time = pd.date_range("2019-01-01", periods=len(df), freq="1h", name="time")
+    return df.set_index(time)
+
+
+@pytest.mark.parametrize("span", ["90min", "4h", "3D"])
+def test_time_windows_match_pandas(bars, span):
+    i = Indicators(bars.copy())
+    i.sma(period=span)
+    i.bollinger_bands(period=span)
+    i.ichimoku_kinko_hyo(period_tenkan_sen=span)
+    rolling = bars.rolling(span)
+    close, high, low = (rolling[c] for c in ("Close", "High", "Low"))
+    expected = {
+        "sma": close.mean(),
+        "bollinger_top": close.mean() + 2 * close.std(ddof=0),
+        "tenkan_sen": (high.max() + low.min()) / 2,
+    }
+    complete = bars.index - pd.Timedelta(span) >= bars.index[0]
+    for column, values in expected.items():
+        assert i.df[column][~complete].isna().all()
+        np.testing.assert_allclose(
+            i.df[column][complete], values[complete], rtol=1e-12, err_msg=column
+        )
+
+
+@pytest.mark.parametrize(
+    "method, bar_kwargs, time_kwargs",
+    [
+        ("sma", {"period": 5}, {"period": "5h"}),
+        ("atr", {}, {"period": "14h"}),
+        ("bollinger_bands", {}, {"period": "20h"}),
+        ("de_marker", {}, {"period": "14h"}),
+        ("mfi", {}, {"period": "5h"}),
+        (
+            "ichimoku_kinko_hyo",
+            {},
+            {
+                "period_tenkan_sen": "9h",
+                "period_kijun_sen": "26h",
+                "period_senkou_span_b": "52h",
+            },
+        ),
+    ],
+)
+def test_regular_bars(bars, method, bar_kwargs, time_kwargs):
+    df = _regular(bars)
+    expected = Indicators(df.copy())
+    getattr(expected, method)(**bar_kwargs)
+    i = Indicators(df.copy())
+    getattr(i, method)(**time_kwargs)
+    for column in expected.df.columns[len(df.columns) :]:
+        np.testing.assert_allclose(
+            i.df[column].iloc[100:-100],
+            expected.df[column].iloc[100:-100],
+            rtol=1e-9,
+            err_msg=column,
+        )
+
+
+def test_time_col(bars):
+    df = bars.reset_index()
+    i = Indicators(df, time_col="time")
+    i.mfi(period="6h")
+    i.ema(period="6h", apply_to=["Close", "Median"])
+    expected = Indicators(bars.copy())
+    expected.mfi(period="6h")
+    expected.ema(period="6h", apply_to=["Close", "Median"])
+    for column in ("mfi", "ema_Close", "ema_Median"):
+        np.testing.assert_array_equal(i.df[column], expected.df[column])
+
+
+def test_time_decay(bars):
+    times = kernels.timestamps(bars.index)
+    close = bars["Close"].to_numpy()
+    for tau in (3600e9, 1e9, 3600e12):
+        expected = np.empty(len(close))
+        expected[0] = close[0]
+        for k in range(1, len(close)):
+            decay = np.exp(-(times[k] - times[k - 1]) / tau)
+            expected[k] = decay * expected[k - 1] + (1 - decay) * close[k]
+        values = kernels.time_decay(close, times, tau)
+        np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+    i = Indicators(bars.copy())
+    i.ema(period="4h")
+    i.smma(period="4h")
+    np.testing.assert_array_equal(
+        i.df["ema"], kernels.time_decay(close, times, 2 * 3600e9)
+    )
+    np.testing.assert_array_equal(
+        i.df["smma"], kernels.time_decay(close, times, 4 * 3600e9)
+    )
+
+
+def test_time_spans_latest(bars):
+    i = Indicators(bars.copy())
+    indicators = [("sma", {"period": "1D"}), ("ema", {"period": "4h"})]
+    latest = i.latest(indicators)
+    i.sma(period="1D")
+    i.ema(period="4h")
+    assert latest == {"sma": i.df["sma"].iloc[-1], "ema": i.df["ema"].iloc[-1]}
+
+
+def test_time_spans_errors(bars):
+    with pytest.raises(ValueError, match="time_col"):
+        Indicators(bars.reset_index()).sma(period="4h")
+    with pytest.raises(ValueError, match="increasing"):
+        Indicators(bars.iloc[::-1].copy()).sma(period="4h")
+    with pytest.raises(ValueError, match="positive"):
+        Indicators(bars.copy()).sma(period="-4h")
+
+    with pytest.raises(ValueError, match="number of bars"):
+        Indicators(bars.copy()).force_index(period="4h", method="lwma")
+
+
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("lwma", {"period": "4h"}),
+        ("alma", {"period": "4h"}),
+        ("linear_regression", {"period": "4h"}),
+        ("cci", {"period": "4h"}),
+        ("momentum", {"period": "4h"}),
+        ("macd", {"period_slow": "1D"}),
+        ("rsi", {"period": "4h"}),
+        ("wilder_atr", {"period": "4h"}),
+        ("adx", {"period": "4h"}),
+        ("wilder_suite", {"period": "4h"}),
+        ("oscillators", {"period_momentum": "4h"}),
+    ],
+)
+def test_time_spans_unsupported(bars, method, kwargs):
+    name = next(iter(kwargs))
+    with pytest.raises(ValueError, match=f'"{name}" of "{method}"'):
+        getattr(Indicators(bars.copy()), method)(**kwargs)
+
+
+def test_time_spans_smoothings(bars):
+    i = Indicators(bars.copy())
+    i.ema(period="4h")
+    i.smma(period="13h", column_name="jaws")
+    i.bears_power(period="4h")
+    i.bulls_power(period="4h")
+    i.alligator(period_jaws="13h")
+    i.gator(period_jaws="13h")
+    i.bill_williams(period_jaws="13h")
+    i.force_index(period="4h", method="ema")
+    df = i.df
+    np.testing.assert_array_equal(df["bears_power"], df["ema"] - df["Low"])
+    np.testing.assert_array_equal(df["bulls_power"], df["High"] - df["ema"])
+    median = Indicators(bars.copy())
+    median.smma(period="13h", apply_to="Median")
+    np.testing.assert_array_equal(
+        df["alligator_jaws"], median.df["smma"].shift(8).to_numpy()
+    )
+    np.testing.assert_allclose(
+        df["value1"], df["alligator_jaws"] - df["alligator_teeth"]
+    )
+    np.testing.assert_allclose(df["frc"], df["ema"].diff() * df["Volume"], rtol=1e-12)
+
+
+def test_time_spans_polars(bars):
+    pl = pytest.importorskip("polars")
+    df = bars.reset_index()
+    kwargs = {
+        "sma": {"period": "4h", "apply_to": ["Close", "Typical"]},
+        "ema": {"period": "4h"},
+        "smma": {"period": "1D"},
+        "atr": {"period": "1D"},
+        "bollinger_bands": {"period": "1D"},
+        "de_marker": {"period": "4h"},
+        "mfi": {"period": "4h"},
+        "bears_power": {"period": "4h"},
+        "alligator": {"period_jaws": "1D", "period_lips": "5h"},
+        "force_index": {"period": "4h", "method": "smma"},
+        "ichimoku_kinko_hyo": {
+            "period_tenkan_sen": "9h",
+            "period_kijun_sen": "1D",
+            "period_senkou_span_b": "3D",
+        },
+    }
+    expected = Indicators(df.copy(), time_col="time")
+    result = Indicators(pl.from_pandas(df), time_col="time")
+    for method, arguments in kwargs.items():
+        getattr(expected, method)(**arguments)
+        getattr(result, method)(**arguments)
+    for column in expected.df.columns[len(df.columns) :]:
+        left = expected.df[column].to_numpy(dtype=float, na_value=np.nan)
+        right = result.df[column].fill_null(np.nan).to_numpy()
+        # The force index is a difference of close smoothed values times
+        # the volume
+        atol = 1e-10 if column == "frc" else 1e-12
+        np.testing.assert_allclose(right, left, rtol=1e-9, atol=atol, err_msg=column)
+    with pytest.raises(ValueError, match="time_col"):
+        Indicators(pl.from_pandas(df)).sma(period="4h")